@@ -8,24 +8,168 @@
 import asyncio
 import sys
 import os
+import shutil
+import time
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, Any, List, Optional, Tuple
+
+import aiofiles
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
 
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.config.settings import Settings
+from src.config.settings import Settings, get_settings
 from src.database.database_manager import DatabaseManager
 from src.utils.performance_monitor import PerformanceMonitor
 
 
+def _path_exists(path) -> bool:
+    """通过单次 os.stat 判断路径是否存在"""
+    try:
+        os.stat(path)
+        return True
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _module_available(module: str) -> bool:
+    """检查模块是否可导入（仅通过导入系统查找，不执行模块代码）"""
+    return find_spec(module) is not None
+
+
+# 性能指标缓存：过期后先返回旧数据，同时在后台刷新
+METRICS_CACHE_TTL = 5.0
+_metrics_cache: Dict[str, Any] = {"ts": 0.0, "data": None, "task": None}
+
+# 共享的性能监控器：CPU使用率按两次采集之间的间隔计算（单次运行时由监控器补足最短采样窗口）
+_monitor = PerformanceMonitor()
+
+
+async def _refresh_metrics() -> Dict[str, Any]:
+    """采集最新性能指标并写入缓存"""
+    metrics = await _monitor.collect_metrics()
+    if "error" not in metrics:
+        _metrics_cache["ts"] = time.monotonic()
+        _metrics_cache["data"] = metrics
+    return metrics
+
+
+async def get_cached_metrics() -> Dict[str, Any]:
+    """获取性能指标（stale-while-revalidate）"""
+    cached = _metrics_cache["data"]
+    if cached is not None and time.monotonic() - _metrics_cache["ts"] < METRICS_CACHE_TTL:
+        return cached
+    
+    task = _metrics_cache["task"]
+    if task is None or task.done():
+        task = asyncio.create_task(_refresh_metrics())
+        _metrics_cache["task"] = task
+    
+    if cached is not None:
+        return cached
+    
+    # 首次调用没有旧数据可用，等待刷新完成（shield 避免超时取消共享的刷新任务）
+    return await asyncio.shield(task)
+
+
 class HealthChecker:
     """系统健康检查器"""
     
-    def __init__(self):
-        """初始化健康检查器"""
+    # 检查项（名称, 提示文本），按输出顺序排列
+    CHECKS = [
+        ("configuration", "⚙️ 检查配置..."),
+        ("database", "🗄️ 检查数据库..."),
+        ("storage", "💾 检查存储..."),
+        ("dependencies", "📦 检查依赖..."),
+        ("performance", "⚡ 检查性能..."),
+        ("network", "🌐 检查网络..."),
+    ]
+    
+    # 各检查项的超时时间（秒），可通过 HEALTHCHECK_<NAME>_TIMEOUT 环境变量覆盖
+    TIMEOUTS = {
+        "configuration": 2.0,
+        "database": 5.0,
+        "storage": 2.0,
+        "dependencies": 1.0,
+        "performance": 3.0,
+        "network": 10.0,
+    }
+    
+    # 网络检查的TCP连接超时（秒）
+    NETWORK_CONNECT_TIMEOUT = 3.0
+    
+    # 必需依赖包及其导入模块名
+    REQUIRED_PACKAGES = {
+        "telethon": "telethon",
+        "python-telegram-bot": "telegram",
+        "sqlalchemy": "sqlalchemy",
+        "aiofiles": "aiofiles",
+        "pillow": "PIL",
+        "opencv-python": "cv2",
+        "numpy": "numpy",
+    }
+    
+    STATUS_EMOJI = {
+        "healthy": "✅",
+        "warning": "⚠️",
+        "error": "❌",
+        "unknown": "❓"
+    }
+    
+    def __init__(self, db_manager: Optional[DatabaseManager] = None):
+        """
+        初始化健康检查器
+        
+        Args:
+            db_manager: 已初始化的数据库管理器（可选，传入时复用其连接池且不负责关闭）
+        """
         self.checks = []
         self.results = {}
+        self.timeouts = {
+            name: float(os.getenv(f"HEALTHCHECK_{name.upper()}_TIMEOUT", default))
+            for name, default in self.TIMEOUTS.items()
+        }
+        
+        # 共享的配置与数据库管理器，避免每个检查项重复创建
+        self._settings: Optional[Settings] = None
+        self._db_manager: Optional[DatabaseManager] = db_manager
+        self._owns_db_manager = db_manager is None
+        self._db_lock = asyncio.Lock()
+    
+    @property
+    def settings(self) -> Settings:
+        """获取配置（首次访问时加载）"""
+        if self._settings is None:
+            self._settings = get_settings()
+        return self._settings
+    
+    async def _get_db(self) -> DatabaseManager:
+        """获取已初始化的数据库管理器（仅初始化一次）"""
+        async with self._db_lock:
+            if self._db_manager is None:
+                db_manager = DatabaseManager(
+                    self.settings.database_url, pool_size=self.settings.db_pool_size
+                )
+                await db_manager.initialize()
+                self._db_manager = db_manager
+        return self._db_manager
+    
+    async def aclose(self):
+        """释放检查过程中创建的资源"""
+        if self._db_manager is not None and self._owns_db_manager:
+            await self._db_manager.close()
+            self._db_manager = None
     
     async def run_all_checks(self) -> Dict[str, Any]:
         """运行所有健康检查"""
@@ -38,51 +182,62 @@ class HealthChecker:
             "checks": {}
         }
         
-        # 1. 配置检查
-        config_result = await self._check_configuration()
-        self.results["checks"]["configuration"] = config_result
-        
-        # 2. 数据库检查
-        database_result = await self._check_database()
-        self.results["checks"]["database"] = database_result
-        
-        # 3. 存储检查
-        storage_result = await self._check_storage()
-        self.results["checks"]["storage"] = storage_result
-        
-        # 4. 依赖检查
-        dependencies_result = await self._check_dependencies()
-        self.results["checks"]["dependencies"] = dependencies_result
-        
-        # 5. 性能检查
-        performance_result = await self._check_performance()
-        self.results["checks"]["performance"] = performance_result
+        # 各检查项相互独立，并发执行
+        tasks = [
+            self._run_check(name, getattr(self, f"_check_{name}")())
+            for name, _ in self.CHECKS
+        ]
+        check_results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        # 6. 网络检查
-        network_result = await self._check_network()
-        self.results["checks"]["network"] = network_result
+        # 按固定顺序输出结果
+        for (name, label), result in zip(self.CHECKS, check_results):
+            if isinstance(result, Exception):
+                result = {
+                    "status": "error",
+                    "details": {"error": str(result)},
+                    "message": f"{name} 检查失败: {result}"
+                }
+            self.results["checks"][name] = result
+            
+            print(label)
+            print(f"   {self.STATUS_EMOJI.get(result['status'], '❓')} {result['message']}")
         
         # 计算总体状态
         self._calculate_overall_status()
         
         return self.results
     
+    async def _run_check(self, name: str, coro) -> Dict[str, Any]:
+        """运行单个检查项，超时则返回警告结果"""
+        timeout = self.timeouts[name]
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError:
+            return {
+                "status": "warning",
+                "details": {"timeout": timeout},
+                "message": f"{name} 检查超时 ({timeout}秒)"
+            }
+    
     async def _check_configuration(self) -> Dict[str, Any]:
         """检查配置"""
-        print("⚙️ 检查配置...")
-        
         try:
-            settings = Settings()
+            settings = self.settings
+            
+            # 文件系统调用放到线程池中执行，避免阻塞事件循环
+            config_file_exists, storage_path_exists = await asyncio.to_thread(
+                self._config_probe_sync, ".env", settings.storage_path
+            )
             
             checks = {
-                "config_file_exists": Path(".env").exists(),
+                "config_file_exists": config_file_exists,
                 "required_fields": {
                     "bot_token": bool(getattr(settings, 'bot_token', None)),
                     "api_id": bool(getattr(settings, 'api_id', None)),
                     "api_hash": bool(getattr(settings, 'api_hash', None)),
                     "database_url": bool(getattr(settings, 'database_url', None))
                 },
-                "storage_path": Path(settings.storage_path).exists() or True,  # 可以创建
+                "storage_path": storage_path_exists or True,  # 可以创建
                 "settings_valid": True
             }
             
@@ -94,7 +249,6 @@ class HealthChecker:
                 "message": "配置正常" if all_required else "部分必需配置缺失"
             }
             
-            print(f"   {'✅' if all_required else '⚠️'} {result['message']}")
             return result
             
         except Exception as e:
@@ -103,37 +257,35 @@ class HealthChecker:
                 "details": {"error": str(e)},
                 "message": f"配置检查失败: {e}"
             }
-            print(f"   ❌ {result['message']}")
             return result
     
     async def _check_database(self) -> Dict[str, Any]:
         """检查数据库"""
-        print("🗄️ 检查数据库...")
-        
         try:
-            settings = Settings()
-            db_manager = DatabaseManager(settings)
-            
             # 测试数据库连接
-            await db_manager.initialize()
+            db_manager = await self._get_db()
             health = await db_manager.health_check()
             
             # 检查表结构
             async with db_manager.get_async_session() as session:
-                from sqlalchemy import text
+                from sqlalchemy import bindparam, text
                 
-                # 检查主要表是否存在
+                # 检查主要表是否存在（一次查询获取全部表名）
                 tables_to_check = ["channels", "messages", "tags", "message_tags"]
-                existing_tables = []
                 
-                for table in tables_to_check:
-                    try:
-                        result = await session.execute(text(f"SELECT 1 FROM {table} LIMIT 1"))
-                        existing_tables.append(table)
-                    except:
-                        pass
-            
-            await db_manager.close()
+                if db_manager.engine.dialect.name == "sqlite":
+                    query = text(
+                        "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN :names"
+                    )
+                else:
+                    query = text(
+                        "SELECT table_name FROM information_schema.tables WHERE table_name IN :names"
+                    )
+                query = query.bindparams(bindparam("names", expanding=True))
+                
+                rows = await session.execute(query, {"names": tables_to_check})
+                found_tables = set(rows.scalars().all())
+                existing_tables = [t for t in tables_to_check if t in found_tables]
             
             result = {
                 "status": "healthy" if health and len(existing_tables) == len(tables_to_check) else "warning",
@@ -145,7 +297,6 @@ class HealthChecker:
                 "message": "数据库正常" if health else "数据库连接失败"
             }
             
-            print(f"   {'✅' if health else '❌'} {result['message']}")
             return result
             
         except Exception as e:
@@ -154,43 +305,22 @@ class HealthChecker:
                 "details": {"error": str(e)},
                 "message": f"数据库检查失败: {e}"
             }
-            print(f"   ❌ {result['message']}")
             return result
     
     async def _check_storage(self) -> Dict[str, Any]:
         """检查存储"""
-        print("💾 检查存储...")
-        
         try:
-            settings = Settings()
-            storage_path = Path(settings.storage_path)
+            storage_path = Path(self.settings.storage_path)
             
-            # 检查存储路径
-            can_create = True
-            can_write = True
-            
-            try:
-                storage_path.mkdir(parents=True, exist_ok=True)
-                
-                # 测试写入权限
-                test_file = storage_path / "health_check_test.txt"
-                test_file.write_text("health check")
-                test_file.unlink()
-                
-            except Exception as e:
-                can_create = False
-                can_write = False
-            
-            # 检查磁盘空间
-            import shutil
-            disk_usage = shutil.disk_usage(storage_path.parent)
-            free_gb = disk_usage.free / (1024**3)
+            can_create, can_write, free_gb, path_exists = await asyncio.to_thread(
+                self._storage_probe_sync, storage_path
+            )
             
             result = {
                 "status": "healthy" if can_create and can_write and free_gb > 1 else "warning",
                 "details": {
                     "storage_path": str(storage_path),
-                    "path_exists": storage_path.exists(),
+                    "path_exists": path_exists,
                     "can_create": can_create,
                     "can_write": can_write,
                     "free_space_gb": free_gb
@@ -198,7 +328,6 @@ class HealthChecker:
                 "message": "存储正常" if can_write else "存储访问异常"
             }
             
-            print(f"   {'✅' if can_write else '❌'} {result['message']}")
             return result
             
         except Exception as e:
@@ -207,28 +336,61 @@ class HealthChecker:
                 "details": {"error": str(e)},
                 "message": f"存储检查失败: {e}"
             }
-            print(f"   ❌ {result['message']}")
             return result
     
-    async def _check_dependencies(self) -> Dict[str, Any]:
-        """检查依赖"""
-        print("📦 检查依赖...")
+    @staticmethod
+    def _config_probe_sync(config_file: str, storage_path: str) -> Tuple[bool, bool]:
+        """检查配置文件和存储路径是否存在（阻塞调用）"""
+        return _path_exists(config_file), _path_exists(storage_path)
+    
+    @staticmethod
+    def _storage_probe_sync(storage_path: Path) -> Tuple[bool, bool, float, bool]:
+        """
+        检查存储路径的创建、写入权限和磁盘空间（阻塞调用）
         
-        required_packages = [
-            "telethon", "python-telegram-bot", "sqlalchemy", 
-            "aiofiles", "pillow", "opencv-python", "numpy"
-        ]
+        Returns:
+            Tuple: (可创建, 可写入, 剩余空间GB, 路径存在)
+        """
+        can_create = True
+        can_write = True
         
+        try:
+            storage_path.mkdir(parents=True, exist_ok=True)
+            
+            # 测试写入权限
+            test_file = storage_path / "health_check_test.txt"
+            test_file.write_text("health check")
+            test_file.unlink()
+            
+        except Exception:
+            can_create = False
+            can_write = False
+        
+        # 检查磁盘空间
+        disk_usage = shutil.disk_usage(storage_path.parent)
+        free_gb = disk_usage.free / (1024**3)
+        
+        return can_create, can_write, free_gb, _path_exists(storage_path)
+    
+    def _scan_deps(self) -> Tuple[List[str], List[str]]:
+        """扫描必需依赖（阻塞调用），返回 (已安装, 缺失)"""
         installed_packages = []
         missing_packages = []
         
-        for package in required_packages:
-            try:
-                __import__(package.replace("-", "_"))
+        for package, module in self.REQUIRED_PACKAGES.items():
+            if _module_available(module):
                 installed_packages.append(package)
-            except ImportError:
+            else:
                 missing_packages.append(package)
         
+        return installed_packages, missing_packages
+    
+    async def _check_dependencies(self) -> Dict[str, Any]:
+        """检查依赖"""
+        required_packages = self.REQUIRED_PACKAGES
+        
+        installed_packages, missing_packages = await asyncio.to_thread(self._scan_deps)
+        
         result = {
             "status": "healthy" if not missing_packages else "error",
             "details": {
@@ -239,16 +401,12 @@ class HealthChecker:
             "message": "所有依赖已安装" if not missing_packages else f"缺失 {len(missing_packages)} 个依赖"
         }
         
-        print(f"   {'✅' if not missing_packages else '❌'} {result['message']}")
         return result
     
     async def _check_performance(self) -> Dict[str, Any]:
         """检查性能"""
-        print("⚡ 检查性能...")
-        
         try:
-            monitor = PerformanceMonitor()
-            metrics = await monitor.collect_metrics()
+            metrics = await get_cached_metrics()
             
             # 评估性能状态
             cpu_ok = metrics["cpu"]["percent"] < 80
@@ -268,7 +426,6 @@ class HealthChecker:
                 "message": "性能正常" if performance_ok else "性能指标异常"
             }
             
-            print(f"   {'✅' if performance_ok else '⚠️'} {result['message']}")
             return result
             
         except Exception as e:
@@ -277,24 +434,22 @@ class HealthChecker:
                 "details": {"error": str(e)},
                 "message": f"性能检查失败: {e}"
             }
-            print(f"   ❌ {result['message']}")
             return result
     
     async def _check_network(self) -> Dict[str, Any]:
         """检查网络"""
-        print("🌐 检查网络...")
-        
         try:
-            import aiohttp
-            
-            # 测试网络连接
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                try:
-                    async with session.get("https://api.telegram.org") as response:
-                        telegram_accessible = response.status == 200
-                except:
-                    telegram_accessible = False
+            # 测试网络连接（仅建立TCP连接，无需TLS握手和HTTP请求）
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection("api.telegram.org", 443),
+                    timeout=self.NETWORK_CONNECT_TIMEOUT
+                )
+                writer.close()
+                await writer.wait_closed()
+                telegram_accessible = True
+            except Exception:
+                telegram_accessible = False
             
             result = {
                 "status": "healthy" if telegram_accessible else "warning",
@@ -304,7 +459,6 @@ class HealthChecker:
                 "message": "网络连接正常" if telegram_accessible else "Telegram API不可访问"
             }
             
-            print(f"   {'✅' if telegram_accessible else '⚠️'} {result['message']}")
             return result
             
         except Exception as e:
@@ -313,19 +467,20 @@ class HealthChecker:
                 "details": {"error": str(e)},
                 "message": f"网络检查失败: {e}"
             }
-            print(f"   ❌ {result['message']}")
             return result
     
     def _calculate_overall_status(self):
-        """计算总体状态"""
-        statuses = [check["status"] for check in self.results["checks"].values()]
+        """计算总体状态（单次遍历，遇到错误立即结束）"""
+        worst = "healthy"
+        for check in self.results["checks"].values():
+            status = check["status"]
+            if status == "error":
+                worst = "error"
+                break
+            if status == "warning":
+                worst = "warning"
         
-        if "error" in statuses:
-            self.results["overall_status"] = "error"
-        elif "warning" in statuses:
-            self.results["overall_status"] = "warning"
-        else:
-            self.results["overall_status"] = "healthy"
+        self.results["overall_status"] = worst
     
     def print_summary(self):
         """打印检查摘要"""
@@ -333,12 +488,7 @@ class HealthChecker:
         print("📋 健康检查摘要")
         print("=" * 50)
         
-        status_emoji = {
-            "healthy": "✅",
-            "warning": "⚠️", 
-            "error": "❌",
-            "unknown": "❓"
-        }
+        status_emoji = self.STATUS_EMOJI
         
         overall_emoji = status_emoji.get(self.results["overall_status"], "❓")
         print(f"🏥 总体状态: {overall_emoji} {self.results['overall_status'].upper()}")
@@ -357,6 +507,17 @@ class HealthChecker:
             print("\n🎉 系统健康状态良好!")
 
 
+async def save_report(results: Dict[str, Any], path: str):
+    """保存健康检查报告（优先使用 orjson 序列化，异步写入文件）"""
+    if ORJSON_AVAILABLE:
+        payload = orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")
+    
+    async with aiofiles.open(path, "wb") as f:
+        await f.write(payload)
+
+
 async def main():
     """主函数"""
     print("🏥 Telegram Bot 采集系统 - 健康检查")
@@ -372,9 +533,7 @@ async def main():
         checker.print_summary()
         
         # 保存结果
-        import json
-        with open("health_check_report.json", "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        await save_report(results, "health_check_report.json")
         
         print(f"\n📄 详细报告已保存: health_check_report.json")
         
@@ -391,6 +550,8 @@ async def main():
         import traceback
         traceback.print_exc()
         return 3
+    finally:
+        await checker.aclose()
 
 
 if __name__ == "__main__":
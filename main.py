@@ -11,11 +11,17 @@ import logging
 import sys
 from pathlib import Path
 
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 # 添加项目根目录到Python路径
 sys.path.append(str(Path(__file__).parent))
 
 from src.bot.telegram_bot import TelegramBot
-from src.config.settings import Settings
+from src.config.settings import get_settings
 from src.database.database_manager import DatabaseManager
 from src.utils.logger import setup_logger
 
@@ -28,11 +34,11 @@ async def main():
     
     try:
         # 加载配置
-        settings = Settings()
+        settings = get_settings()
         logger.info("配置加载完成")
         
         # 初始化数据库
-        db_manager = DatabaseManager(settings.database_url)
+        db_manager = DatabaseManager(settings.database_url, pool_size=settings.db_pool_size)
         await db_manager.initialize()
         logger.info("数据库初始化完成")
         
@@ -53,5 +59,9 @@ async def main():
 
 
 if __name__ == "__main__":
+    # 使用 uvloop 事件循环（需在创建事件循环之前安装）
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
+    
     # 运行主程序
     asyncio.run(main())
@@ -8,7 +8,6 @@
 import asyncio
 import sys
 import os
-import subprocess
 import time
 from pathlib import Path
 
@@ -17,6 +16,11 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.utils.performance_monitor import run_performance_benchmark
 
+# 覆盖率数据文件：单元测试写入主文件，集成测试单独记录后合并
+COVERAGE_DATA_FILE = ".coverage"
+INTEGRATION_COVERAGE_FILE = ".coverage.integration"
+COVERAGE_FAIL_UNDER = 70
+
 
 def run_pytest_tests():
     """运行pytest测试"""
@@ -24,35 +28,30 @@ def run_pytest_tests():
     print("=" * 50)
     
     try:
-        # 运行pytest命令
-        result = subprocess.run([
-            sys.executable, "-m", "pytest", 
+        import pytest
+        
+        # 在当前进程内运行pytest，输出直接流式打印到终端
+        returncode = pytest.main([
             "tests/", 
+            "-o", "addopts=",       # 忽略pytest.ini中的addopts，选项在此显式给出
+            "-n", "auto",           # 按CPU核数并行执行
+            "--dist=loadfile",      # 同一文件的测试分配到同一进程
             "-v",                    # 详细输出
             "--tb=short",           # 简短的错误回溯
+            "--strict-markers",
+            "--disable-warnings",
             "--durations=10",       # 显示最慢的10个测试
             "--cov=src",            # 代码覆盖率
-            "--cov-report=term-missing",  # 显示未覆盖的行
-            "--cov-report=html:htmlcov"   # 生成HTML覆盖率报告
-        ], capture_output=True, text=True, timeout=300)
-        
-        print("📊 测试结果:")
-        print(result.stdout)
+            "--cov-report="         # 只写入覆盖率数据，合并后统一生成报告
+        ])
         
-        if result.stderr:
-            print("⚠️ 警告和错误:")
-            print(result.stderr)
-        
-        if result.returncode == 0:
+        if returncode == 0:
             print("✅ 所有测试通过!")
         else:
-            print(f"❌ 测试失败，退出码: {result.returncode}")
+            print(f"❌ 测试失败，退出码: {int(returncode)}")
         
-        return result.returncode == 0
+        return returncode == 0
         
-    except subprocess.TimeoutExpired:
-        print("❌ 测试超时（5分钟）")
-        return False
     except Exception as e:
         print(f"❌ 运行测试时出错: {e}")
         return False
@@ -63,18 +62,20 @@ def check_test_dependencies():
     print("🔍 检查测试依赖")
     print("=" * 30)
     
-    required_packages = [
-        "pytest",
-        "pytest-asyncio", 
-        "pytest-cov",
-        "psutil"
-    ]
+    # 包名 -> 导入模块名
+    required_packages = {
+        "pytest": "pytest",
+        "pytest-asyncio": "pytest_asyncio",
+        "pytest-cov": "pytest_cov",
+        "pytest-xdist": "xdist",
+        "psutil": "psutil"
+    }
     
     missing_packages = []
     
-    for package in required_packages:
+    for package, module in required_packages.items():
         try:
-            __import__(package.replace("-", "_"))
+            __import__(module)
             print(f"✅ {package}")
         except ImportError:
             print(f"❌ {package} - 未安装")
@@ -100,18 +101,18 @@ async def run_integration_tests():
         from src.config.settings import Settings
         from src.database.database_manager import DatabaseManager
         
-        # 使用临时数据库
+        # 使用共享缓存的内存数据库（同步和异步引擎连接到同一个库），仅存储路径使用临时目录
         import tempfile
         with tempfile.TemporaryDirectory() as temp_dir:
             settings = Settings(
-                database_url=f"sqlite:///{temp_dir}/test_integration.db",
+                database_url="sqlite:///file:memdb?mode=memory&cache=shared&uri=true",
                 storage_path=f"{temp_dir}/storage",
                 bot_token="test_token",
                 api_id=12345,
                 api_hash="test_hash"
             )
             
-            db_manager = DatabaseManager(settings)
+            db_manager = DatabaseManager(settings.database_url)
             await db_manager.initialize()
             
             # 测试健康检查
@@ -138,6 +139,49 @@ async def run_integration_tests():
         return False
 
 
+def run_integration_tests_with_coverage():
+    """在覆盖率统计下运行集成测试"""
+    import coverage
+    
+    cov = coverage.Coverage(data_file=INTEGRATION_COVERAGE_FILE, source=["src"])
+    cov.erase()
+    cov.start()
+    try:
+        return asyncio.run(run_integration_tests())
+    finally:
+        cov.stop()
+        cov.save()
+
+
+def generate_coverage_report():
+    """合并集成测试与单元测试的覆盖率数据，并生成一次报告"""
+    print("\n📈 生成覆盖率报告")
+    print("=" * 30)
+    
+    try:
+        import coverage
+        
+        cov = coverage.Coverage(data_file=COVERAGE_DATA_FILE, source=["src"])
+        cov.load()
+        if Path(INTEGRATION_COVERAGE_FILE).exists():
+            cov.combine([INTEGRATION_COVERAGE_FILE])
+        cov.save()
+        
+        total = cov.report(show_missing=True)
+        cov.html_report(directory="htmlcov")
+        
+        if total < COVERAGE_FAIL_UNDER:
+            print(f"❌ 覆盖率 {total:.1f}% 低于要求的 {COVERAGE_FAIL_UNDER}%")
+            return False
+        
+        print(f"✅ 覆盖率 {total:.1f}%")
+        return True
+        
+    except Exception as e:
+        print(f"❌ 生成覆盖率报告失败: {e}")
+        return False
+
+
 def generate_test_report():
     """生成测试报告"""
     print("\n📋 生成测试报告")
@@ -186,8 +230,8 @@ def generate_test_report():
         return False
 
 
-async def main():
-    """主函数"""
+def main():
+    """主函数（同步驱动，仅集成测试部分使用事件循环）"""
     print("🚀 Telegram Bot 采集系统 - 测试套件")
     print("=" * 60)
     
@@ -199,7 +243,7 @@ async def main():
         return 1
     
     # 2. 运行集成测试
-    integration_success = await run_integration_tests()
+    integration_success = run_integration_tests_with_coverage()
     if not integration_success:
         print("❌ 集成测试失败")
         return 1
@@ -207,10 +251,13 @@ async def main():
     # 3. 运行pytest测试
     pytest_success = run_pytest_tests()
     
-    # 4. 生成测试报告
+    # 4. 合并覆盖率并生成报告
+    coverage_success = generate_coverage_report()
+    
+    # 5. 生成测试报告
     generate_test_report()
     
-    # 5. 总结
+    # 6. 总结
     end_time = time.time()
     total_time = end_time - start_time
     
@@ -219,7 +266,7 @@ async def main():
     print("=" * 60)
     print(f"总耗时: {total_time:.2f} 秒")
     
-    if integration_success and pytest_success:
+    if integration_success and pytest_success and coverage_success:
         print("🎉 所有测试通过!")
         print("✅ 系统功能正常")
         print("📋 详细报告: test_report.md")
@@ -231,12 +278,14 @@ async def main():
             print("  - 集成测试失败")
         if not pytest_success:
             print("  - 单元测试失败")
+        if not coverage_success:
+            print("  - 覆盖率未达标")
         return 1
 
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = main()
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\n⚠️ 测试被用户中断")
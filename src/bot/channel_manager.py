@@ -4,14 +4,13 @@
 负责频道的添加、删除、更新和状态管理
 """
 
+import asyncio
 import re
-from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, update, delete, func
 from sqlalchemy.exc import IntegrityError
 from telethon import TelegramClient
-from telethon.tl.types import Channel as TelegramChannel, Chat
 from telethon.errors import (
     ChannelPrivateError, ChannelInvalidError, 
     UsernameNotOccupiedError, FloodWaitError
@@ -20,6 +19,37 @@ from telethon.errors import (
 from ..database.database_manager import DatabaseManager
 from ..database.models import Channel, ChannelStatus, UserSettings
 from ..utils.logger import LoggerMixin
+from ..utils.cache import TTLCache
+from ..utils.rate_limiter import AsyncTokenBucket
+
+# 频道输入正则表达式：依次匹配 频道URL（其后可跟任意路径）、@用户名、纯用户名
+_CHANNEL_INPUT_RE = re.compile(
+    r'^\s*(?:'
+    r'(?:https?://)?(?:www\.)?(?:t\.me|telegram\.me)/(?P<url>[a-zA-Z0-9_]+).*'
+    r'|@(?P<at>[a-zA-Z0-9_]+)\s*$'
+    r'|(?P<name>[a-zA-Z0-9_]+)\s*$'
+    r')'
+)
+
+# 只读查询语句（模块级复用，SQLAlchemy 会缓存其编译结果）
+_ACTIVE_CHANNELS_LITE_STMT = select(
+    Channel.id,
+    Channel.channel_id,
+    Channel.channel_username,
+    Channel.channel_title
+).where(Channel.status == ChannelStatus.ACTIVE)
+
+_CHANNEL_LIST_COLUMNS = (
+    Channel.id,
+    Channel.channel_id,
+    Channel.channel_title,
+    Channel.channel_username,
+    Channel.status,
+    Channel.total_messages,
+    Channel.processed_messages,
+    Channel.last_check_time,
+    Channel.created_at
+)
 
 
 class ChannelManager(LoggerMixin):
@@ -36,10 +66,11 @@ class ChannelManager(LoggerMixin):
         self.db_manager = db_manager
         self.client = telegram_client
         
-        # 频道URL正则表达式
-        self.channel_url_pattern = re.compile(
-            r'(?:https?://)?(?:www\.)?(?:t\.me|telegram\.me)/([a-zA-Z0-9_]+)'
-        )
+        # Telegram实体查询限流（主动控制请求速率，减少FloodWait）
+        self._entity_limiter = AsyncTokenBucket(rate=20, capacity=20)
+        
+        # 频道信息缓存（重试或重复添加时避免重复请求Telegram）
+        self._entity_cache = TTLCache(maxsize=1024, ttl=300)
         
         self.logger.info("频道管理器初始化完成")
     
@@ -85,16 +116,7 @@ class ChannelManager(LoggerMixin):
                     }
                 
                 # 创建新频道记录
-                new_channel = Channel(
-                    channel_id=str(channel_info["id"]),
-                    channel_username=channel_info.get("username"),
-                    channel_title=channel_info["title"],
-                    channel_description=channel_info.get("about", ""),
-                    status=ChannelStatus.ACTIVE,
-                    added_by_user_id=user_id,
-                    total_messages=0,
-                    processed_messages=0
-                )
+                new_channel = self._new_channel_record(channel_info, user_id)
                 
                 session.add(new_channel)
                 await session.commit()
@@ -103,13 +125,7 @@ class ChannelManager(LoggerMixin):
                 
                 return {
                     "success": True,
-                    "channel": {
-                        "id": new_channel.id,
-                        "channel_id": new_channel.channel_id,
-                        "title": new_channel.channel_title,
-                        "username": new_channel.channel_username,
-                        "status": new_channel.status
-                    }
+                    "channel": self._channel_summary(new_channel)
                 }
                 
         except IntegrityError:
@@ -124,6 +140,101 @@ class ChannelManager(LoggerMixin):
                 "error": f"添加频道时发生错误: {str(e)}"
             }
     
+    async def add_channels_bulk(self, channel_inputs: List[str], user_id: str) -> Dict[str, Any]:
+        """
+        批量添加频道到监控列表
+        
+        并发获取所有频道信息，并用一次查询检查已存在的频道、一次提交写入新频道
+        
+        Args:
+            channel_inputs: 频道链接或用户名列表
+            user_id: 添加者的用户ID
+        
+        Returns:
+            Dict: 操作结果，包含已添加的频道和失败项
+        """
+        added = []
+        failed = []
+        
+        try:
+            # 解析频道标识符
+            identifiers = []
+            for channel_input in channel_inputs:
+                channel_identifier = self._parse_channel_input(channel_input)
+                if channel_identifier:
+                    identifiers.append((channel_input, channel_identifier))
+                else:
+                    failed.append({"input": channel_input, "error": "无效的频道链接或用户名格式"})
+            
+            self.logger.info(f"用户 {user_id} 尝试批量添加 {len(identifiers)} 个频道")
+            
+            # 批量获取频道信息
+            infos = await self._get_channel_info_batch(
+                [identifier for _, identifier in identifiers]
+            )
+            
+            candidates = {}
+            for (channel_input, _), channel_info in zip(identifiers, infos):
+                if not channel_info:
+                    failed.append({"input": channel_input, "error": "无法获取频道信息"})
+                    continue
+                candidates.setdefault(str(channel_info["id"]), (channel_input, channel_info))
+            
+            if not candidates:
+                return {"success": True, "added": added, "failed": failed}
+            
+            new_channels = []
+            try:
+                async with self.db_manager.get_async_session() as session:
+                    # 一次查询检查已存在的频道
+                    result = await session.execute(
+                        select(Channel.channel_id).where(Channel.channel_id.in_(list(candidates)))
+                    )
+                    existing_ids = set(result.scalars().all())
+                    
+                    for channel_id, (channel_input, channel_info) in candidates.items():
+                        if channel_id in existing_ids:
+                            failed.append({"input": channel_input, "error": "频道已存在于监控列表中"})
+                        else:
+                            new_channels.append(self._new_channel_record(channel_info, user_id))
+                    
+                    session.add_all(new_channels)
+                    await session.flush()
+                    summaries = [self._channel_summary(channel) for channel in new_channels]
+                    await session.commit()
+                
+                added = summaries
+                
+            except IntegrityError:
+                # 并发添加导致冲突时，退回逐条写入
+                added = []
+                for channel in new_channels:
+                    channel_info = candidates[channel.channel_id][1]
+                    try:
+                        async with self.db_manager.get_async_session() as session:
+                            new_channel = self._new_channel_record(channel_info, user_id)
+                            session.add(new_channel)
+                            await session.flush()
+                            summary = self._channel_summary(new_channel)
+                            await session.commit()
+                        added.append(summary)
+                    except IntegrityError:
+                        failed.append({
+                            "input": candidates[channel.channel_id][0],
+                            "error": "频道已存在"
+                        })
+            
+            self.logger.info(f"批量添加频道完成: 成功 {len(added)} 个，失败 {len(failed)} 个")
+            
+            return {"success": True, "added": added, "failed": failed}
+            
+        except Exception as e:
+            self.logger.error(f"批量添加频道失败: {e}")
+            return {
+                "success": False,
+                "error": f"批量添加频道时发生错误: {str(e)}"
+            }
+    
     async def remove_channel(self, channel_id: str, user_id: str) -> Dict[str, Any]:
         """
         从监控列表中移除频道
@@ -140,40 +251,35 @@ class ChannelManager(LoggerMixin):
                 # 查找频道（支持数据库ID和Telegram频道ID）
                 if channel_id.isdigit():
                     # 数据库ID
-                    channel = await session.execute(
-                        select(Channel).where(Channel.id == int(channel_id))
-                    )
+                    condition = Channel.id == int(channel_id)
                 else:
                     # Telegram频道ID
-                    channel = await session.execute(
-                        select(Channel).where(Channel.channel_id == channel_id)
-                    )
+                    condition = Channel.channel_id == channel_id
+                
+                # 检查权限（可选：只允许添加者删除，可在条件中加入
+                # Channel.added_by_user_id == user_id）
                 
-                channel = channel.scalar_one_or_none()
-                if not channel:
+                # 标记为已删除而不是直接删除（保留历史数据），一条语句完成查找和更新
+                result = await session.execute(
+                    update(Channel)
+                    .where(condition)
+                    .values(status=ChannelStatus.DELETED)
+                    .returning(Channel.channel_title)
+                )
+                channel_title = result.scalar_one_or_none()
+                if channel_title is None:
                     return {
                         "success": False,
                         "error": "频道不存在"
                     }
                 
-                # 检查权限（可选：只允许添加者删除）
-                # if channel.added_by_user_id != user_id:
-                #     return {
-                #         "success": False,
-                #         "error": "只有频道添加者可以删除频道"
-                #     }
-                
-                # 标记为已删除而不是直接删除（保留历史数据）
-                channel.status = ChannelStatus.DELETED
-                channel.updated_at = datetime.utcnow()
-                
                 await session.commit()
                 
-                self.logger.info(f"用户 {user_id} 删除了频道: {channel.channel_title}")
+                self.logger.info(f"用户 {user_id} 删除了频道: {channel_title}")
                 
                 return {
                     "success": True,
-                    "message": f"频道 '{channel.channel_title}' 已从监控列表中移除"
+                    "message": f"频道 '{channel_title}' 已从监控列表中移除"
                 }
                 
         except Exception as e:
@@ -183,34 +289,49 @@ class ChannelManager(LoggerMixin):
                 "error": f"删除频道时发生错误: {str(e)}"
             }
     
-    async def list_channels(self, user_id: str, include_deleted: bool = False) -> Dict[str, Any]:
+    async def list_channels(self, user_id: str, include_deleted: bool = False,
+                            page: int = 1, page_size: int = 50) -> Dict[str, Any]:
         """
-        获取用户的频道列表
+        获取用户的频道列表（分页）
         
         Args:
             user_id: 用户ID
             include_deleted: 是否包含已删除的频道
+            page: 页码（从1开始）
+            page_size: 每页数量
         
         Returns:
             Dict: 频道列表
         """
         try:
-            async with self.db_manager.get_async_session() as session:
-                # 构建查询
-                query = select(Channel).where(Channel.added_by_user_id == user_id)
+            page = max(page, 1)
+            
+            async with self.db_manager.get_async_connection() as conn:
+                # 构建查询条件
+                conditions = [Channel.added_by_user_id == user_id]
                 
                 if not include_deleted:
-                    query = query.where(Channel.status != ChannelStatus.DELETED)
+                    conditions.append(Channel.status != ChannelStatus.DELETED)
+                
+                # 总数由数据库统计，无需加载全部记录
+                total = (await conn.execute(
+                    select(func.count()).select_from(Channel).where(*conditions)
+                )).scalar_one()
                 
-                query = query.order_by(Channel.created_at.desc())
+                query = (
+                    select(*_CHANNEL_LIST_COLUMNS)
+                    .where(*conditions)
+                    .order_by(Channel.created_at.desc())
+                    .limit(page_size)
+                    .offset((page - 1) * page_size)
+                )
                 
-                result = await session.execute(query)
-                channels = result.scalars().all()
+                # 流式读取结果，边读取边格式化，避免先物化全部行
+                result = await conn.stream(query.execution_options(yield_per=200))
                 
                 # 格式化频道信息
-                channel_list = []
-                for channel in channels:
-                    channel_info = {
+                channel_list = [
+                    {
                         "id": channel.id,
                         "channel_id": channel.channel_id,
                         "title": channel.channel_title,
@@ -221,12 +342,15 @@ class ChannelManager(LoggerMixin):
                         "last_check_time": channel.last_check_time.isoformat() if channel.last_check_time else None,
                         "created_at": channel.created_at.isoformat()
                     }
-                    channel_list.append(channel_info)
+                    async for channel in result
+                ]
                 
                 return {
                     "success": True,
                     "channels": channel_list,
-                    "total": len(channel_list)
+                    "total": total,
+                    "page": page,
+                    "page_size": page_size
                 }
                 
         except Exception as e:
@@ -249,11 +373,16 @@ class ChannelManager(LoggerMixin):
         """
         try:
             async with self.db_manager.get_async_session() as session:
-                await session.execute(
+                result = await session.execute(
                     update(Channel)
                     .where(Channel.channel_id == channel_id)
-                    .values(status=status, updated_at=datetime.utcnow())
+                    .values(status=status)
+                    .returning(Channel.channel_id)
                 )
+                if result.scalar_one_or_none() is None:
+                    self.logger.warning(f"更新频道状态失败: 频道 {channel_id} 不存在")
+                    return False
+                
                 await session.commit()
                 
                 self.logger.info(f"频道 {channel_id} 状态更新为: {status}")
@@ -281,6 +410,45 @@ class ChannelManager(LoggerMixin):
             self.logger.error(f"获取活跃频道失败: {e}")
             return []
     
+    async def get_active_channels_lite(self) -> List[Tuple[int, str, Optional[str], str]]:
+        """
+        获取所有活跃频道的基本信息（不构建ORM对象，适用于轮询等高频场景）
+        
+        Returns:
+            List[Tuple]: (数据库ID, 频道ID, 频道用户名, 频道标题) 列表
+        """
+        try:
+            async with self.db_manager.get_async_connection() as conn:
+                result = await conn.execute(_ACTIVE_CHANNELS_LITE_STMT)
+                return [tuple(row) for row in result.all()]
+                
+        except Exception as e:
+            self.logger.error(f"获取活跃频道失败: {e}")
+            return []
+    
+    def _new_channel_record(self, channel_info: Dict[str, Any], user_id: str) -> Channel:
+        """根据频道信息创建新的频道记录"""
+        return Channel(
+            channel_id=str(channel_info["id"]),
+            channel_username=channel_info.get("username"),
+            channel_title=channel_info["title"],
+            channel_description=channel_info.get("about", ""),
+            status=ChannelStatus.ACTIVE,
+            added_by_user_id=user_id,
+            total_messages=0,
+            processed_messages=0
+        )
+    
+    def _channel_summary(self, channel: Channel) -> Dict[str, Any]:
+        """频道记录的简要信息"""
+        return {
+            "id": channel.id,
+            "channel_id": channel.channel_id,
+            "title": channel.channel_title,
+            "username": channel.channel_username,
+            "status": channel.status
+        }
+    
     def _parse_channel_input(self, channel_input: str) -> Optional[str]:
         """
         解析频道输入，提取频道标识符
@@ -291,22 +459,11 @@ class ChannelManager(LoggerMixin):
         Returns:
             Optional[str]: 频道标识符
         """
-        channel_input = channel_input.strip()
-        
-        # 匹配URL格式
-        url_match = self.channel_url_pattern.match(channel_input)
-        if url_match:
-            return url_match.group(1)
-        
-        # 匹配@username格式
-        if channel_input.startswith('@'):
-            return channel_input[1:]
-        
-        # 直接是用户名
-        if re.match(r'^[a-zA-Z0-9_]+$', channel_input):
-            return channel_input
+        match = _CHANNEL_INPUT_RE.match(channel_input)
+        if not match:
+            return None
         
-        return None
+        return match.group('url') or match.group('at') or match.group('name')
     
     async def _get_channel_info(self, channel_identifier: str) -> Optional[Dict[str, Any]]:
         """
@@ -318,24 +475,18 @@ class ChannelManager(LoggerMixin):
         Returns:
             Optional[Dict]: 频道信息
         """
+        cached = self._entity_cache.get(channel_identifier)
+        if cached is not None:
+            return cached
+        
         try:
             # 获取频道实体
-            entity = await self.client.get_entity(channel_identifier)
-            
-            if not isinstance(entity, (TelegramChannel, Chat)):
-                return None
-            
-            # 提取频道信息
-            channel_info = {
-                "id": entity.id,
-                "title": entity.title,
-                "username": getattr(entity, 'username', None),
-                "about": getattr(entity, 'about', ''),
-                "participants_count": getattr(entity, 'participants_count', 0),
-                "is_broadcast": getattr(entity, 'broadcast', False),
-                "is_megagroup": getattr(entity, 'megagroup', False)
-            }
+            async with self._entity_limiter:
+                entity = await self.client.get_entity(channel_identifier)
             
+            channel_info = self._entity_to_info(entity)
+            if channel_info:
+                self._entity_cache.set(channel_identifier, channel_info)
             return channel_info
             
         except (ChannelPrivateError, ChannelInvalidError, UsernameNotOccupiedError) as e:
@@ -347,3 +498,73 @@ class ChannelManager(LoggerMixin):
         except Exception as e:
             self.logger.error(f"获取频道信息失败: {e}")
             return None
+    
+    async def _get_channel_info_batch(self, channel_identifiers: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        批量获取频道信息（一次 get_entity 调用解析多个标识符）
+        
+        Args:
+            channel_identifiers: 频道标识符列表
+        
+        Returns:
+            List[Optional[Dict]]: 与输入顺序一致的频道信息列表
+        """
+        results = [self._entity_cache.get(identifier) for identifier in channel_identifiers]
+        pending = list(dict.fromkeys(
+            identifier for identifier, info in zip(channel_identifiers, results) if info is None
+        ))
+        if not pending:
+            return results
+        
+        fetched: Dict[str, Optional[Dict[str, Any]]] = {}
+        try:
+            await self._entity_limiter.acquire(min(len(pending), self._entity_limiter.capacity))
+            entities = await self.client.get_entity(pending)
+            
+            for identifier, entity in zip(pending, entities):
+                try:
+                    channel_info = self._entity_to_info(entity)
+                except Exception as e:
+                    self.logger.warning(f"解析频道信息失败 {identifier}: {e}")
+                    channel_info = None
+                
+                if channel_info:
+                    self._entity_cache.set(identifier, channel_info)
+                fetched[identifier] = channel_info
+                
+        except FloodWaitError as e:
+            self.logger.warning(f"请求过于频繁，需要等待 {e.seconds} 秒")
+        except Exception as e:
+            # 任一标识符无效都会导致整批失败，退回逐个获取
+            self.logger.warning(f"批量获取频道信息失败，改为逐个获取: {e}")
+            infos = await asyncio.gather(*(self._get_channel_info(identifier) for identifier in pending))
+            fetched = dict(zip(pending, infos))
+        
+        return [
+            info if info is not None else fetched.get(identifier)
+            for identifier, info in zip(channel_identifiers, results)
+        ]
+    
+    def _entity_to_info(self, entity) -> Optional[Dict[str, Any]]:
+        """
+        从Telegram实体提取频道信息
+        
+        Args:
+            entity: Telegram实体
+        
+        Returns:
+            Optional[Dict]: 频道信息，非频道/群组实体返回None
+        """
+        # 只有频道和群组实体带有标题（用户实体没有 title 属性）
+        if not hasattr(entity, 'title'):
+            return None
+        
+        return {
+            "id": entity.id,
+            "title": entity.title,
+            "username": getattr(entity, 'username', None),
+            "about": getattr(entity, 'about', ''),
+            "participants_count": getattr(entity, 'participants_count', 0),
+            "is_broadcast": getattr(entity, 'broadcast', False),
+            "is_megagroup": getattr(entity, 'megagroup', False)
+        }
@@ -4,164 +4,210 @@
 提供命令的详细帮助信息和使用示例
 """
 
+import bisect
+from types import MappingProxyType
 from typing import Dict, List, Any
 from ..utils.logger import LoggerMixin
 
 
+# 命令信息（静态数据，所有实例共享的只读视图）
+_COMMANDS = {
+    # 基本命令
+    "start": {
+        "description": "启动机器人并显示欢迎信息",
+        "usage": "/start",
+        "examples": ("/start",),
+        "category": "基本命令"
+    },
+    "help": {
+        "description": "显示帮助信息",
+        "usage": "/help [命令名]",
+        "examples": ("/help", "/help add_channel"),
+        "category": "基本命令"
+    },
+    "status": {
+        "description": "查看系统运行状态",
+        "usage": "/status",
+        "examples": ("/status",),
+        "category": "基本命令"
+    },
+
+    # 频道管理
+    "add_channel": {
+        "description": "添加要监控的频道",
+        "usage": "/add_channel <频道链接或用户名>",
+        "examples": (
+            "/add_channel https://t.me/example_channel",
+            "/add_channel @example_channel",
+            "/add_channel -1001234567890"
+        ),
+        "category": "频道管理"
+    },
+    "remove_channel": {
+        "description": "移除监控的频道",
+        "usage": "/remove_channel <频道标识>",
+        "examples": (
+            "/remove_channel @example_channel",
+            "/remove_channel -1001234567890"
+        ),
+        "category": "频道管理"
+    },
+    "list_channels": {
+        "description": "列出所有已添加的频道",
+        "usage": "/list_channels",
+        "examples": ("/list_channels",),
+        "category": "频道管理"
+    },
+
+    # 标签和分类
+    "tags": {
+        "description": "管理标签系统",
+        "usage": "/tags [操作] [参数]",
+        "examples": (
+            "/tags",
+            "/tags add 搞笑视频",
+            "/tags remove 无用标签"
+        ),
+        "category": "标签分类"
+    },
+    "classify": {
+        "description": "查看和管理自动分类",
+        "usage": "/classify [操作]",
+        "examples": ("/classify", "/classify stats"),
+        "category": "标签分类"
+    },
+
+    # 去重检测
+    "dedup": {
+        "description": "查看去重统计和手动去重",
+        "usage": "/dedup [操作]",
+        "examples": ("/dedup", "/dedup scan"),
+        "category": "去重检测"
+    },
+
+    # 存储管理
+    "storage": {
+        "description": "查看存储使用情况和管理",
+        "usage": "/storage",
+        "examples": ("/storage",),
+        "category": "存储管理"
+    },
+    "downloads": {
+        "description": "查看下载队列和状态",
+        "usage": "/downloads",
+        "examples": ("/downloads",),
+        "category": "存储管理"
+    },
+    "download_mode": {
+        "description": "设置下载模式",
+        "usage": "/download_mode [模式]",
+        "examples": (
+            "/download_mode",
+            "/download_mode auto",
+            "/download_mode selective"
+        ),
+        "category": "存储管理"
+    },
+
+    # 统计和搜索
+    "stats": {
+        "description": "查看系统统计信息",
+        "usage": "/stats",
+        "examples": ("/stats",),
+        "category": "统计搜索"
+    },
+    "search": {
+        "description": "搜索文件和消息",
+        "usage": "/search <关键词>",
+        "examples": (
+            "/search 猫咪视频",
+            "/search .mp4",
+            "/search #搞笑"
+        ),
+        "category": "统计搜索"
+    },
+    "tag_stats": {
+        "description": "查看标签的媒体统计信息",
+        "usage": "/tag_stats [标签名]",
+        "examples": (
+            "/tag_stats",
+            "/tag_stats 搞笑视频",
+            "/tag_stats 猫咪"
+        ),
+        "category": "统计搜索"
+    },
+    "media_by_tag": {
+        "description": "查看指定媒体类型的标签分布",
+        "usage": "/media_by_tag <媒体类型>",
+        "examples": (
+            "/media_by_tag video",
+            "/media_by_tag image",
+            "/media_by_tag audio"
+        ),
+        "category": "统计搜索"
+    },
+
+    # 设置管理
+    "settings": {
+        "description": "查看和修改系统设置",
+        "usage": "/settings [类别]",
+        "examples": ("/settings", "/settings storage"),
+        "category": "设置管理"
+    }
+}
+
+COMMANDS = MappingProxyType(_COMMANDS)
+
+# 帮助文本以 HTML 模式发送，插入其中的纯文本需要转义的字符
+HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
 class CommandHelper(LoggerMixin):
     """命令帮助管理器"""
     
+    # 命令所需的最少参数个数
+    REQUIRED_ARGS = {
+        "add_channel": 1,
+        "remove_channel": 1,
+        "search": 1
+    }
+    
+    # 分类对应的图标
+    CATEGORY_EMOJIS = {
+        "基本命令": "🤖",
+        "频道管理": "📺", 
+        "标签分类": "🏷️",
+        "去重检测": "🔄",
+        "存储管理": "💾",
+        "统计搜索": "📊",
+        "设置管理": "⚙️"
+    }
+    
     def __init__(self):
         """初始化命令帮助管理器"""
-        self.commands = self._initialize_commands()
+        self.commands = COMMANDS
+        self._build_indexes()
         self.logger.info("命令帮助管理器初始化完成")
     
-    def _initialize_commands(self) -> Dict[str, Dict[str, Any]]:
-        """初始化命令信息"""
-        return {
-            # 基本命令
-            "start": {
-                "description": "启动机器人并显示欢迎信息",
-                "usage": "/start",
-                "examples": ["/start"],
-                "category": "基本命令"
-            },
-            "help": {
-                "description": "显示帮助信息",
-                "usage": "/help [命令名]",
-                "examples": ["/help", "/help add_channel"],
-                "category": "基本命令"
-            },
-            "status": {
-                "description": "查看系统运行状态",
-                "usage": "/status",
-                "examples": ["/status"],
-                "category": "基本命令"
-            },
-            
-            # 频道管理
-            "add_channel": {
-                "description": "添加要监控的频道",
-                "usage": "/add_channel <频道链接或用户名>",
-                "examples": [
-                    "/add_channel https://t.me/example_channel",
-                    "/add_channel @example_channel",
-                    "/add_channel -1001234567890"
-                ],
-                "category": "频道管理"
-            },
-            "remove_channel": {
-                "description": "移除监控的频道",
-                "usage": "/remove_channel <频道标识>",
-                "examples": [
-                    "/remove_channel @example_channel",
-                    "/remove_channel -1001234567890"
-                ],
-                "category": "频道管理"
-            },
-            "list_channels": {
-                "description": "列出所有已添加的频道",
-                "usage": "/list_channels",
-                "examples": ["/list_channels"],
-                "category": "频道管理"
-            },
-            
-            # 标签和分类
-            "tags": {
-                "description": "管理标签系统",
-                "usage": "/tags [操作] [参数]",
-                "examples": [
-                    "/tags",
-                    "/tags add 搞笑视频",
-                    "/tags remove 无用标签"
-                ],
-                "category": "标签分类"
-            },
-            "classify": {
-                "description": "查看和管理自动分类",
-                "usage": "/classify [操作]",
-                "examples": ["/classify", "/classify stats"],
-                "category": "标签分类"
-            },
-            
-            # 去重检测
-            "dedup": {
-                "description": "查看去重统计和手动去重",
-                "usage": "/dedup [操作]",
-                "examples": ["/dedup", "/dedup scan"],
-                "category": "去重检测"
-            },
-            
-            # 存储管理
-            "storage": {
-                "description": "查看存储使用情况和管理",
-                "usage": "/storage",
-                "examples": ["/storage"],
-                "category": "存储管理"
-            },
-            "downloads": {
-                "description": "查看下载队列和状态",
-                "usage": "/downloads",
-                "examples": ["/downloads"],
-                "category": "存储管理"
-            },
-            "download_mode": {
-                "description": "设置下载模式",
-                "usage": "/download_mode [模式]",
-                "examples": [
-                    "/download_mode",
-                    "/download_mode auto",
-                    "/download_mode selective"
-                ],
-                "category": "存储管理"
-            },
-            
-            # 统计和搜索
-            "stats": {
-                "description": "查看系统统计信息",
-                "usage": "/stats",
-                "examples": ["/stats"],
-                "category": "统计搜索"
-            },
-            "search": {
-                "description": "搜索文件和消息",
-                "usage": "/search <关键词>",
-                "examples": [
-                    "/search 猫咪视频",
-                    "/search .mp4",
-                    "/search #搞笑"
-                ],
-                "category": "统计搜索"
-            },
-            "tag_stats": {
-                "description": "查看标签的媒体统计信息",
-                "usage": "/tag_stats [标签名]",
-                "examples": [
-                    "/tag_stats",
-                    "/tag_stats 搞笑视频",
-                    "/tag_stats 猫咪"
-                ],
-                "category": "统计搜索"
-            },
-            "media_by_tag": {
-                "description": "查看指定媒体类型的标签分布",
-                "usage": "/media_by_tag <媒体类型>",
-                "examples": [
-                    "/media_by_tag video",
-                    "/media_by_tag image",
-                    "/media_by_tag audio"
-                ],
-                "category": "统计搜索"
-            },
-            
-            # 设置管理
-            "settings": {
-                "description": "查看和修改系统设置",
-                "usage": "/settings [类别]",
-                "examples": ["/settings", "/settings storage"],
-                "category": "设置管理"
-            }
-        }
+    def _build_indexes(self):
+        """预先计算分类索引、搜索索引和快速帮助文本（命令信息初始化后不再变化）"""
+        self._by_category: Dict[str, List[str]] = {}
+        for cmd_name, cmd_info in self.commands.items():
+            self._by_category.setdefault(cmd_info['category'], []).append(cmd_name)
+        
+        self._categories = tuple(sorted(self._by_category))
+        
+        # 搜索索引：命令名、描述和分类的小写拼接文本
+        self._search_index = [
+            (cmd_name, "\n".join((cmd_name, cmd_info['description'], cmd_info['category'])).lower())
+            for cmd_name, cmd_info in self.commands.items()
+        ]
+        
+        self._quick_help_text = self._format_quick_help()
+        self._help_texts = {cmd_name: self._format_command_help(cmd_name) for cmd_name in self.commands}
+        
+        # 排序后的命令名，用于前缀二分查找
+        self._sorted_commands = sorted(self.commands)
     
     def get_command_help(self, command_name: str) -> str:
         """
@@ -173,26 +219,28 @@ class CommandHelper(LoggerMixin):
         Returns:
             str: 帮助信息
         """
-        command = self.commands.get(command_name)
-        if not command:
+        help_text = self._help_texts.get(command_name)
+        if help_text is None:
             return f"❌ 未找到命令: {command_name}"
+        return help_text
+    
+    def _format_command_help(self, command_name: str) -> str:
+        """生成特定命令的帮助信息"""
+        command = self.commands[command_name]
         
-        help_text = f"""
-📖 **命令帮助**: /{command_name}
+        parts = [f"""
+📖 <b>命令帮助</b>: /{command_name}
 
-📝 **描述**: {command['description']}
+📝 <b>描述</b>: {command['description']}
 
-💡 **用法**: `{command['usage']}`
+💡 <b>用法</b>: <code>{command['usage'].translate(HTML_ESCAPE)}</code>
 
-📋 **示例**:
-"""
-        
-        for example in command['examples']:
-            help_text += f"• `{example}`\n"
+📋 <b>示例</b>:
+"""]
+        parts.extend(f"• <code>{example.translate(HTML_ESCAPE)}</code>\n" for example in command['examples'])
+        parts.append(f"\n🏷️ <b>分类</b>: {command['category']}")
         
-        help_text += f"\n🏷️ **分类**: {command['category']}"
-        
-        return help_text
+        return "".join(parts)
     
     def get_category_commands(self, category: str) -> List[str]:
         """
@@ -204,24 +252,15 @@ class CommandHelper(LoggerMixin):
         Returns:
             List[str]: 命令列表
         """
-        return [
-            cmd_name for cmd_name, cmd_info in self.commands.items()
-            if cmd_info['category'] == category
-        ]
+        return list(self._by_category.get(category, ()))
     
     def get_all_categories(self) -> List[str]:
         """获取所有命令分类"""
-        categories = set()
-        for cmd_info in self.commands.values():
-            categories.add(cmd_info['category'])
-        return sorted(list(categories))
+        return list(self._categories)
     
     def get_commands_by_category(self) -> Dict[str, List[str]]:
         """按分类获取所有命令"""
-        result = {}
-        for category in self.get_all_categories():
-            result[category] = self.get_category_commands(category)
-        return result
+        return {category: list(self._by_category[category]) for category in self._categories}
     
     def search_commands(self, keyword: str) -> List[str]:
         """
@@ -234,46 +273,33 @@ class CommandHelper(LoggerMixin):
             List[str]: 匹配的命令列表
         """
         keyword = keyword.lower()
-        matching_commands = []
-        
-        for cmd_name, cmd_info in self.commands.items():
-            # 搜索命令名、描述和分类
-            if (keyword in cmd_name.lower() or 
-                keyword in cmd_info['description'].lower() or
-                keyword in cmd_info['category'].lower()):
-                matching_commands.append(cmd_name)
         
-        return matching_commands
+        # 搜索命令名、描述和分类
+        return [cmd_name for cmd_name, haystack in self._search_index if keyword in haystack]
     
     def get_quick_help(self) -> str:
         """获取快速帮助信息"""
+        return self._quick_help_text
+    
+    def _format_quick_help(self) -> str:
+        """生成快速帮助信息"""
         categories = self.get_commands_by_category()
         
-        help_text = "📖 **快速命令参考**\n\n"
-        
-        category_emojis = {
-            "基本命令": "🤖",
-            "频道管理": "📺", 
-            "标签分类": "🏷️",
-            "去重检测": "🔄",
-            "存储管理": "💾",
-            "统计搜索": "📊",
-            "设置管理": "⚙️"
-        }
+        parts = ["📖 <b>快速命令参考</b>\n\n"]
         
         for category, commands in categories.items():
-            emoji = category_emojis.get(category, "📋")
-            help_text += f"{emoji} **{category}**:\n"
+            emoji = self.CATEGORY_EMOJIS.get(category, "📋")
+            parts.append(f"{emoji} <b>{category}</b>:\n")
             
             for cmd in commands:
                 cmd_info = self.commands[cmd]
-                help_text += f"• `/{cmd}` - {cmd_info['description']}\n"
+                parts.append(f"• <code>/{cmd}</code> - {cmd_info['description']}\n")
             
-            help_text += "\n"
+            parts.append("\n")
         
-        help_text += "💡 使用 `/help <命令名>` 获取详细帮助"
+        parts.append("💡 使用 <code>/help &lt;命令名&gt;</code> 获取详细帮助")
         
-        return help_text
+        return "".join(parts)
     
     def validate_command_args(self, command_name: str, args: List[str]) -> Dict[str, Any]:
         """
@@ -293,13 +319,7 @@ class CommandHelper(LoggerMixin):
         # 这里可以添加更复杂的参数验证逻辑
         # 目前只做基本检查
         
-        required_args = {
-            "add_channel": 1,
-            "remove_channel": 1,
-            "search": 1
-        }
-        
-        min_args = required_args.get(command_name, 0)
+        min_args = self.REQUIRED_ARGS.get(command_name, 0)
         
         if len(args) < min_args:
             return {
@@ -321,10 +341,8 @@ class CommandHelper(LoggerMixin):
             List[str]: 建议的命令列表
         """
         partial = partial_command.lower()
-        suggestions = []
-        
-        for cmd_name in self.commands.keys():
-            if cmd_name.startswith(partial):
-                suggestions.append(cmd_name)
         
-        return sorted(suggestions)
+        # 有序列表中以 partial 为前缀的命令是连续区间
+        lo = bisect.bisect_left(self._sorted_commands, partial)
+        hi = bisect.bisect_right(self._sorted_commands, partial + "\uffff")
+        return self._sorted_commands[lo:hi]
@@ -5,9 +5,19 @@ Telegram机器人主类
 """
 
 import asyncio
-from typing import Dict, List, Optional
-
+import heapq
+import platform
+import sys
+import time
+from collections import ChainMap
+from enum import IntEnum
+from itertools import islice
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, delete, func, lambda_stmt, or_, select, text
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.constants import ParseMode
 from telegram.ext import (
     Application, CommandHandler, MessageHandler, CallbackQueryHandler,
     ContextTypes, filters
@@ -15,22 +25,566 @@ from telegram.ext import (
 from telethon import TelegramClient
 from telethon.errors import SessionPasswordNeededError
 
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 from ..config.settings import Settings
 from ..database.database_manager import DatabaseManager
+from ..database.models import Channel, ChannelStatus, Message, MessageStatus, MediaType
 from ..classifier.auto_classifier import AutoClassifier
 from ..classifier.tag_manager import TagManager
 from ..deduplicator.dedup_manager import DeduplicationManager
 from ..storage.file_manager import FileManager
 from ..storage.download_manager import DownloadManager
 from ..storage.storage_monitor import StorageMonitor
+from ..statistics.stats_bundle import StatsBundle
 from ..statistics.tag_statistics import TagStatistics
+from ..utils.cache import TTLCache, invalidate_async_ttl_cache
 from ..utils.logger import LoggerMixin
-from .command_helper import CommandHelper
+from ..utils.rate_limiter import AsyncTokenBucket
+from .command_helper import HTML_ESCAPE, CommandHelper
+from .user_manager import UserManager
+
+
+# 全文搜索查询（messages_fts 为 trigram 分词，查询词至少需要3个字符）
+_SEARCH_FTS_SQL = text("""
+SELECT messages.* FROM messages_fts
+JOIN messages ON messages.id = messages_fts.rowid
+WHERE messages_fts MATCH :query
+ORDER BY messages_fts.rank
+LIMIT 20
+""")
+_FTS_MIN_TERM_LENGTH = 3
+
+# 移除频道时的查找语句（lambda_stmt 缓存编译结果，调用时只绑定参数）
+_CHANNEL_BY_USERNAME_STMT = lambda_stmt(
+    lambda: select(Channel).where(Channel.channel_username == bindparam("value"))
+)
+_CHANNEL_BY_ID_STMT = lambda_stmt(
+    lambda: select(Channel).where(Channel.channel_id == bindparam("value"))
+)
+_CHANNEL_BY_TITLE_STMT = lambda_stmt(
+    lambda: select(Channel).where(Channel.channel_title.like(bindparam("value")))
+)
+
+# 运行环境信息（进程运行期间不会变化，模块加载时读取一次）
+_SYSINFO = SimpleNamespace(
+    platform=platform.platform(),
+    python_version=sys.version.split()[0],
+    architecture=platform.architecture()[0],
+    processor=platform.processor() or "Unknown",
+    hostname=platform.node()
+)
+
+# 数据库健康检查结果的复用时间（秒）
+_HEALTH_CHECK_TTL = 2.0
+
+# 聊天发送队列空闲多久后结束其发送任务（秒）
+_SEND_WORKER_IDLE_TIMEOUT = 30.0
+
+class CallbackCode(IntEnum):
+    """按钮回调代码（callback_data 为 "代码" 或 "代码:参数"，Telegram 限制其最长64字节）"""
+    LIST_CHANNELS = 1
+    ADD_CHANNEL = 2
+    STATS = 3
+    SETTINGS = 4
+    ADD_CHANNEL_PROMPT = 5
+    REMOVE_CHANNEL_PROMPT = 6
+    REFRESH_CHANNELS = 7
+    DETAILED_STATS = 8
+    PERFORMANCE_STATS = 9
+    REFRESH_STATS = 10
+    SETTINGS_STORAGE = 11
+    SETTINGS_DOWNLOAD = 12
+    SETTINGS_COLLECTION = 13
+    SETTINGS_DEDUP = 14
+    LIST_ALL_TAGS = 15
+    CREATE_TAG = 16
+    SEARCH_TAGS = 17
+    MANUAL_CLASSIFY = 18
+    CLASSIFICATION_RULES = 19
+    CLASSIFICATION_DETAILS = 20
+    MANUAL_DEDUP = 21
+    DUPLICATE_REPORT = 22
+    DEDUP_DETAILS = 23
+    STORAGE_REPORT = 24
+    STORAGE_CLEANUP = 25
+    STORAGE_MONITOR = 26
+    PAUSE_DOWNLOADS = 27
+    RESUME_DOWNLOADS = 28
+    RETRY_DOWNLOADS = 29
+    SET_DOWNLOAD_MODE = 30
+    HELP_SEARCH = 31
+    HELP_CATEGORY = 32
+    BACK_TO_HELP = 33
+    CONFIRM_REMOVE_CHANNEL = 34
+    CANCEL_OPERATION = 35
+    TAG_TIMELINE = 36
+    TAG_CHANNELS = 37
+    TAG_FILES = 38
+
+
+def _callback_data(code: CallbackCode, arg=None) -> str:
+    """生成按钮的回调数据"""
+    return str(code.value) if arg is None else f"{code.value}:{arg}"
+
+
+# 旧版本按钮的回调数据（代码名的小写形式，带参数的为 "名称_参数"），兼容升级前发出的消息
+_LEGACY_CALLBACK_CODES = {code.name.lower(): code for code in CallbackCode}
+_LEGACY_CALLBACK_PREFIXES = tuple(
+    (f"{code.name.lower()}_", code)
+    for code in (
+        CallbackCode.SET_DOWNLOAD_MODE, CallbackCode.CONFIRM_REMOVE_CHANNEL,
+        CallbackCode.HELP_CATEGORY, CallbackCode.TAG_TIMELINE,
+        CallbackCode.TAG_CHANNELS, CallbackCode.TAG_FILES
+    )
+)
+
+
+def _parse_callback_data(data: str) -> Optional[Tuple[CallbackCode, str]]:
+    """
+    解析按钮的回调数据
+    
+    Args:
+        data: 回调数据（"代码"、"代码:参数" 或旧版本的字符串格式）
+    
+    Returns:
+        Optional[Tuple[CallbackCode, str]]: (回调代码, 参数)，无法识别时返回None
+    """
+    code_text, _, arg = data.partition(":")
+    try:
+        return CallbackCode(int(code_text)), arg
+    except ValueError:
+        pass
+    
+    code = _LEGACY_CALLBACK_CODES.get(data)
+    if code is not None:
+        return code, ""
+    
+    for prefix, code in _LEGACY_CALLBACK_PREFIXES:
+        if data.startswith(prefix):
+            return code, data[len(prefix):]
+    
+    return None
+
+
+# 需要合并连续点击的统计类回调，以及处理完成后继续合并的时间窗口（秒）
+_COALESCED_CALLBACKS = frozenset({
+    CallbackCode.CLASSIFICATION_DETAILS, CallbackCode.DEDUP_DETAILS,
+    CallbackCode.STORAGE_REPORT, CallbackCode.REFRESH_CHANNELS
+})
+_CALLBACK_COALESCE_WINDOW = 0.3
+
+_BYTES_PER_MB = 1024 * 1024
+_BYTES_PER_GB = 1024 * 1024 * 1024
+
+# 下载进度条，按进度的十分位（0-10）索引
+_PROGRESS_BARS = tuple("█" * filled + "░" * (10 - filled) for filled in range(11))
+
+
+# 开关类设置的显示文本
+_ENABLED_LABELS = {True: "✅ 启用", False: "❌ 禁用"}
+_ENABLED_TEXT = {True: "启用", False: "禁用"}
+
+# 后台服务运行状态的显示文本
+_RUN_EMOJI = {True: "🟢 运行中", False: "🔴 已停止"}
+
+# 频道状态对应的图标（数据库读出的状态是普通字符串，查表前先转换为 ChannelStatus）
+_CHANNEL_STATUS_EMOJI = {
+    ChannelStatus.ACTIVE: "🟢",
+    ChannelStatus.PAUSED: "🟡",
+    ChannelStatus.ERROR: "🔴"
+}
+
+# 刷新频道列表时显示的最大频道数
+_REFRESH_CHANNELS_LIMIT = 20
+
+# 静态按钮布局（InlineKeyboardMarkup 不可变，可在多次回复间共享）
+# /start 快捷操作按钮
+_START_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 查看频道列表", callback_data=_callback_data(CallbackCode.LIST_CHANNELS))],
+    [InlineKeyboardButton("➕ 添加频道", callback_data=_callback_data(CallbackCode.ADD_CHANNEL))],
+    [InlineKeyboardButton("📊 查看统计", callback_data=_callback_data(CallbackCode.STATS))],
+    [InlineKeyboardButton("⚙️ 设置", callback_data=_callback_data(CallbackCode.SETTINGS))]
+])
+
+# /list_channels 频道管理按钮
+_CHANNEL_LIST_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("➕ 添加频道", callback_data=_callback_data(CallbackCode.ADD_CHANNEL_PROMPT))],
+    [InlineKeyboardButton("🗑️ 移除频道", callback_data=_callback_data(CallbackCode.REMOVE_CHANNEL_PROMPT))],
+    [InlineKeyboardButton("🔄 刷新状态", callback_data=_callback_data(CallbackCode.REFRESH_CHANNELS))]
+])
+
+# /stats 详细统计按钮
+_STATS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 详细统计", callback_data=_callback_data(CallbackCode.DETAILED_STATS))],
+    [InlineKeyboardButton("📈 性能指标", callback_data=_callback_data(CallbackCode.PERFORMANCE_STATS))],
+    [InlineKeyboardButton("🔄 刷新数据", callback_data=_callback_data(CallbackCode.REFRESH_STATS))]
+])
+
+# /settings 设置管理按钮
+_SETTINGS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📁 存储设置", callback_data=_callback_data(CallbackCode.SETTINGS_STORAGE))],
+    [InlineKeyboardButton("⬇️ 下载设置", callback_data=_callback_data(CallbackCode.SETTINGS_DOWNLOAD))],
+    [InlineKeyboardButton("🎯 采集设置", callback_data=_callback_data(CallbackCode.SETTINGS_COLLECTION))],
+    [InlineKeyboardButton("🔄 去重设置", callback_data=_callback_data(CallbackCode.SETTINGS_DEDUP))]
+])
+
+# /tags 标签操作按钮
+_TAGS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📋 查看所有标签", callback_data=_callback_data(CallbackCode.LIST_ALL_TAGS))],
+    [InlineKeyboardButton("➕ 创建标签", callback_data=_callback_data(CallbackCode.CREATE_TAG))],
+    [InlineKeyboardButton("🔍 搜索标签", callback_data=_callback_data(CallbackCode.SEARCH_TAGS))]
+])
+
+# /classify 分类操作按钮
+_CLASSIFY_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 手动分类", callback_data=_callback_data(CallbackCode.MANUAL_CLASSIFY))],
+    [InlineKeyboardButton("⚙️ 分类规则", callback_data=_callback_data(CallbackCode.CLASSIFICATION_RULES))],
+    [InlineKeyboardButton("📈 详细统计", callback_data=_callback_data(CallbackCode.CLASSIFICATION_DETAILS))]
+])
+
+# /dedup 去重操作按钮
+_DEDUP_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 手动去重", callback_data=_callback_data(CallbackCode.MANUAL_DEDUP))],
+    [InlineKeyboardButton("📋 重复文件报告", callback_data=_callback_data(CallbackCode.DUPLICATE_REPORT))],
+    [InlineKeyboardButton("📈 详细统计", callback_data=_callback_data(CallbackCode.DEDUP_DETAILS))]
+])
+
+# /storage 存储管理按钮
+_STORAGE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 详细报告", callback_data=_callback_data(CallbackCode.STORAGE_REPORT))],
+    [InlineKeyboardButton("🧹 清理文件", callback_data=_callback_data(CallbackCode.STORAGE_CLEANUP))],
+    [InlineKeyboardButton("📈 监控状态", callback_data=_callback_data(CallbackCode.STORAGE_MONITOR))]
+])
+
+# /downloads 下载控制按钮
+_DOWNLOADS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("⏸️ 暂停下载", callback_data=_callback_data(CallbackCode.PAUSE_DOWNLOADS))],
+    [InlineKeyboardButton("▶️ 恢复下载", callback_data=_callback_data(CallbackCode.RESUME_DOWNLOADS))],
+    [InlineKeyboardButton("🔄 重试失败", callback_data=_callback_data(CallbackCode.RETRY_DOWNLOADS))]
+])
+
+# /download_mode 模式切换按钮
+_DOWNLOAD_MODE_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔄 自动模式", callback_data=_callback_data(CallbackCode.SET_DOWNLOAD_MODE, "auto"))],
+    [InlineKeyboardButton("👤 手动模式", callback_data=_callback_data(CallbackCode.SET_DOWNLOAD_MODE, "manual"))],
+    [InlineKeyboardButton("🎯 选择性模式", callback_data=_callback_data(CallbackCode.SET_DOWNLOAD_MODE, "selective"))]
+])
+
+# 帮助子页面的返回按钮
+_BACK_TO_HELP_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 返回帮助", callback_data=_callback_data(CallbackCode.BACK_TO_HELP))]
+])
+
+# 命令回复模板（模块加载时定义一次，调用时使用 format_map 填充）
+_STATUS_TEMPLATE = """
+🔍 <b>机器人状态</b>
+
+🤖 机器人: {bot_status}
+🗄️ 数据库: {db_status}
+📡 客户端: {client_status}
+
+⏰ 运行时间: {uptime}
+💾 内存使用: {memory_usage}
+"""
+
+_STATS_TEMPLATE = """
+📊 <b>系统统计信息</b>
+
+📺 <b>频道统计</b>:
+• 总频道数: {channel_count}
+
+📄 <b>消息统计</b>:
+• 总消息数: {total_messages}
+• 待处理: {pending}
+• 已完成: {completed}
+• 重复文件: {duplicate}
+• 失败: {failed}
+
+🎬 <b>媒体类型统计</b>:
+• 视频: {video}
+• 图片: {image}
+• 音频: {audio}
+• 文档: {document}
+
+💾 <b>存储统计</b>:
+• 总文件大小: {total_size_gb:.2f} GB
+• 平均文件大小: {avg_size_mb:.1f} MB
+"""
+
+_SETTINGS_TEMPLATE = """
+⚙️ <b>系统设置</b>
+
+📁 <b>存储设置</b>:
+• 存储路径: <code>{storage_path}</code>
+• 最大文件大小: {max_file_size_mb} MB
+• 最大存储空间: {max_storage_size_gb} GB
+
+⬇️ <b>下载设置</b>:
+• 下载模式: {auto_download_mode}
+• 最大并发下载: {max_concurrent_downloads}
+• 下载延迟: {auto_download_delay_seconds} 秒
+
+🎯 <b>采集设置</b>:
+• 视频采集: {video_collection}
+• 图片采集: {image_collection}
+• 采集间隔: {collection_interval_seconds} 秒
+
+🔄 <b>去重设置</b>:
+• 哈希去重: {hash_dedup}
+• 特征去重: {feature_dedup}
+• 相似度阈值: {duplicate_threshold:.0%}
+
+🤖 <b>分类设置</b>:
+• 自动分类: {auto_classification}
+• 默认标签: {default_tags}
+"""
+
+_CLASSIFY_TEMPLATE = """
+🤖 <b>自动分类统计</b>
+
+📊 <b>分类概况</b>:
+• 总消息数: {total_messages}
+• 已分类消息: {classified_messages}
+• 自动分类: {auto_classified}
+• 手动分类: {manual_classified}
+• 分类率: {classification_rate:.1%}
+
+🔄 <b>运行状态</b>:
+• 分类器状态: {run_status}
+• 已处理: {runtime_stats[processed]}
+• 已分类: {runtime_stats[classified]}
+• 错误数: {runtime_stats[errors]}
+"""
+
+_CLASSIFICATION_DETAILS_TEMPLATE = """
+📈 <b>详细分类统计</b>
+
+📊 <b>消息统计</b>:
+• 总消息数: {total_messages}
+• 已分类: {classified_messages}
+• 未分类: {unclassified_messages}
+
+🤖 <b>分类方式</b>:
+• 自动分类: {auto_classified}
+• 手动分类: {manual_classified}
+
+⚡ <b>运行时统计</b>:
+• 已处理: {runtime_stats[processed]}
+• 成功分类: {runtime_stats[classified]}
+• 处理错误: {runtime_stats[errors]}
+
+🔄 <b>分类器状态</b>: {run_status}
+"""
+
+_DEDUP_TEMPLATE = """
+🔍 <b>去重检测统计</b>
+
+📊 <b>总体统计</b>:
+• 总消息数: {total_messages}
+• 重复消息: {duplicate_messages}
+• 唯一消息: {unique_messages}
+• 去重记录: {duplicate_records}
+• 去重率: {deduplication_rate:.1%}
+
+🔧 <b>功能状态</b>:
+• 哈希去重: {hash_dedup}
+• 特征去重: {feature_dedup}
+• 相似度阈值: {settings[duplicate_threshold]:.2f}
+
+🔄 <b>运行状态</b>:
+• 去重器状态: {run_status}
+• 已处理: {runtime_stats[processed]}
+• 发现重复: {runtime_stats[duplicates_found]}
+• 错误数: {runtime_stats[errors]}
+"""
+
+_DEDUP_DETAILS_TEMPLATE = """
+📈 <b>详细去重统计</b>
+
+📊 <b>消息统计</b>:
+• 总消息数: {total_messages}
+• 重复消息: {duplicate_messages}
+• 唯一消息: {unique_messages}
+• 已计算哈希: {hashed_messages}
+
+🔍 <b>去重效果</b>:
+• 去重率: {deduplication_rate:.1%}
+• 去重记录: {duplicate_records}
+
+⚡ <b>运行时统计</b>:
+• 已处理: {runtime_stats[processed]}
+• 发现重复: {runtime_stats[duplicates_found]}
+• 处理错误: {runtime_stats[errors]}
+
+🔧 <b>配置信息</b>:
+• 哈希去重: {hash_dedup}
+• 特征去重: {feature_dedup}
+• 相似度阈值: {settings[duplicate_threshold]:.2f}
+
+🔄 <b>运行状态</b>: {run_status}
+"""
+
+_STORAGE_TEMPLATE = """
+💾 <b>存储使用情况</b>
+
+🖥️ <b>磁盘空间</b>:
+• 总容量: {disk_total_gb:.1f} GB
+• 已使用: {disk_used_gb:.1f} GB ({disk_usage_ratio:.1%})
+• 剩余空间: {disk_free_gb:.1f} GB
+
+📁 <b>项目存储</b>:
+• 文件总数: {total_files}
+• 占用空间: {total_size_gb:.2f} GB
+• 存储路径: <code>{storage_path}</code>
+
+📊 <b>按类型统计</b>:
+"""
+
+_DOWNLOADS_TEMPLATE = """
+⬇️ <b>下载管理状态</b>
+
+📊 <b>下载统计</b>:
+• 队列中: {queue_size} 个任务
+• 正在下载: {active_downloads} / {max_concurrent}
+• 已完成: {total_completed}
+• 失败: {total_failed}
+• 总下载量: {total_mb_downloaded:.1f} MB
+
+⚡ <b>性能指标</b>:
+"""
+
+_SYSTEM_INFO_TEMPLATE = """
+🖥️ <b>系统信息</b>
+
+💻 <b>运行环境</b>:
+• 操作系统: {platform}
+• Python版本: {python_version}
+• 架构: {architecture}
+• 主机名: {hostname}
+
+⏱️ <b>运行状态</b>:
+• 机器人状态: {bot_status}
+• 运行时间: {uptime}
+
+🔧 <b>服务状态</b>:
+• 数据库: {db_status}
+• 下载器: {downloader_status}
+• 存储监控: {monitor_status}
+• 自动分类: {classification_status}
+
+📊 <b>内存使用</b>: {memory_usage}
+"""
+
+_TAGS_TEMPLATE = """
+🏷️ <b>标签统计信息</b>
+
+📊 <b>总体统计</b>:
+• 总标签数: {total_tags}
+• 使用中标签: {used_tags}
+• 未使用标签: {unused_tags}
+
+🔥 <b>热门标签</b>:
+"""
+
+_TAG_SUMMARY_TEMPLATE = """
+🏷️ <b>标签媒体统计摘要</b>
+
+📊 <b>总体统计</b>:
+• 活跃标签数: {total_tags}
+• 总视频数: {total_videos}
+• 总图片数: {total_images}
+• 总音频数: {total_audio}
+• 总文档数: {total_documents}
+
+🔝 <b>热门标签</b> (前10个):
+"""
+
+# 行模板直接按 get_all_tags_media_summary / get_media_type_by_tags 返回的字典键取值
+_TAG_SUMMARY_ROW = (
+    "{index}. <b>{name}</b>\n"
+    "   🎬 {videos} 📸 {images} 🎵 {audio} 📄 {documents}\n"
+    "   💾 {total_size_mb:.1f} MB\n\n"
+).format_map
+
+_MEDIA_BY_TAG_TEMPLATE = """
+{emoji} <b>{title} 标签分布统计</b>
+
+📊 <b>总计</b>: {total_count} 个{media_type}
+
+🏷️ <b>标签分布</b> (前15个):
+"""
+
+_MEDIA_BY_TAG_ROW = "{index}. <b>{name}</b>: {count} 个 ({percentage:.1f}%)\n".format_map
+
+_TAG_STATS_HINT = "💡 使用 <code>/tag_stats &lt;标签名&gt;</code> 查看详细统计"
+_MEDIA_BY_TAG_HINT = "\n💡 使用 <code>/tag_stats &lt;标签名&gt;</code> 查看标签详细统计"
+
+# 渲染后的标签统计文本缓存时间（秒），同一时刻大量点击只渲染一次
+_TAG_TEXT_CACHE_TTL = 2.0
+
+# 开销较大的统计命令按聊天限流：每2秒补充1次，最多连续3次；超限时重发上次的回复
+_STATS_RATE = 0.5
+_STATS_BURST = 3
+_STATS_REPLY_TTL = 60.0
 
 
 class TelegramBot(LoggerMixin):
     """Telegram机器人主类"""
     
+    # 命令名 -> 处理方法名
+    COMMAND_HANDLERS = (
+        # 基本命令
+        ("start", "start_command"),
+        ("help", "help_command"),
+        ("status", "status_command"),
+        
+        # 频道管理命令
+        ("add_channel", "add_channel_command"),
+        ("remove_channel", "remove_channel_command"),
+        ("list_channels", "list_channels_command"),
+        
+        # 统计和搜索命令
+        ("stats", "stats_command"),
+        ("search", "search_command"),
+        
+        # 设置命令
+        ("settings", "settings_command"),
+        
+        # 标签和分类命令
+        ("tags", "tags_command"),
+        ("classify", "classify_command"),
+        
+        # 去重命令
+        ("dedup", "dedup_command"),
+        
+        # 存储管理命令
+        ("storage", "storage_command"),
+        ("downloads", "downloads_command"),
+        ("download_mode", "download_mode_command"),
+        
+        # 管理命令
+        ("queue_downloads", "queue_downloads_command"),
+        ("cleanup_temp", "cleanup_temp_command"),
+        ("system_info", "system_info_command"),
+        
+        # 标签统计命令
+        ("tag_stats", "tag_stats_command"),
+        ("media_by_tag", "media_by_tag_command")
+    )
+    
+    # 仅需回复提示文本的按钮回调
+    CALLBACK_REPLIES = {
+        CallbackCode.ADD_CHANNEL: "请使用命令: /add_channel <频道链接>",
+        CallbackCode.CREATE_TAG: "请使用格式: /create_tag <标签名> [描述]",
+        CallbackCode.SEARCH_TAGS: "请使用格式: /search_tags <关键词>",
+        CallbackCode.CANCEL_OPERATION: "❌ 操作已取消"
+    }
+    
     def __init__(self, settings: Settings, db_manager: DatabaseManager):
         """
         初始化Telegram机器人
@@ -71,14 +625,76 @@ class TelegramBot(LoggerMixin):
         # 标签统计管理器
         self.tag_statistics = TagStatistics(db_manager)
 
+        # 用户权限管理器（数据库中的权限记录在 initialize() 中加载）
+        self.user_manager = UserManager(db_manager, settings)
+
+        # 按钮回调分发表
+        self._command_callbacks = {
+            CallbackCode.LIST_CHANNELS: self.list_channels_command,
+            CallbackCode.STATS: self.stats_command,
+            CallbackCode.SETTINGS: self.settings_command
+        }
+        self._query_callbacks = {
+            CallbackCode.LIST_ALL_TAGS: self._handle_list_tags_callback,
+            CallbackCode.MANUAL_CLASSIFY: self._handle_manual_classify_callback,
+            CallbackCode.CLASSIFICATION_RULES: self._handle_classification_rules_callback,
+            CallbackCode.CLASSIFICATION_DETAILS: self._handle_classification_details_callback,
+            CallbackCode.MANUAL_DEDUP: self._handle_manual_dedup_callback,
+            CallbackCode.DUPLICATE_REPORT: self._handle_duplicate_report_callback,
+            CallbackCode.DEDUP_DETAILS: self._handle_dedup_details_callback,
+            CallbackCode.STORAGE_REPORT: self._handle_storage_report_callback,
+            CallbackCode.STORAGE_CLEANUP: self._handle_storage_cleanup_callback,
+            CallbackCode.STORAGE_MONITOR: self._handle_storage_monitor_callback,
+            CallbackCode.PAUSE_DOWNLOADS: self._handle_pause_downloads_callback,
+            CallbackCode.RESUME_DOWNLOADS: self._handle_resume_downloads_callback,
+            CallbackCode.RETRY_DOWNLOADS: self._handle_retry_downloads_callback,
+            CallbackCode.ADD_CHANNEL_PROMPT: self._handle_add_channel_prompt_callback,
+            CallbackCode.REMOVE_CHANNEL_PROMPT: self._handle_remove_channel_prompt_callback,
+            CallbackCode.REFRESH_CHANNELS: self._handle_refresh_channels_callback,
+            CallbackCode.HELP_SEARCH: self._handle_help_search_callback,
+            CallbackCode.BACK_TO_HELP: self._handle_back_to_help_callback
+        }
+        # 带参数的回调：代码 -> (处理方法, 参数转换函数)
+        self._param_callbacks = {
+            CallbackCode.SET_DOWNLOAD_MODE: (self._handle_set_download_mode_callback, str),
+            CallbackCode.CONFIRM_REMOVE_CHANNEL: (self._handle_confirm_remove_channel_callback, int),
+            CallbackCode.HELP_CATEGORY: (self._handle_help_category_callback, str)
+        }
+
+        # 当前进程句柄（用于查询内存使用，避免每次请求重新创建）
+        self._process = psutil.Process() if PSUTIL_AVAILABLE else None
+
+        # 数据库健康检查缓存：(检查时间, 结果)
+        self._health_cached = (float("-inf"), False)
+        self._health_lock = asyncio.Lock()
+
+        # 按聊天排队的消息编辑：同一聊天内按顺序发送，不同聊天互不阻塞
+        self._send_queues: Dict[int, asyncio.Queue] = {}
+        self._send_workers: Dict[int, asyncio.Task] = {}
+
+        # 正在执行或刚完成的统计类回调：(聊天ID, 消息ID, 回调数据) -> 任务
+        self._coalesced_callbacks: Dict[tuple, asyncio.Task] = {}
+
+        # 渲染后的标签统计文本：(命令, 参数, 总体统计) -> 文本
+        self._tag_text_cache = TTLCache(maxsize=32, ttl=_TAG_TEXT_CACHE_TTL)
+
+        # 统计命令限流：聊天ID -> 令牌桶；(聊天ID, 命令键) -> 上次回复的 (文本, 发送参数)
+        self._stats_buckets = TTLCache(maxsize=4096, ttl=600)
+        self._last_stats_replies = TTLCache(maxsize=1024, ttl=_STATS_REPLY_TTL)
+
         # 运行状态
         self.is_running = False
+        self._started_at: Optional[float] = None
+        self._stop_event = asyncio.Event()
         
         self.logger.info("Telegram机器人初始化完成")
     
     async def initialize(self):
         """初始化机器人和客户端"""
         try:
+            # 加载通过机器人修改过的管理员和禁用状态（数据库已在启动前初始化）
+            await self.user_manager.load_users()
+            
             # 初始化Bot应用程序
             self.application = Application.builder().token(self.settings.bot_token).build()
             
@@ -102,54 +718,21 @@ class TelegramBot(LoggerMixin):
             self.logger.info("Telegram机器人和客户端初始化完成")
             
         except Exception as e:
-            self.logger.error(f"初始化Telegram机器人失败: {e}")
+            self.logger.error("初始化Telegram机器人失败: {}", e)
             raise
     
     def _register_handlers(self):
         """注册命令处理器"""
-        # 基本命令
-        self.application.add_handler(CommandHandler("start", self.start_command))
-        self.application.add_handler(CommandHandler("help", self.help_command))
-        self.application.add_handler(CommandHandler("status", self.status_command))
+        add_handler = self.application.add_handler
         
-        # 频道管理命令
-        self.application.add_handler(CommandHandler("add_channel", self.add_channel_command))
-        self.application.add_handler(CommandHandler("remove_channel", self.remove_channel_command))
-        self.application.add_handler(CommandHandler("list_channels", self.list_channels_command))
-        
-        # 统计和搜索命令
-        self.application.add_handler(CommandHandler("stats", self.stats_command))
-        self.application.add_handler(CommandHandler("search", self.search_command))
-        
-        # 设置命令
-        self.application.add_handler(CommandHandler("settings", self.settings_command))
-
-        # 标签和分类命令
-        self.application.add_handler(CommandHandler("tags", self.tags_command))
-        self.application.add_handler(CommandHandler("classify", self.classify_command))
-
-        # 去重命令
-        self.application.add_handler(CommandHandler("dedup", self.dedup_command))
-
-        # 存储管理命令
-        self.application.add_handler(CommandHandler("storage", self.storage_command))
-        self.application.add_handler(CommandHandler("downloads", self.downloads_command))
-        self.application.add_handler(CommandHandler("download_mode", self.download_mode_command))
-
-        # 管理命令
-        self.application.add_handler(CommandHandler("queue_downloads", self.queue_downloads_command))
-        self.application.add_handler(CommandHandler("cleanup_temp", self.cleanup_temp_command))
-        self.application.add_handler(CommandHandler("system_info", self.system_info_command))
-
-        # 标签统计命令
-        self.application.add_handler(CommandHandler("tag_stats", self.tag_stats_command))
-        self.application.add_handler(CommandHandler("media_by_tag", self.media_by_tag_command))
+        for command, method_name in self.COMMAND_HANDLERS:
+            add_handler(CommandHandler(command, getattr(self, method_name)))
 
-        # 回调查询处理器
-        self.application.add_handler(CallbackQueryHandler(self.button_callback))
+        # 回调查询处理器：按回调代码查表分发
+        add_handler(CallbackQueryHandler(self.button_callback))
         
         # 消息处理器
-        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
+        add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
         
         self.logger.info("命令处理器注册完成")
     
@@ -164,6 +747,7 @@ class TelegramBot(LoggerMixin):
             await self.application.start()
             
             self.is_running = True
+            self._started_at = time.monotonic()
             self.logger.info("Telegram机器人启动成功")
             
             # 启动自动分类器
@@ -186,14 +770,13 @@ class TelegramBot(LoggerMixin):
             # 开始轮询
             await self.application.updater.start_polling()
 
-            # 保持运行
-            while self.is_running:
-                await asyncio.sleep(1)
+            # 保持运行，直到 stop() 发出停止信号
+            await self._stop_event.wait()
                 
         except KeyboardInterrupt:
             self.logger.info("收到停止信号")
         except Exception as e:
-            self.logger.error(f"机器人运行出错: {e}")
+            self.logger.error("机器人运行出错: {}", e)
             raise
         finally:
             await self.stop()
@@ -202,12 +785,23 @@ class TelegramBot(LoggerMixin):
         """停止机器人"""
         try:
             self.is_running = False
+            self._stop_event.set()
+
+            # 并发停止所有后台服务，单个服务出错不影响其他服务停止
+            results = await asyncio.gather(
+                self.auto_classifier.stop_auto_classification(),
+                self.dedup_manager.stop_auto_deduplication(),
+                self.download_manager.stop_download_worker(),
+                self.storage_monitor.stop_monitoring(),
+                self.user_manager.stop_action_logging(),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error("停止后台服务时出错: {}", result)
 
-            # 停止所有后台服务
-            await self.auto_classifier.stop_auto_classification()
-            await self.dedup_manager.stop_auto_deduplication()
-            await self.download_manager.stop_download_worker()
-            await self.storage_monitor.stop_monitoring()
+            # 等待已排队的消息编辑发送完毕
+            await self._drain_send_queues()
 
             if self.application:
                 await self.application.updater.stop()
@@ -220,7 +814,7 @@ class TelegramBot(LoggerMixin):
             self.logger.info("Telegram机器人已停止")
             
         except Exception as e:
-            self.logger.error(f"停止机器人时出错: {e}")
+            self.logger.error("停止机器人时出错: {}", e)
     
     # 命令处理方法
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -241,16 +835,10 @@ class TelegramBot(LoggerMixin):
         """
         
         # 创建快捷操作按钮
-        keyboard = [
-            [InlineKeyboardButton("📋 查看频道列表", callback_data="list_channels")],
-            [InlineKeyboardButton("➕ 添加频道", callback_data="add_channel")],
-            [InlineKeyboardButton("📊 查看统计", callback_data="stats")],
-            [InlineKeyboardButton("⚙️ 设置", callback_data="settings")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _START_KEYBOARD
         
         await update.message.reply_text(welcome_text, reply_markup=reply_markup)
-        self.logger.info(f"用户 {user.id} 启动了机器人")
+        self.logger.info("用户 {} 启动了机器人", user.id)
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/help命令"""
@@ -259,7 +847,7 @@ class TelegramBot(LoggerMixin):
             if context.args:
                 command_name = context.args[0].lstrip('/')
                 help_text = self.command_helper.get_command_help(command_name)
-                await update.message.reply_text(help_text, parse_mode='Markdown')
+                await update.message.reply_text(help_text, parse_mode=ParseMode.HTML)
                 return
 
             # 显示快速帮助
@@ -277,46 +865,45 @@ class TelegramBot(LoggerMixin):
                         category = categories[i + j]
                         row.append(InlineKeyboardButton(
                             category,
-                            callback_data=f"help_category_{category}"
+                            callback_data=_callback_data(CallbackCode.HELP_CATEGORY, category)
                         ))
                 keyboard.append(row)
 
             # 添加搜索按钮
-            keyboard.append([InlineKeyboardButton("🔍 搜索命令", callback_data="help_search")])
+            keyboard.append([InlineKeyboardButton("🔍 搜索命令", callback_data=_callback_data(CallbackCode.HELP_SEARCH))])
 
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await update.message.reply_text(help_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(help_text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取帮助信息失败: {e}")
-            self.logger.error(f"处理help命令失败: {e}")
+            self.logger.error("处理help命令失败: {}", e)
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/status命令"""
         try:
-            # 获取数据库状态
-            db_healthy = await self.db_manager.health_check()
+            # 获取数据库状态和内存使用（内存读取在线程中进行，与健康检查并行）
+            db_healthy, memory_usage = await asyncio.gather(
+                self._get_db_health(), asyncio.to_thread(self._get_memory_usage)
+            )
             
             # 获取客户端状态
             client_connected = self.client and self.client.is_connected()
             
-            status_text = f"""
-🔍 **机器人状态**
-
-🤖 机器人: {'✅ 运行中' if self.is_running else '❌ 已停止'}
-🗄️ 数据库: {'✅ 正常' if db_healthy else '❌ 异常'}
-📡 客户端: {'✅ 已连接' if client_connected else '❌ 未连接'}
-
-⏰ 运行时间: {self._get_uptime()}
-💾 内存使用: {self._get_memory_usage()}
-            """
+            status_text = _STATUS_TEMPLATE.format_map({
+                "bot_status": '✅ 运行中' if self.is_running else '❌ 已停止',
+                "db_status": '✅ 正常' if db_healthy else '❌ 异常',
+                "client_status": '✅ 已连接' if client_connected else '❌ 未连接',
+                "uptime": self._get_uptime(),
+                "memory_usage": memory_usage
+            })
             
-            await update.message.reply_text(status_text, parse_mode='Markdown')
+            await update.message.reply_text(status_text, parse_mode=ParseMode.HTML)
             
         except Exception as e:
             await update.message.reply_text(f"获取状态信息失败: {e}")
-            self.logger.error(f"获取状态失败: {e}")
+            self.logger.error("获取状态失败: {}", e)
     
     async def add_channel_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/add_channel命令"""
@@ -339,154 +926,211 @@ class TelegramBot(LoggerMixin):
                 "请稍等，正在验证频道信息..."
             )
             
-            self.logger.info(f"用户 {user_id} 请求添加频道: {channel_input}")
+            self.logger.info("用户 {} 请求添加频道: {}", user_id, channel_input)
             
         except Exception as e:
             await update.message.reply_text(f"添加频道失败: {e}")
-            self.logger.error(f"添加频道失败: {e}")
+            self.logger.error("添加频道失败: {}", e)
     
     async def button_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
-        """处理按钮回调"""
+        """按回调代码分发按钮回调（未知代码仅应答，避免客户端持续等待）"""
         query = update.callback_query
         await query.answer()
-
-        data = query.data
-
-        if data == "list_channels":
-            await self.list_channels_command(update, context)
-        elif data == "add_channel":
-            await query.edit_message_text("请使用命令: /add_channel <频道链接>")
-        elif data == "stats":
-            await self.stats_command(update, context)
-        elif data == "settings":
-            await self.settings_command(update, context)
-        elif data == "list_all_tags":
-            await self._handle_list_tags_callback(query)
-        elif data == "create_tag":
-            await query.edit_message_text("请使用格式: /create_tag <标签名> [描述]")
-        elif data == "search_tags":
-            await query.edit_message_text("请使用格式: /search_tags <关键词>")
-        elif data == "manual_classify":
-            await self._handle_manual_classify_callback(query)
-        elif data == "classification_rules":
-            await self._handle_classification_rules_callback(query)
-        elif data == "classification_details":
-            await self._handle_classification_details_callback(query)
-        elif data == "manual_dedup":
-            await self._handle_manual_dedup_callback(query)
-        elif data == "duplicate_report":
-            await self._handle_duplicate_report_callback(query)
-        elif data == "dedup_details":
-            await self._handle_dedup_details_callback(query)
-        elif data == "storage_report":
-            await self._handle_storage_report_callback(query)
-        elif data == "storage_cleanup":
-            await self._handle_storage_cleanup_callback(query)
-        elif data == "storage_monitor":
-            await self._handle_storage_monitor_callback(query)
-        elif data == "pause_downloads":
-            await self._handle_pause_downloads_callback(query)
-        elif data == "resume_downloads":
-            await self._handle_resume_downloads_callback(query)
-        elif data == "retry_downloads":
-            await self._handle_retry_downloads_callback(query)
-        elif data.startswith("set_download_mode_"):
-            mode = data.replace("set_download_mode_", "")
-            await self._handle_set_download_mode_callback(query, mode)
-        elif data.startswith("confirm_remove_channel_"):
-            channel_id = int(data.replace("confirm_remove_channel_", ""))
-            await self._handle_confirm_remove_channel_callback(query, channel_id)
-        elif data == "cancel_operation":
-            await query.edit_message_text("❌ 操作已取消")
-        elif data == "add_channel_prompt":
-            await self._handle_add_channel_prompt_callback(query)
-        elif data == "remove_channel_prompt":
-            await self._handle_remove_channel_prompt_callback(query)
-        elif data == "refresh_channels":
-            await self._handle_refresh_channels_callback(query)
-        elif data.startswith("help_category_"):
-            category = data.replace("help_category_", "")
-            await self._handle_help_category_callback(query, category)
-        elif data == "help_search":
-            await self._handle_help_search_callback(query)
-        elif data == "back_to_help":
-            await self._handle_back_to_help_callback(query)
+        
+        parsed = _parse_callback_data(query.data)
+        if parsed is None:
+            return
+        code, arg = parsed
+        
+        if code in self._query_callbacks:
+            handler = self._query_callbacks[code]
+            if code in _COALESCED_CALLBACKS and query.message:
+                await self._run_coalesced(query, handler)
+            else:
+                await handler(query)
+        elif code in self._command_callbacks:
+            await self._command_callbacks[code](update, context)
+        elif code in self.CALLBACK_REPLIES:
+            self._enqueue_edit(query, self.CALLBACK_REPLIES[code])
+        elif code in self._param_callbacks:
+            handler, convert = self._param_callbacks[code]
+            await handler(query, convert(arg))
+    
+    async def _run_coalesced(self, query, handler):
+        """
+        合并同一消息上同一按钮的连续点击
+        
+        处理进行中或刚完成（时间窗口内）时，后续点击等待同一次处理而不再重复查询。
+        
+        Args:
+            query: 回调查询
+            handler: 回调处理方法
+        """
+        key = (query.message.chat_id, query.message.message_id, query.data)
+        
+        task = self._coalesced_callbacks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(handler(query))
+            self._coalesced_callbacks[key] = task
+            task.add_done_callback(
+                lambda done: asyncio.get_running_loop().call_later(
+                    _CALLBACK_COALESCE_WINDOW, self._forget_coalesced, key, done
+                )
+            )
+        
+        await asyncio.shield(task)
+    
+    def _forget_coalesced(self, key: tuple, task: asyncio.Task):
+        """合并窗口结束后移除回调任务记录"""
+        if self._coalesced_callbacks.get(key) is task:
+            del self._coalesced_callbacks[key]
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理普通消息"""
         # 这里可以处理用户发送的普通消息
         pass
     
+    def _enqueue_edit(self, query, text: str, **kwargs):
+        """
+        将回调消息的编辑放入所属聊天的发送队列，立即返回
+        
+        Args:
+            query: 回调查询
+            text: 新的消息文本
+            **kwargs: 传给 edit_message_text 的其他参数
+        """
+        chat_id = query.message.chat_id if query.message else 0
+        
+        queue = self._send_queues.get(chat_id)
+        if queue is None:
+            queue = self._send_queues[chat_id] = asyncio.Queue()
+        queue.put_nowait((query, text, kwargs))
+        
+        worker = self._send_workers.get(chat_id)
+        if worker is None or worker.done():
+            self._send_workers[chat_id] = asyncio.create_task(self._send_worker(chat_id, queue))
+    
+    async def _send_worker(self, chat_id: int, queue: asyncio.Queue):
+        """依次发送单个聊天队列中的消息编辑，队列空闲后退出"""
+        while True:
+            try:
+                query, text, kwargs = await asyncio.wait_for(queue.get(), timeout=_SEND_WORKER_IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                # 空闲期间没有新编辑入队才退出，否则继续处理
+                if queue.empty():
+                    self._send_queues.pop(chat_id, None)
+                    self._send_workers.pop(chat_id, None)
+                    return
+                continue
+            
+            try:
+                await query.edit_message_text(text, **kwargs)
+            except Exception as e:
+                self.logger.error("编辑消息失败 (chat {}): {}", chat_id, e)
+            finally:
+                queue.task_done()
+    
+    async def _drain_send_queues(self):
+        """等待所有聊天队列发送完毕并结束发送任务"""
+        for queue in list(self._send_queues.values()):
+            await queue.join()
+        
+        workers = list(self._send_workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        
+        self._send_queues.clear()
+        self._send_workers.clear()
+    
+    async def _get_db_health(self) -> bool:
+        """
+        获取数据库健康状态（短时间内复用上次检查结果，并发请求只触发一次检查）
+        
+        Returns:
+            bool: 数据库是否正常
+        """
+        checked_at, healthy = self._health_cached
+        if time.monotonic() - checked_at <= _HEALTH_CHECK_TTL:
+            return healthy
+        
+        async with self._health_lock:
+            # 等待锁期间可能已有其他请求完成检查
+            checked_at, healthy = self._health_cached
+            if time.monotonic() - checked_at <= _HEALTH_CHECK_TTL:
+                return healthy
+            
+            healthy = await self.db_manager.health_check()
+            self._health_cached = (time.monotonic(), healthy)
+            return healthy
+    
     def _get_uptime(self) -> str:
         """获取运行时间"""
-        # 简单实现，实际应该记录启动时间
-        return "未知"
+        if self._started_at is None:
+            return "未知"
+        
+        minutes, seconds = divmod(int(time.monotonic() - self._started_at), 60)
+        hours, minutes = divmod(minutes, 60)
+        days, hours = divmod(hours, 24)
+        
+        if days:
+            return f"{days}天 {hours}小时 {minutes}分钟"
+        return f"{hours}小时 {minutes}分钟 {seconds}秒"
     
     def _get_memory_usage(self) -> str:
         """获取内存使用情况"""
-        try:
-            import psutil
-            process = psutil.Process()
-            memory_mb = process.memory_info().rss / 1024 / 1024
-            return f"{memory_mb:.1f} MB"
-        except ImportError:
+        if self._process is None:
             return "未知"
+        
+        memory_mb = self._process.memory_info().rss / _BYTES_PER_MB
+        return f"{memory_mb:.1f} MB"
     
     # 其他命令处理方法将在后续实现
     async def list_channels_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/list_channels命令"""
         try:
+            parts = ["📋 <b>已添加的频道列表</b>\n\n"]
+            channel_total = 0
+
             async with self.db_manager.get_async_session() as session:
-                from sqlalchemy import select
-                result = await session.execute(
-                    select(Channel).order_by(Channel.created_at.desc())
+                # 一次分组查询获取所有频道的消息数
+                count_result = await session.execute(
+                    select(Message.channel_id, func.count(Message.id)).group_by(Message.channel_id)
                 )
-                channels = result.scalars().all()
+                message_counts = dict(count_result.all())
 
-            if not channels:
-                await update.message.reply_text("📭 暂无已添加的频道")
-                return
+                # 流式读取频道，边读取边生成文本
+                channels = await session.stream_scalars(
+                    select(Channel).order_by(Channel.created_at.desc()).execution_options(yield_per=100)
+                )
 
-            text = "📋 **已添加的频道列表**\n\n"
+                async for channel in channels:
+                    channel_total += 1
+                    status = ChannelStatus(channel.status)
+                    status_emoji = _CHANNEL_STATUS_EMOJI.get(status, "⚪")
 
-            for i, channel in enumerate(channels, 1):
-                status_emoji = {
-                    ChannelStatus.ACTIVE: "🟢",
-                    ChannelStatus.INACTIVE: "🟡",
-                    ChannelStatus.ERROR: "🔴"
-                }.get(channel.status, "⚪")
-
-                # 获取消息统计
-                async with self.db_manager.get_async_session() as session:
-                    from sqlalchemy import func
-                    count_result = await session.execute(
-                        select(func.count(Message.id)).where(
-                            Message.channel_id == channel.id
-                        )
-                    )
-                    message_count = count_result.scalar()
+                    parts.append(f"{channel_total}. {status_emoji} <b>{channel.channel_title.translate(HTML_ESCAPE)}</b>\n")
+                    parts.append(f"   • ID: <code>{channel.channel_id}</code>\n")
+                    parts.append(f"   • 消息数: {message_counts.get(channel.id, 0)}\n")
+                    parts.append(f"   • 状态: {status.value}\n")
+                    if channel.last_check_time:
+                        parts.append(f"   • 最后检查: {channel.last_check_time.strftime('%Y-%m-%d %H:%M')}\n")
+                    parts.append("\n")
+
+            if not channel_total:
+                await update.message.reply_text("📭 暂无已添加的频道")
+                return
 
-                text += f"{i}. {status_emoji} **{channel.channel_title}**\n"
-                text += f"   • ID: `{channel.channel_id}`\n"
-                text += f"   • 消息数: {message_count}\n"
-                text += f"   • 状态: {channel.status.value}\n"
-                if channel.last_check_time:
-                    text += f"   • 最后检查: {channel.last_check_time.strftime('%Y-%m-%d %H:%M')}\n"
-                text += "\n"
+            text = "".join(parts)
 
             # 创建管理按钮
-            keyboard = [
-                [InlineKeyboardButton("➕ 添加频道", callback_data="add_channel_prompt")],
-                [InlineKeyboardButton("🗑️ 移除频道", callback_data="remove_channel_prompt")],
-                [InlineKeyboardButton("🔄 刷新状态", callback_data="refresh_channels")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _CHANNEL_LIST_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取频道列表失败: {e}")
-            self.logger.error(f"处理list_channels命令失败: {e}")
+            self.logger.error("处理list_channels命令失败: {}", e)
     
     async def remove_channel_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/remove_channel命令"""
@@ -503,24 +1147,18 @@ class TelegramBot(LoggerMixin):
 
             # 查找频道
             async with self.db_manager.get_async_session() as session:
-                from sqlalchemy import select, delete
-
                 # 尝试按不同方式查找频道
                 if channel_identifier.startswith('@'):
                     # 按用户名查找
-                    result = await session.execute(
-                        select(Channel).where(Channel.channel_username == channel_identifier[1:])
-                    )
+                    statement, value = _CHANNEL_BY_USERNAME_STMT, channel_identifier[1:]
                 elif channel_identifier.startswith('-'):
                     # 按ID查找
-                    result = await session.execute(
-                        select(Channel).where(Channel.channel_id == channel_identifier)
-                    )
+                    statement, value = _CHANNEL_BY_ID_STMT, channel_identifier
                 else:
                     # 按标题模糊查找
-                    result = await session.execute(
-                        select(Channel).where(Channel.channel_title.like(f"%{channel_identifier}%"))
-                    )
+                    statement, value = _CHANNEL_BY_TITLE_STMT, f"%{channel_identifier}%"
+
+                result = await session.execute(statement, {"value": value})
 
                 channel = result.scalar_one_or_none()
 
@@ -530,122 +1168,105 @@ class TelegramBot(LoggerMixin):
 
                 # 询问确认
                 text = f"""
-⚠️ **确认移除频道**
+⚠️ <b>确认移除频道</b>
 
-📺 **频道**: {channel.channel_title}
-🆔 **ID**: `{channel.channel_id}`
-📊 **状态**: {channel.status.value}
+📺 <b>频道</b>: {channel.channel_title.translate(HTML_ESCAPE)}
+🆔 <b>ID</b>: <code>{channel.channel_id}</code>
+📊 <b>状态</b>: {channel.status.value}
 
-❗ **注意**: 移除频道将删除所有相关的消息记录和文件！
+❗ <b>注意</b>: 移除频道将删除所有相关的消息记录和文件！
 
 确定要移除这个频道吗？
                 """
 
                 keyboard = [
-                    [InlineKeyboardButton("✅ 确认移除", callback_data=f"confirm_remove_channel_{channel.id}")],
-                    [InlineKeyboardButton("❌ 取消", callback_data="cancel_operation")]
+                    [InlineKeyboardButton("✅ 确认移除", callback_data=_callback_data(CallbackCode.CONFIRM_REMOVE_CHANNEL, channel.id))],
+                    [InlineKeyboardButton("❌ 取消", callback_data=_callback_data(CallbackCode.CANCEL_OPERATION))]
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+                await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"处理移除频道命令失败: {e}")
-            self.logger.error(f"处理remove_channel命令失败: {e}")
+            self.logger.error("处理remove_channel命令失败: {}", e)
     
     async def stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/stats命令"""
         try:
-            # 获取各种统计信息
-            async with self.db_manager.get_async_session() as session:
-                from sqlalchemy import func
-
+            # 各项统计在同一会话中依次查询（SQLite 使用单连接池，并发会话会争用同一连接）
+            channel_rows, message_rows, status_rows, type_rows = await self._fetch_rows(
                 # 频道统计
-                channel_count = await session.execute(select(func.count(Channel.id)))
-                channel_count = channel_count.scalar()
-
-                # 消息统计
-                total_messages = await session.execute(select(func.count(Message.id)))
-                total_messages = total_messages.scalar()
-
+                select(func.count(Channel.id)),
+                # 消息数量和文件大小统计（SUM 忽略空值）
+                select(func.count(Message.id), func.sum(Message.file_size)),
                 # 按状态统计消息
-                status_stats = {}
-                for status in MessageStatus:
-                    count = await session.execute(
-                        select(func.count(Message.id)).where(Message.status == status)
-                    )
-                    status_stats[status.value] = count.scalar()
-
+                select(Message.status, func.count(Message.id)).group_by(Message.status),
                 # 按媒体类型统计
-                type_stats = {}
-                for media_type in MediaType:
-                    count = await session.execute(
-                        select(func.count(Message.id)).where(Message.media_type == media_type)
-                    )
-                    type_stats[media_type.value] = count.scalar()
+                select(Message.media_type, func.count(Message.id)).group_by(Message.media_type)
+            )
 
-                # 文件大小统计
-                total_size = await session.execute(
-                    select(func.sum(Message.file_size)).where(Message.file_size.isnot(None))
-                )
-                total_size = total_size.scalar() or 0
+            channel_count = channel_rows[0][0]
+            total_messages, total_size = message_rows[0]
+            total_size = total_size or 0
+            status_stats = {getattr(status, "value", status): count for status, count in status_rows}
+            type_stats = {getattr(media_type, "value", media_type): count for media_type, count in type_rows}
 
             # 格式化统计信息
-            text = f"""
-📊 **系统统计信息**
-
-📺 **频道统计**:
-• 总频道数: {channel_count}
-
-📄 **消息统计**:
-• 总消息数: {total_messages}
-• 待处理: {status_stats.get('pending', 0)}
-• 已完成: {status_stats.get('completed', 0)}
-• 重复文件: {status_stats.get('duplicate', 0)}
-• 失败: {status_stats.get('failed', 0)}
-
-🎬 **媒体类型统计**:
-• 视频: {type_stats.get('video', 0)}
-• 图片: {type_stats.get('image', 0)}
-• 音频: {type_stats.get('audio', 0)}
-• 文档: {type_stats.get('document', 0)}
-
-💾 **存储统计**:
-• 总文件大小: {total_size / (1024*1024*1024):.2f} GB
-• 平均文件大小: {(total_size / total_messages / (1024*1024)) if total_messages > 0 else 0:.1f} MB
-            """
+            text = _STATS_TEMPLATE.format_map({
+                "channel_count": channel_count,
+                "total_messages": total_messages,
+                "pending": status_stats.get('pending', 0),
+                "completed": status_stats.get('completed', 0),
+                "duplicate": status_stats.get('duplicate', 0),
+                "failed": status_stats.get('failed', 0),
+                "video": type_stats.get('video', 0),
+                "image": type_stats.get('image', 0),
+                "audio": type_stats.get('audio', 0),
+                "document": type_stats.get('document', 0),
+                "total_size_gb": total_size / _BYTES_PER_GB,
+                "avg_size_mb": (total_size / total_messages / _BYTES_PER_MB) if total_messages > 0 else 0
+            })
 
             # 创建详细统计按钮
-            keyboard = [
-                [InlineKeyboardButton("📊 详细统计", callback_data="detailed_stats")],
-                [InlineKeyboardButton("📈 性能指标", callback_data="performance_stats")],
-                [InlineKeyboardButton("🔄 刷新数据", callback_data="refresh_stats")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _STATS_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取统计信息失败: {e}")
-            self.logger.error(f"处理stats命令失败: {e}")
+            self.logger.error("处理stats命令失败: {}", e)
+    
+    async def _fetch_rows(self, *statements) -> List[List]:
+        """
+        在同一会话中依次执行查询并返回各自的结果行
+        
+        Args:
+            statements: 查询语句
+        
+        Returns:
+            List[List]: 与查询语句一一对应的结果行列表
+        """
+        async with self.db_manager.get_async_session() as session:
+            return [(await session.execute(statement)).all() for statement in statements]
     
     async def search_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/search命令"""
         try:
             if not context.args:
                 await update.message.reply_text(
-                    "🔍 **搜索帮助**\n\n"
+                    "🔍 <b>搜索帮助</b>\n\n"
                     "请提供搜索关键词:\n"
-                    "`/search 关键词`\n\n"
-                    "**搜索范围**:\n"
+                    "<code>/search 关键词</code>\n\n"
+                    "<b>搜索范围</b>:\n"
                     "• 文件名\n"
                     "• 消息文本\n"
                     "• 标签\n\n"
-                    "**示例**:\n"
-                    "`/search 猫咪视频`\n"
-                    "`/search .mp4`\n"
-                    "`/search #搞笑`",
-                    parse_mode='Markdown'
+                    "<b>示例</b>:\n"
+                    "<code>/search 猫咪视频</code>\n"
+                    "<code>/search .mp4</code>\n"
+                    "<code>/search #搞笑</code>",
+                    parse_mode=ParseMode.HTML
                 )
                 return
 
@@ -653,34 +1274,46 @@ class TelegramBot(LoggerMixin):
 
             # 搜索消息
             async with self.db_manager.get_async_session() as session:
-                from sqlalchemy import or_
-
-                result = await session.execute(
-                    select(Message).where(
+                if self.db_manager.fts_enabled and len(search_term) >= _FTS_MIN_TERM_LENGTH:
+                    # 使用全文索引，查询词按短语匹配（双引号转义）
+                    phrase = '"' + search_term.replace('"', '""') + '"'
+                    statement = select(Message).from_statement(_SEARCH_FTS_SQL)
+                    params = {"query": phrase}
+                else:
+                    statement = select(Message).where(
                         or_(
                             Message.file_name.like(f"%{search_term}%"),
                             Message.message_text.like(f"%{search_term}%")
                         )
                     ).limit(20).order_by(Message.created_at.desc())
-                )
-
-                messages = result.scalars().all()
+                    params = None
+
+                # 流式读取结果，只保留前10条用于显示，其余仅计数
+                result = await session.stream_scalars(statement, params)
+                messages = []
+                total_found = 0
+                async for msg in result:
+                    total_found += 1
+                    if total_found <= 10:
+                        messages.append(msg)
+
+                # 一次查询获取结果中涉及的频道名称
+                channel_ids = {msg.channel_id for msg in messages}
+                channel_names = {}
+                if channel_ids:
+                    channel_result = await session.execute(
+                        select(Channel.id, Channel.channel_title).where(Channel.id.in_(channel_ids))
+                    )
+                    channel_names = dict(channel_result.all())
 
             if not messages:
                 await update.message.reply_text(f"🔍 未找到包含 '{search_term}' 的内容")
                 return
 
-            text = f"🔍 **搜索结果** (关键词: {search_term})\n\n"
-
-            for i, msg in enumerate(messages[:10], 1):  # 只显示前10个结果
-                # 获取频道信息
-                async with self.db_manager.get_async_session() as session:
-                    channel_result = await session.execute(
-                        select(Channel).where(Channel.id == msg.channel_id)
-                    )
-                    channel = channel_result.scalar_one_or_none()
+            parts = [f"🔍 <b>搜索结果</b> (关键词: {search_term.translate(HTML_ESCAPE)})\n\n"]
 
-                channel_name = channel.channel_title if channel else "未知频道"
+            for i, msg in enumerate(messages, 1):  # 只显示前10个结果
+                channel_name = channel_names.get(msg.channel_id, "未知频道")
 
                 status_emoji = {
                     MessageStatus.PENDING: "⏳",
@@ -689,70 +1322,56 @@ class TelegramBot(LoggerMixin):
                     MessageStatus.FAILED: "❌"
                 }.get(msg.status, "❓")
 
-                text += f"{i}. {status_emoji} **{msg.file_name}**\n"
-                text += f"   📺 {channel_name}\n"
-                text += f"   📅 {msg.message_date.strftime('%Y-%m-%d %H:%M')}\n"
-                text += f"   📊 {msg.media_type.value} • {(msg.file_size or 0) / (1024*1024):.1f} MB\n"
+                parts.append(f"{i}. {status_emoji} <b>{(msg.file_name or '').translate(HTML_ESCAPE)}</b>\n")
+                parts.append(f"   📺 {channel_name.translate(HTML_ESCAPE)}\n")
+                parts.append(f"   📅 {msg.message_date.strftime('%Y-%m-%d %H:%M')}\n")
+                parts.append(f"   📊 {msg.media_type.value} • {(msg.file_size or 0) / _BYTES_PER_MB:.1f} MB\n")
                 if msg.message_text and len(msg.message_text) > 0:
                     preview = msg.message_text[:50] + "..." if len(msg.message_text) > 50 else msg.message_text
-                    text += f"   💬 {preview}\n"
-                text += "\n"
+                    parts.append(f"   💬 {preview.translate(HTML_ESCAPE)}\n")
+                parts.append("\n")
+
+            if total_found > 10:
+                parts.append(f"... 还有 {total_found - 10} 个结果未显示")
 
-            if len(messages) > 10:
-                text += f"... 还有 {len(messages) - 10} 个结果未显示"
+            text = "".join(parts)
 
-            await update.message.reply_text(text, parse_mode='Markdown')
+            await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"搜索失败: {e}")
-            self.logger.error(f"处理search命令失败: {e}")
+            self.logger.error("处理search命令失败: {}", e)
     
     async def settings_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/settings命令"""
         try:
             # 显示当前设置
-            text = f"""
-⚙️ **系统设置**
-
-📁 **存储设置**:
-• 存储路径: `{self.settings.storage_path}`
-• 最大文件大小: {self.settings.max_file_size_mb} MB
-• 最大存储空间: {self.settings.max_storage_size_gb} GB
-
-⬇️ **下载设置**:
-• 下载模式: {self.settings.auto_download_mode}
-• 最大并发下载: {self.settings.max_concurrent_downloads}
-• 下载延迟: {self.settings.auto_download_delay_seconds} 秒
-
-🎯 **采集设置**:
-• 视频采集: {'✅ 启用' if self.settings.enable_video_collection else '❌ 禁用'}
-• 图片采集: {'✅ 启用' if self.settings.enable_image_collection else '❌ 禁用'}
-• 采集间隔: {self.settings.collection_interval_seconds} 秒
-
-🔄 **去重设置**:
-• 哈希去重: {'✅ 启用' if self.settings.enable_hash_dedup else '❌ 禁用'}
-• 特征去重: {'✅ 启用' if self.settings.enable_feature_dedup else '❌ 禁用'}
-• 相似度阈值: {self.settings.duplicate_threshold:.0%}
-
-🤖 **分类设置**:
-• 自动分类: {'✅ 启用' if self.settings.auto_classification else '❌ 禁用'}
-• 默认标签: {', '.join(self.settings.default_tags)}
-            """
+            settings = self.settings
+            text = _SETTINGS_TEMPLATE.format_map({
+                "storage_path": str(settings.storage_path).translate(HTML_ESCAPE),
+                "max_file_size_mb": settings.max_file_size_mb,
+                "max_storage_size_gb": settings.max_storage_size_gb,
+                "auto_download_mode": settings.auto_download_mode,
+                "max_concurrent_downloads": settings.max_concurrent_downloads,
+                "auto_download_delay_seconds": settings.auto_download_delay_seconds,
+                "video_collection": _ENABLED_LABELS[bool(settings.enable_video_collection)],
+                "image_collection": _ENABLED_LABELS[bool(settings.enable_image_collection)],
+                "collection_interval_seconds": settings.collection_interval_seconds,
+                "hash_dedup": _ENABLED_LABELS[bool(settings.enable_hash_dedup)],
+                "feature_dedup": _ENABLED_LABELS[bool(settings.enable_feature_dedup)],
+                "duplicate_threshold": settings.duplicate_threshold,
+                "auto_classification": _ENABLED_LABELS[bool(settings.auto_classification)],
+                "default_tags": ', '.join(settings.default_tags).translate(HTML_ESCAPE)
+            })
 
             # 创建设置管理按钮
-            keyboard = [
-                [InlineKeyboardButton("📁 存储设置", callback_data="settings_storage")],
-                [InlineKeyboardButton("⬇️ 下载设置", callback_data="settings_download")],
-                [InlineKeyboardButton("🎯 采集设置", callback_data="settings_collection")],
-                [InlineKeyboardButton("🔄 去重设置", callback_data="settings_dedup")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _SETTINGS_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取设置信息失败: {e}")
-            self.logger.error(f"处理settings命令失败: {e}")
+            self.logger.error("处理settings命令失败: {}", e)
 
     async def tags_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/tags命令"""
@@ -765,38 +1384,26 @@ class TelegramBot(LoggerMixin):
                 return
 
             # 格式化标签信息
-            text = f"""
-🏷️ **标签统计信息**
-
-📊 **总体统计**:
-• 总标签数: {stats['total_tags']}
-• 使用中标签: {stats['used_tags']}
-• 未使用标签: {stats['unused_tags']}
-
-🔥 **热门标签**:
-"""
-
-            for tag in stats['popular_tags'][:5]:
-                text += f"• {tag['name']} ({tag['usage_count']} 次使用)\n"
+            parts = [_TAGS_TEMPLATE.format_map(stats)]
+            parts.extend(
+                f"• {tag['name'].translate(HTML_ESCAPE)} ({tag['usage_count']} 次使用)\n"
+                for tag in stats['popular_tags'][:5]
+            )
 
             if stats['recent_tags']:
-                text += "\n🆕 **最近创建**:\n"
-                for tag in stats['recent_tags'][:3]:
-                    text += f"• {tag['name']}\n"
+                parts.append("\n🆕 <b>最近创建</b>:\n")
+                parts.extend(f"• {tag['name'].translate(HTML_ESCAPE)}\n" for tag in stats['recent_tags'][:3])
+
+            text = "".join(parts)
 
             # 创建操作按钮
-            keyboard = [
-                [InlineKeyboardButton("📋 查看所有标签", callback_data="list_all_tags")],
-                [InlineKeyboardButton("➕ 创建标签", callback_data="create_tag")],
-                [InlineKeyboardButton("🔍 搜索标签", callback_data="search_tags")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _TAGS_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取标签信息失败: {e}")
-            self.logger.error(f"处理tags命令失败: {e}")
+            self.logger.error("处理tags命令失败: {}", e)
 
     async def classify_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/classify命令"""
@@ -809,36 +1416,18 @@ class TelegramBot(LoggerMixin):
                 return
 
             # 格式化分类信息
-            text = f"""
-🤖 **自动分类统计**
-
-📊 **分类概况**:
-• 总消息数: {stats['total_messages']}
-• 已分类消息: {stats['classified_messages']}
-• 自动分类: {stats['auto_classified']}
-• 手动分类: {stats['manual_classified']}
-• 分类率: {stats['classification_rate']:.1%}
-
-🔄 **运行状态**:
-• 分类器状态: {'🟢 运行中' if stats['is_running'] else '🔴 已停止'}
-• 已处理: {stats['runtime_stats']['processed']}
-• 已分类: {stats['runtime_stats']['classified']}
-• 错误数: {stats['runtime_stats']['errors']}
-            """
+            text = _CLASSIFY_TEMPLATE.format_map(
+                ChainMap({"run_status": _RUN_EMOJI[bool(stats['is_running'])]}, stats)
+            )
 
             # 创建操作按钮
-            keyboard = [
-                [InlineKeyboardButton("🔄 手动分类", callback_data="manual_classify")],
-                [InlineKeyboardButton("⚙️ 分类规则", callback_data="classification_rules")],
-                [InlineKeyboardButton("📈 详细统计", callback_data="classification_details")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _CLASSIFY_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取分类信息失败: {e}")
-            self.logger.error(f"处理classify命令失败: {e}")
+            self.logger.error("处理classify命令失败: {}", e)
 
     async def dedup_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/dedup命令"""
@@ -851,41 +1440,21 @@ class TelegramBot(LoggerMixin):
                 return
 
             # 格式化去重信息
-            text = f"""
-🔍 **去重检测统计**
-
-📊 **总体统计**:
-• 总消息数: {stats['total_messages']}
-• 重复消息: {stats['duplicate_messages']}
-• 唯一消息: {stats['unique_messages']}
-• 去重记录: {stats['duplicate_records']}
-• 去重率: {stats['deduplication_rate']:.1%}
-
-🔧 **功能状态**:
-• 哈希去重: {'✅ 启用' if stats['settings']['hash_dedup_enabled'] else '❌ 禁用'}
-• 特征去重: {'✅ 启用' if stats['settings']['feature_dedup_enabled'] else '❌ 禁用'}
-• 相似度阈值: {stats['settings']['duplicate_threshold']:.2f}
-
-🔄 **运行状态**:
-• 去重器状态: {'🟢 运行中' if stats['is_running'] else '🔴 已停止'}
-• 已处理: {stats['runtime_stats']['processed']}
-• 发现重复: {stats['runtime_stats']['duplicates_found']}
-• 错误数: {stats['runtime_stats']['errors']}
-            """
+            dedup_settings = stats['settings']
+            text = _DEDUP_TEMPLATE.format_map(ChainMap({
+                "hash_dedup": _ENABLED_LABELS[bool(dedup_settings['hash_dedup_enabled'])],
+                "feature_dedup": _ENABLED_LABELS[bool(dedup_settings['feature_dedup_enabled'])],
+                "run_status": _RUN_EMOJI[bool(stats['is_running'])]
+            }, stats))
 
             # 创建操作按钮
-            keyboard = [
-                [InlineKeyboardButton("🔄 手动去重", callback_data="manual_dedup")],
-                [InlineKeyboardButton("📋 重复文件报告", callback_data="duplicate_report")],
-                [InlineKeyboardButton("📈 详细统计", callback_data="dedup_details")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _DEDUP_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取去重信息失败: {e}")
-            self.logger.error(f"处理dedup命令失败: {e}")
+            self.logger.error("处理dedup命令失败: {}", e)
 
     async def storage_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/storage命令"""
@@ -902,100 +1471,75 @@ class TelegramBot(LoggerMixin):
             db_stats = report["database_stats"]
 
             # 格式化存储信息
-            text = f"""
-💾 **存储使用情况**
-
-🖥️ **磁盘空间**:
-• 总容量: {disk_usage['total'] / (1024**3):.1f} GB
-• 已使用: {disk_usage['used'] / (1024**3):.1f} GB ({disk_usage['usage_ratio']:.1%})
-• 剩余空间: {disk_usage['free'] / (1024**3):.1f} GB
-
-📁 **项目存储**:
-• 文件总数: {storage_usage['total_files']}
-• 占用空间: {storage_usage['total_size_gb']:.2f} GB
-• 存储路径: `{storage_usage['storage_path']}`
-
-📊 **按类型统计**:
-"""
-
-            for media_type, stats in db_stats["by_media_type"].items():
-                if stats["file_count"] > 0:
-                    text += f"• {media_type}: {stats['file_count']} 个文件 ({stats['total_size_mb']:.1f} MB)\n"
+            parts = [_STORAGE_TEMPLATE.format_map(ChainMap({
+                "disk_total_gb": disk_usage['total'] / _BYTES_PER_GB,
+                "disk_used_gb": disk_usage['used'] / _BYTES_PER_GB,
+                "disk_usage_ratio": disk_usage['usage_ratio'],
+                "disk_free_gb": disk_usage['free'] / _BYTES_PER_GB,
+                "storage_path": storage_usage['storage_path'].translate(HTML_ESCAPE)
+            }, storage_usage))]
+            parts.extend(
+                f"• {media_type}: {stats['file_count']} 个文件 ({stats['total_size_mb']:.1f} MB)\n"
+                for media_type, stats in db_stats["by_media_type"].items()
+                if stats["file_count"] > 0
+            )
 
             # 一致性检查
             consistency = report["consistency_check"]
             if not consistency["is_consistent"]:
-                text += f"\n⚠️ **数据一致性警告**: 数据库与实际文件大小差异 {consistency['size_difference_mb']:.1f} MB"
+                parts.append(f"\n⚠️ <b>数据一致性警告</b>: 数据库与实际文件大小差异 {consistency['size_difference_mb']:.1f} MB")
+
+            text = "".join(parts)
 
             # 创建操作按钮
-            keyboard = [
-                [InlineKeyboardButton("📊 详细报告", callback_data="storage_report")],
-                [InlineKeyboardButton("🧹 清理文件", callback_data="storage_cleanup")],
-                [InlineKeyboardButton("📈 监控状态", callback_data="storage_monitor")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _STORAGE_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取存储信息失败: {e}")
-            self.logger.error(f"处理storage命令失败: {e}")
+            self.logger.error("处理storage命令失败: {}", e)
 
     async def downloads_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/downloads命令"""
         try:
-            # 获取下载统计
-            stats = await self.download_manager.get_download_stats()
+            # 并发获取下载统计和活跃下载信息
+            stats, active_downloads = await asyncio.gather(
+                self.download_manager.get_download_stats(),
+                self.download_manager.get_active_downloads_info()
+            )
 
             if "error" in stats:
                 await update.message.reply_text(f"获取下载信息失败: {stats['error']}")
                 return
 
-            # 获取活跃下载信息
-            active_downloads = await self.download_manager.get_active_downloads_info()
-
             # 格式化下载信息
-            text = f"""
-⬇️ **下载管理状态**
-
-📊 **下载统计**:
-• 队列中: {stats['queue_size']} 个任务
-• 正在下载: {stats['active_downloads']} / {stats['max_concurrent']}
-• 已完成: {stats['total_completed']}
-• 失败: {stats['total_failed']}
-• 总下载量: {stats['total_mb_downloaded']:.1f} MB
-
-⚡ **性能指标**:
-"""
+            text = _DOWNLOADS_TEMPLATE.format_map(stats)
 
             if stats.get("download_rate_mbps"):
                 text += f"• 下载速度: {stats['download_rate_mbps']:.2f} MB/s\n"
             if stats.get("files_per_minute"):
                 text += f"• 处理速度: {stats['files_per_minute']:.1f} 文件/分钟\n"
 
-            text += f"\n🔄 **下载器状态**: {'🟢 运行中' if stats['is_downloading'] else '🔴 已停止'}"
+            text += f"\n🔄 <b>下载器状态</b>: {_RUN_EMOJI[bool(stats['is_downloading'])]}"
 
             # 显示活跃下载
             if active_downloads:
-                text += f"\n\n📥 **当前下载** (前5个):\n"
+                parts = ["\n\n📥 <b>当前下载</b> (前5个):\n"]
                 for download in active_downloads[:5]:
-                    progress_bar = "█" * int(download["progress"] * 10) + "░" * (10 - int(download["progress"] * 10))
-                    text += f"• {download['file_name'][:30]}...\n"
-                    text += f"  [{progress_bar}] {download['progress']:.1%}\n"
+                    progress = download["progress"]
+                    progress_bar = _PROGRESS_BARS[min(max(int(progress * 10), 0), 10)]
+                    parts.append(f"• {download['file_name'][:30].translate(HTML_ESCAPE)}...\n  [{progress_bar}] {progress:.1%}\n")
+                text += "".join(parts)
 
             # 创建操作按钮
-            keyboard = [
-                [InlineKeyboardButton("⏸️ 暂停下载", callback_data="pause_downloads")],
-                [InlineKeyboardButton("▶️ 恢复下载", callback_data="resume_downloads")],
-                [InlineKeyboardButton("🔄 重试失败", callback_data="retry_downloads")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _DOWNLOADS_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取下载信息失败: {e}")
-            self.logger.error(f"处理downloads命令失败: {e}")
+            self.logger.error("处理downloads命令失败: {}", e)
 
     async def download_mode_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/download_mode命令"""
@@ -1003,38 +1547,33 @@ class TelegramBot(LoggerMixin):
             current_mode = self.settings.auto_download_mode
 
             text = f"""
-⚙️ **下载模式设置**
+⚙️ <b>下载模式设置</b>
 
-🔄 **当前模式**: {current_mode}
+🔄 <b>当前模式</b>: {current_mode}
 
-📋 **可用模式**:
-• **auto** - 自动下载所有文件（在大小限制内）
-• **manual** - 手动下载，需要用户主动触发
-• **selective** - 选择性自动下载，根据文件类型智能决策
+📋 <b>可用模式</b>:
+• <b>auto</b> - 自动下载所有文件（在大小限制内）
+• <b>manual</b> - 手动下载，需要用户主动触发
+• <b>selective</b> - 选择性自动下载，根据文件类型智能决策
 
-🎯 **选择性下载规则**:
+🎯 <b>选择性下载规则</b>:
 • 图片: 自动下载 ≤ 10MB
 • 视频: 自动下载 ≤ 50MB
 • 音频: 自动下载 ≤ 20MB
 • 文档: 手动下载
 
-💡 使用 `/download_mode <模式>` 切换模式
-例如: `/download_mode auto`
+💡 使用 <code>/download_mode &lt;模式&gt;</code> 切换模式
+例如: <code>/download_mode auto</code>
             """
 
             # 创建模式切换按钮
-            keyboard = [
-                [InlineKeyboardButton("🔄 自动模式", callback_data="set_download_mode_auto")],
-                [InlineKeyboardButton("👤 手动模式", callback_data="set_download_mode_manual")],
-                [InlineKeyboardButton("🎯 选择性模式", callback_data="set_download_mode_selective")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _DOWNLOAD_MODE_KEYBOARD
 
-            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            await update.message.reply_text(text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取下载模式信息失败: {e}")
-            self.logger.error(f"处理download_mode命令失败: {e}")
+            self.logger.error("处理download_mode命令失败: {}", e)
 
     async def _handle_list_tags_callback(self, query):
         """处理查看所有标签回调"""
@@ -1042,39 +1581,39 @@ class TelegramBot(LoggerMixin):
             tags = await self.tag_manager.list_tags(limit=20)
 
             if not tags:
-                await query.edit_message_text("暂无标签")
+                self._enqueue_edit(query, "暂无标签")
                 return
 
-            text = "🏷️ **所有标签** (前20个):\n\n"
+            parts = ["🏷️ <b>所有标签</b> (前20个):\n\n"]
             for tag in tags:
-                text += f"• **{tag['name']}** ({tag['usage_count']} 次使用)\n"
+                parts.append(f"• <b>{tag['name'].translate(HTML_ESCAPE)}</b> ({tag['usage_count']} 次使用)\n")
                 if tag['description']:
-                    text += f"  _{tag['description']}_\n"
-                text += "\n"
+                    parts.append(f"  <i>{tag['description'].translate(HTML_ESCAPE)}</i>\n")
+                parts.append("\n")
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, "".join(parts), parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取标签列表失败: {e}")
+            self._enqueue_edit(query, f"获取标签列表失败: {e}")
 
     async def _handle_manual_classify_callback(self, query):
         """处理手动分类回调"""
         try:
             text = """
-🤖 **手动分类功能**
+🤖 <b>手动分类功能</b>
 
 可用命令:
-• `/classify_message <消息ID>` - 分类单条消息
-• `/classify_batch <消息ID1> <消息ID2> ...` - 批量分类
-• `/reclassify_all` - 重新分类所有消息
+• <code>/classify_message &lt;消息ID&gt;</code> - 分类单条消息
+• <code>/classify_batch &lt;消息ID1&gt; &lt;消息ID2&gt; ...</code> - 批量分类
+• <code>/reclassify_all</code> - 重新分类所有消息
 
-💡 提示: 消息ID可以通过 `/search` 命令获取
+💡 提示: 消息ID可以通过 <code>/search</code> 命令获取
             """
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"处理手动分类失败: {e}")
+            self._enqueue_edit(query, f"处理手动分类失败: {e}")
 
     async def _handle_classification_rules_callback(self, query):
         """处理分类规则回调"""
@@ -1082,76 +1621,63 @@ class TelegramBot(LoggerMixin):
             rules = await self.auto_classifier.rule_engine.get_rules(active_only=True)
 
             if not rules:
-                text = "📋 **分类规则**\n\n暂无活跃的分类规则"
+                parts = ["📋 <b>分类规则</b>\n\n暂无活跃的分类规则"]
             else:
-                text = f"📋 **分类规则** ({len(rules)} 条):\n\n"
-                for rule in rules[:10]:  # 只显示前10条
-                    text += f"• **{rule.name}**\n"
-                    text += f"  类型: {rule.rule_type}\n"
-                    text += f"  目标: {rule.target_field}\n"
-                    text += f"  标签: {rule.tag.name}\n"
-                    text += f"  匹配: {rule.match_count} 次\n\n"
+                parts = [f"📋 <b>分类规则</b> ({len(rules)} 条):\n\n"]
+                parts.extend(
+                    f"• <b>{rule.name.translate(HTML_ESCAPE)}</b>\n"
+                    f"  类型: {rule.rule_type}\n"
+                    f"  目标: {rule.target_field}\n"
+                    f"  标签: {rule.tag.name.translate(HTML_ESCAPE)}\n"
+                    f"  匹配: {rule.match_count} 次\n\n"
+                    for rule in rules[:10]  # 只显示前10条
+                )
 
-            text += "\n💡 使用 `/add_rule` 命令添加新规则"
+            parts.append("\n💡 使用 <code>/add_rule</code> 命令添加新规则")
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, "".join(parts), parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取分类规则失败: {e}")
+            self._enqueue_edit(query, f"获取分类规则失败: {e}")
 
     async def _handle_classification_details_callback(self, query):
         """处理分类详情回调"""
         try:
             stats = await self.auto_classifier.get_classification_stats()
 
-            text = f"""
-📈 **详细分类统计**
-
-📊 **消息统计**:
-• 总消息数: {stats['total_messages']}
-• 已分类: {stats['classified_messages']}
-• 未分类: {stats['total_messages'] - stats['classified_messages']}
-
-🤖 **分类方式**:
-• 自动分类: {stats['auto_classified']}
-• 手动分类: {stats['manual_classified']}
+            text = _CLASSIFICATION_DETAILS_TEMPLATE.format_map(ChainMap({
+                "unclassified_messages": stats['total_messages'] - stats['classified_messages'],
+                "run_status": _RUN_EMOJI[bool(stats['is_running'])]
+            }, stats))
 
-⚡ **运行时统计**:
-• 已处理: {stats['runtime_stats']['processed']}
-• 成功分类: {stats['runtime_stats']['classified']}
-• 处理错误: {stats['runtime_stats']['errors']}
-
-🔄 **分类器状态**: {'🟢 运行中' if stats['is_running'] else '🔴 已停止'}
-            """
-
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取详细统计失败: {e}")
+            self._enqueue_edit(query, f"获取详细统计失败: {e}")
 
     async def _handle_manual_dedup_callback(self, query):
         """处理手动去重回调"""
         try:
             text = """
-🔍 **手动去重功能**
+🔍 <b>手动去重功能</b>
 
 可用命令:
-• `/dedup_message <消息ID>` - 去重单条消息
-• `/dedup_batch [类型] [数量]` - 批量去重
+• <code>/dedup_message &lt;消息ID&gt;</code> - 去重单条消息
+• <code>/dedup_batch [类型] [数量]</code> - 批量去重
   - 类型: image, video 或留空表示全部
   - 数量: 处理数量，默认100
-• `/dedup_report` - 查看重复文件报告
+• <code>/dedup_report</code> - 查看重复文件报告
 
 💡 示例:
-• `/dedup_batch image 50` - 去重50个图片
-• `/dedup_batch video` - 去重所有视频
-• `/dedup_batch 200` - 去重200个文件
+• <code>/dedup_batch image 50</code> - 去重50个图片
+• <code>/dedup_batch video</code> - 去重所有视频
+• <code>/dedup_batch 200</code> - 去重200个文件
             """
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"处理手动去重失败: {e}")
+            self._enqueue_edit(query, f"处理手动去重失败: {e}")
 
     async def _handle_duplicate_report_callback(self, query):
         """处理重复文件报告回调"""
@@ -1159,82 +1685,61 @@ class TelegramBot(LoggerMixin):
             report = await self.dedup_manager.get_duplicate_files_report(limit=50)
 
             if not report["success"]:
-                await query.edit_message_text(f"获取报告失败: {report['error']}")
+                self._enqueue_edit(query, f"获取报告失败: {report['error']}")
                 return
 
-            text = f"""
-📋 **重复文件报告**
+            parts = [f"""
+📋 <b>重复文件报告</b>
 
-📊 **统计信息**:
+📊 <b>统计信息</b>:
 • 重复文件数: {report['total_duplicates']}
 • 重复组数: {report['duplicate_groups']}
 • 节省空间: {report['space_saved_mb']:.1f} MB
 
-🗂️ **重复组示例** (前5组):
-"""
-
-            count = 0
-            for original_id, duplicates in report['duplicate_groups_detail'].items():
-                if count >= 5:
-                    break
+🗂️ <b>重复组示例</b> (前5组):
+"""]
 
-                text += f"\n**组 {count + 1}** (原始消息: {original_id}):\n"
-                for dup in duplicates[:3]:  # 只显示前3个重复文件
-                    text += f"• {dup['file_name']} ({dup['media_type']})\n"
+            groups = islice(report['duplicate_groups_detail'].items(), 5)
+            for count, (original_id, duplicates) in enumerate(groups, 1):
+                parts.append(f"\n<b>组 {count}</b> (原始消息: {original_id}):\n")
+                parts.extend(
+                    f"• {(dup['file_name'] or '').translate(HTML_ESCAPE)} ({dup['media_type']})\n"
+                    for dup in duplicates[:3]  # 只显示前3个重复文件
+                )
 
                 if len(duplicates) > 3:
-                    text += f"• ... 还有 {len(duplicates) - 3} 个重复文件\n"
-
-                count += 1
+                    parts.append(f"• ... 还有 {len(duplicates) - 3} 个重复文件\n")
 
             if report['duplicate_groups'] > 5:
-                text += f"\n... 还有 {report['duplicate_groups'] - 5} 个重复组"
+                parts.append(f"\n... 还有 {report['duplicate_groups'] - 5} 个重复组")
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, "".join(parts), parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取重复文件报告失败: {e}")
+            self._enqueue_edit(query, f"获取重复文件报告失败: {e}")
 
     async def _handle_dedup_details_callback(self, query):
         """处理去重详情回调"""
         try:
             stats = await self.dedup_manager.get_deduplication_stats()
 
-            text = f"""
-📈 **详细去重统计**
-
-📊 **消息统计**:
-• 总消息数: {stats['total_messages']}
-• 重复消息: {stats['duplicate_messages']}
-• 唯一消息: {stats['unique_messages']}
-• 已计算哈希: {stats['hashed_messages']}
+            dedup_settings = stats['settings']
+            text = _DEDUP_DETAILS_TEMPLATE.format_map(ChainMap({
+                "hash_dedup": _ENABLED_TEXT[bool(dedup_settings['hash_dedup_enabled'])],
+                "feature_dedup": _ENABLED_TEXT[bool(dedup_settings['feature_dedup_enabled'])],
+                "run_status": _RUN_EMOJI[bool(stats['is_running'])]
+            }, stats))
 
-🔍 **去重效果**:
-• 去重率: {stats['deduplication_rate']:.1%}
-• 去重记录: {stats['duplicate_records']}
+            runtime_seconds = stats.get('runtime_seconds')
+            if runtime_seconds is not None:
+                hours, remainder = divmod(int(runtime_seconds), 3600)
+                minutes = remainder // 60
+                text += f"\n⏱️ <b>运行时间</b>: {hours}小时 {minutes}分钟"
 
-⚡ **运行时统计**:
-• 已处理: {stats['runtime_stats']['processed']}
-• 发现重复: {stats['runtime_stats']['duplicates_found']}
-• 处理错误: {stats['runtime_stats']['errors']}
-
-🔧 **配置信息**:
-• 哈希去重: {'启用' if stats['settings']['hash_dedup_enabled'] else '禁用'}
-• 特征去重: {'启用' if stats['settings']['feature_dedup_enabled'] else '禁用'}
-• 相似度阈值: {stats['settings']['duplicate_threshold']:.2f}
-
-🔄 **运行状态**: {'🟢 运行中' if stats['is_running'] else '🔴 已停止'}
-            """
-
-            if 'runtime_seconds' in stats:
-                hours = int(stats['runtime_seconds'] // 3600)
-                minutes = int((stats['runtime_seconds'] % 3600) // 60)
-                text += f"\n⏱️ **运行时间**: {hours}小时 {minutes}分钟"
-
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取去重详情失败: {e}")
+            self._enqueue_edit(query, f"获取去重详情失败: {e}")
 
     async def _handle_storage_report_callback(self, query):
         """处理存储报告回调"""
@@ -1242,85 +1747,86 @@ class TelegramBot(LoggerMixin):
             report = await self.storage_monitor.get_comprehensive_report()
 
             if "error" in report:
-                await query.edit_message_text(f"获取存储报告失败: {report['error']}")
+                self._enqueue_edit(query, f"获取存储报告失败: {report['error']}")
                 return
 
             disk = report["disk_usage"]
             storage = report["storage_usage"]
 
             text = f"""
-📊 **详细存储报告**
+📊 <b>详细存储报告</b>
 
-🖥️ **磁盘使用情况**:
+🖥️ <b>磁盘使用情况</b>:
 • 总容量: {disk['total'] / (1024**3):.1f} GB
 • 已使用: {disk['used'] / (1024**3):.1f} GB
 • 剩余: {disk['free'] / (1024**3):.1f} GB
 • 使用率: {disk['usage_ratio']:.1%}
 
-📁 **项目文件统计**:
+📁 <b>项目文件统计</b>:
 • 文件总数: {storage['total_files']}
 • 总大小: {storage['total_size_gb']:.2f} GB
 
-📋 **按扩展名统计** (前5个):
+📋 <b>按扩展名统计</b> (前5个):
 """
 
-            # 按大小排序显示前5个扩展名
-            extensions = sorted(
+            # 显示按大小排名前5的扩展名（部分选择，无需整体排序）
+            extensions = heapq.nlargest(
+                5,
                 storage.get("by_extension", {}).items(),
-                key=lambda x: x[1]["size"],
-                reverse=True
+                key=lambda x: x[1]["size"]
             )
 
-            for ext, info in extensions[:5]:
-                ext_name = ext if ext else "无扩展名"
-                text += f"• {ext_name}: {info['count']} 个文件 ({info['size_mb']:.1f} MB)\n"
+            text += "".join(
+                f"• {(ext or '无扩展名').translate(HTML_ESCAPE)}: {info['count']} 个文件 ({info['size_mb']:.1f} MB)\n"
+                for ext, info in extensions
+            )
 
             # 一致性检查
             consistency = report["consistency_check"]
-            text += f"\n🔍 **数据一致性**: "
+            text += f"\n🔍 <b>数据一致性</b>: "
             if consistency["is_consistent"]:
                 text += "✅ 正常"
             else:
                 text += f"⚠️ 差异 {consistency['size_difference_mb']:.1f} MB"
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取存储报告失败: {e}")
+            self._enqueue_edit(query, f"获取存储报告失败: {e}")
 
     async def _handle_storage_cleanup_callback(self, query):
         """处理存储清理回调"""
         try:
             text = """
-🧹 **存储清理选项**
+🧹 <b>存储清理选项</b>
 
 可用清理命令:
-• `/cleanup_temp` - 清理临时文件
-• `/cleanup_old <天数>` - 清理指定天数前的文件
-• `/cleanup_duplicates` - 清理重复文件
-• `/cleanup_failed` - 清理失败的下载
+• <code>/cleanup_temp</code> - 清理临时文件
+• <code>/cleanup_old &lt;天数&gt;</code> - 清理指定天数前的文件
+• <code>/cleanup_duplicates</code> - 清理重复文件
+• <code>/cleanup_failed</code> - 清理失败的下载
 
-⚠️ **注意**: 清理操作不可逆，请谨慎使用
+⚠️ <b>注意</b>: 清理操作不可逆，请谨慎使用
 
 💡 建议定期清理临时文件和重复文件以节省空间
             """
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"处理存储清理失败: {e}")
+            self._enqueue_edit(query, f"处理存储清理失败: {e}")
 
     async def _handle_storage_monitor_callback(self, query):
         """处理存储监控回调"""
         try:
             text = f"""
-📈 **存储监控状态**
+📈 <b>存储监控状态</b>
 
-🔄 **监控器状态**: {'🟢 运行中' if self.storage_monitor.is_monitoring else '🔴 已停止'}
+🔄 <b>监控器状态</b>: {'🟢 运行中' if self.storage_monitor.is_monitoring else '🔴 已停止'}
 
-⏰ **最后检查**: {self.storage_monitor.last_check_time.strftime('%Y-%m-%d %H:%M:%S') if self.storage_monitor.last_check_time else '从未检查'}
+⏰ <b>最后检查</b>: {self.storage_monitor.last_check_time.strftime('%Y-%m-%d %H:%M:%S') if self.storage_monitor.last_check_time else '从未检查'}
 
-⚙️ **监控配置**:
+⚙️ <b>监控配置</b>:
 • 空间警告阈值: {self.storage_monitor.space_warning_threshold:.0%}
 • 空间严重阈值: {self.storage_monitor.space_critical_threshold:.0%}
 • 检查间隔: 30 分钟
@@ -1328,37 +1834,37 @@ class TelegramBot(LoggerMixin):
 💡 监控器会自动检查磁盘空间使用情况，并在空间不足时发出警告
             """
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取监控状态失败: {e}")
+            self._enqueue_edit(query, f"获取监控状态失败: {e}")
 
     async def _handle_pause_downloads_callback(self, query):
         """处理暂停下载回调"""
         try:
             await self.download_manager.pause_downloads()
-            await query.edit_message_text("⏸️ 下载已暂停")
+            self._enqueue_edit(query, "⏸️ 下载已暂停")
 
         except Exception as e:
-            await query.edit_message_text(f"暂停下载失败: {e}")
+            self._enqueue_edit(query, f"暂停下载失败: {e}")
 
     async def _handle_resume_downloads_callback(self, query):
         """处理恢复下载回调"""
         try:
             await self.download_manager.resume_downloads()
-            await query.edit_message_text("▶️ 下载已恢复")
+            self._enqueue_edit(query, "▶️ 下载已恢复")
 
         except Exception as e:
-            await query.edit_message_text(f"恢复下载失败: {e}")
+            self._enqueue_edit(query, f"恢复下载失败: {e}")
 
     async def _handle_retry_downloads_callback(self, query):
         """处理重试下载回调"""
         try:
             retry_count = await self.download_manager.retry_failed_downloads()
-            await query.edit_message_text(f"🔄 已重试 {retry_count} 个失败的下载任务")
+            self._enqueue_edit(query, f"🔄 已重试 {retry_count} 个失败的下载任务")
 
         except Exception as e:
-            await query.edit_message_text(f"重试下载失败: {e}")
+            self._enqueue_edit(query, f"重试下载失败: {e}")
 
     async def _handle_set_download_mode_callback(self, query, mode: str):
         """处理设置下载模式回调"""
@@ -1366,7 +1872,7 @@ class TelegramBot(LoggerMixin):
             # 验证模式
             valid_modes = ["auto", "manual", "selective"]
             if mode not in valid_modes:
-                await query.edit_message_text(f"❌ 无效的下载模式: {mode}")
+                self._enqueue_edit(query, f"❌ 无效的下载模式: {mode}")
                 return
 
             # 更新配置
@@ -1381,186 +1887,138 @@ class TelegramBot(LoggerMixin):
             }
 
             text = f"""
-✅ **下载模式已更新**
+✅ <b>下载模式已更新</b>
 
-📝 **变更**: {old_mode} → {mode}
-🔧 **新模式**: {mode_descriptions.get(mode, mode)}
+📝 <b>变更</b>: {old_mode} → {mode}
+🔧 <b>新模式</b>: {mode_descriptions.get(mode, mode)}
 
 💡 新设置将在下次采集时生效
             """
 
-            await query.edit_message_text(text, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
-            self.logger.info(f"下载模式已从 {old_mode} 更改为 {mode}")
+            self.logger.info("下载模式已从 {} 更改为 {}", old_mode, mode)
 
         except Exception as e:
-            await query.edit_message_text(f"设置下载模式失败: {e}")
+            self._enqueue_edit(query, f"设置下载模式失败: {e}")
 
     async def _handle_confirm_remove_channel_callback(self, query, channel_id: int):
         """处理确认移除频道回调"""
         try:
             async with self.db_manager.get_async_session() as session:
-                from sqlalchemy import select, delete
-
-                # 获取频道信息
-                channel_result = await session.execute(
-                    select(Channel).where(Channel.id == channel_id)
-                )
-                channel = channel_result.scalar_one_or_none()
-
-                if not channel:
-                    await query.edit_message_text("❌ 频道不存在")
-                    return
-
-                channel_title = channel.channel_title
-
-                # 删除相关消息
+                # 删除相关消息（影响行数即消息数，无需单独计数）
                 message_result = await session.execute(
-                    select(func.count(Message.id)).where(Message.channel_id == channel_id)
+                    delete(Message)
+                    .where(Message.channel_id == channel_id)
+                    .execution_options(synchronize_session=False)
                 )
-                message_count = message_result.scalar()
+                message_count = message_result.rowcount
 
-                await session.execute(
-                    delete(Message).where(Message.channel_id == channel_id)
+                # 删除频道并同时取回标题
+                channel_result = await session.execute(
+                    delete(Channel)
+                    .where(Channel.id == channel_id)
+                    .returning(Channel.channel_title)
+                    .execution_options(synchronize_session=False)
                 )
+                channel_title = channel_result.scalar_one_or_none()
 
-                # 删除频道
-                await session.execute(
-                    delete(Channel).where(Channel.id == channel_id)
-                )
+                if channel_title is None:
+                    await session.rollback()
+                    self._enqueue_edit(query, "❌ 频道不存在")
+                    return
 
                 await session.commit()
 
-                await query.edit_message_text(
-                    f"✅ **频道移除成功**\n\n"
-                    f"📺 频道: {channel_title}\n"
-                    f"🗑️ 已删除 {message_count} 条相关消息记录"
+                self._enqueue_edit(
+                    query,
+                    f"✅ <b>频道移除成功</b>\n\n"
+                    f"📺 频道: {channel_title.translate(HTML_ESCAPE)}\n"
+                    f"🗑️ 已删除 {message_count} 条相关消息记录",
+                    parse_mode=ParseMode.HTML
                 )
 
-                self.logger.info(f"移除频道: {channel_title} (ID: {channel_id})")
+                self.logger.info("移除频道: {} (ID: {})", channel_title, channel_id)
+
+            # 频道及其消息已删除，相关统计缓存失效
+            StatsBundle.for_database(self.db_manager).invalidate()
+            invalidate_async_ttl_cache(self.auto_classifier, "get_classification_stats")
+            invalidate_async_ttl_cache(self.dedup_manager, "get_deduplication_stats")
+            invalidate_async_ttl_cache(self.storage_monitor, "get_comprehensive_report")
 
         except Exception as e:
-            await query.edit_message_text(f"移除频道失败: {e}")
+            self._enqueue_edit(query, f"移除频道失败: {e}")
 
     async def _handle_add_channel_prompt_callback(self, query):
         """处理添加频道提示回调"""
         text = """
-➕ **添加新频道**
+➕ <b>添加新频道</b>
 
 请使用以下命令添加频道:
-`/add_channel <频道链接或用户名>`
+<code>/add_channel &lt;频道链接或用户名&gt;</code>
 
-**支持格式**:
-• 完整链接: `/add_channel https://t.me/example_channel`
-• 用户名: `/add_channel @example_channel`
-• 频道ID: `/add_channel -1001234567890`
+<b>支持格式</b>:
+• 完整链接: <code>/add_channel https://t.me/example_channel</code>
+• 用户名: <code>/add_channel @example_channel</code>
+• 频道ID: <code>/add_channel -1001234567890</code>
 
-💡 **提示**: 确保机器人有权限访问该频道
+💡 <b>提示</b>: 确保机器人有权限访问该频道
         """
 
-        await query.edit_message_text(text, parse_mode='Markdown')
+        self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
     async def _handle_remove_channel_prompt_callback(self, query):
         """处理移除频道提示回调"""
         text = """
-🗑️ **移除频道**
+🗑️ <b>移除频道</b>
 
 请使用以下命令移除频道:
-`/remove_channel <频道标识>`
+<code>/remove_channel &lt;频道标识&gt;</code>
 
-**支持格式**:
-• 用户名: `/remove_channel @example_channel`
-• 频道ID: `/remove_channel -1001234567890`
-• 频道标题: `/remove_channel 示例频道`
+<b>支持格式</b>:
+• 用户名: <code>/remove_channel @example_channel</code>
+• 频道ID: <code>/remove_channel -1001234567890</code>
+• 频道标题: <code>/remove_channel 示例频道</code>
 
-⚠️ **警告**: 移除频道将删除所有相关数据！
+⚠️ <b>警告</b>: 移除频道将删除所有相关数据！
         """
 
-        await query.edit_message_text(text, parse_mode='Markdown')
+        self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
     async def _handle_refresh_channels_callback(self, query):
         """处理刷新频道回调"""
         try:
-            # 重新获取频道列表
+            # 重新获取频道列表（只取显示需要的列）
             async with self.db_manager.get_async_session() as session:
                 result = await session.execute(
-                    select(Channel).order_by(Channel.created_at.desc())
+                    select(
+                        Channel.channel_id,
+                        Channel.channel_title,
+                        Channel.status,
+                        Channel.last_check_time
+                    )
+                    .order_by(Channel.created_at.desc())
+                    .limit(_REFRESH_CHANNELS_LIMIT)
                 )
-                channels = result.scalars().all()
-
-            if not channels:
-                await query.edit_message_text("📭 暂无已添加的频道")
-                return
-
-            text = "📋 **已添加的频道列表** (已刷新)\n\n"
-
-            for i, channel in enumerate(channels, 1):
-                status_emoji = {
-                    ChannelStatus.ACTIVE: "🟢",
-                    ChannelStatus.INACTIVE: "🟡",
-                    ChannelStatus.ERROR: "🔴"
-                }.get(channel.status, "⚪")
-
-                text += f"{i}. {status_emoji} **{channel.channel_title}**\n"
-                text += f"   • ID: `{channel.channel_id}`\n"
-                text += f"   • 状态: {channel.status.value}\n"
-                if channel.last_check_time:
-                    text += f"   • 最后检查: {channel.last_check_time.strftime('%Y-%m-%d %H:%M')}\n"
-                text += "\n"
+                rows = result.all()
 
-            await query.edit_message_text(text, parse_mode='Markdown')
-
-        except Exception as e:
-            await query.edit_message_text(f"刷新频道列表失败: {e}")
-
-    async def _handle_help_category_callback(self, query, category: str):
-        """处理帮助分类回调"""
-        try:
-            commands = self.command_helper.get_category_commands(category)
-
-            if not commands:
-                await query.edit_message_text(f"❌ 分类 '{category}' 下没有命令")
+            if not rows:
+                self._enqueue_edit(query, "📭 暂无已添加的频道")
                 return
 
-            text = f"📖 **{category} 命令**\n\n"
-
-            for cmd_name in commands:
-                cmd_info = self.command_helper.commands[cmd_name]
-                text += f"• `/{cmd_name}` - {cmd_info['description']}\n"
-
-            text += f"\n💡 使用 `/help <命令名>` 获取详细帮助"
-
-            # 返回按钮
-            keyboard = [[InlineKeyboardButton("🔙 返回帮助", callback_data="back_to_help")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            lines = [
+                f"{i}. {_CHANNEL_STATUS_EMOJI.get(ChannelStatus(status), '⚪')} <b>{title.translate(HTML_ESCAPE)}</b>\n"
+                f"   • ID: <code>{channel_id}</code>\n"
+                f"   • 状态: {status}\n"
+                + (f"   • 最后检查: {checked_at.strftime('%Y-%m-%d %H:%M')}\n" if checked_at else "")
+                for i, (channel_id, title, status, checked_at) in enumerate(rows, 1)
+            ]
+            text = "📋 <b>已添加的频道列表</b> (已刷新)\n\n" + "\n".join(lines) + "\n"
 
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            self._enqueue_edit(query, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取分类帮助失败: {e}")
-
-    async def _handle_help_search_callback(self, query):
-        """处理帮助搜索回调"""
-        text = """
-🔍 **命令搜索**
-
-使用以下方式搜索命令:
-• `/help <命令名>` - 获取特定命令帮助
-• 在下方按分类浏览命令
-
-**搜索示例**:
-• `/help add_channel` - 添加频道命令帮助
-• `/help search` - 搜索功能帮助
-• `/help storage` - 存储管理帮助
-
-💡 **提示**: 命令名不需要包含 `/` 前缀
-        """
-
-        # 返回按钮
-        keyboard = [[InlineKeyboardButton("🔙 返回帮助", callback_data="back_to_help")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-
-        await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            self._enqueue_edit(query, f"刷新频道列表失败: {e}")
 
     async def _handle_help_category_callback(self, query, category: str):
         """处理帮助分类回调"""
@@ -1568,48 +2026,46 @@ class TelegramBot(LoggerMixin):
             commands = self.command_helper.get_category_commands(category)
 
             if not commands:
-                await query.edit_message_text(f"❌ 分类 '{category}' 下没有命令")
+                self._enqueue_edit(query, f"❌ 分类 '{category}' 下没有命令")
                 return
 
-            text = f"📖 **{category} 命令**\n\n"
-
-            for cmd_name in commands:
-                cmd_info = self.command_helper.commands[cmd_name]
-                text += f"• `/{cmd_name}` - {cmd_info['description']}\n"
-
-            text += f"\n💡 使用 `/help <命令名>` 获取详细帮助"
+            parts = [f"📖 <b>{category} 命令</b>\n\n"]
+            parts.extend(
+                f"• <code>/{cmd_name}</code> - {self.command_helper.commands[cmd_name]['description']}\n"
+                for cmd_name in commands
+            )
+            parts.append("\n💡 使用 <code>/help &lt;命令名&gt;</code> 获取详细帮助")
+            text = "".join(parts)
 
             # 返回按钮
-            keyboard = [[InlineKeyboardButton("🔙 返回帮助", callback_data="back_to_help")]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            reply_markup = _BACK_TO_HELP_KEYBOARD
 
-            await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+            self._enqueue_edit(query, text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"获取分类帮助失败: {e}")
+            self._enqueue_edit(query, f"获取分类帮助失败: {e}")
 
     async def _handle_help_search_callback(self, query):
         """处理帮助搜索回调"""
         text = """
-🔍 **命令搜索**
+🔍 <b>命令搜索</b>
 
 使用以下方式搜索命令:
-• `/help <命令名>` - 获取特定命令帮助
+• <code>/help &lt;命令名&gt;</code> - 获取特定命令帮助
 • 在下方按分类浏览命令
 
-**搜索示例**:
-• `/help add_channel` - 添加频道命令帮助
-• `/help search` - 搜索功能帮助
-• `/help storage` - 存储管理帮助
+<b>搜索示例</b>:
+• <code>/help add_channel</code> - 添加频道命令帮助
+• <code>/help search</code> - 搜索功能帮助
+• <code>/help storage</code> - 存储管理帮助
 
-💡 **提示**: 命令名不需要包含 `/` 前缀
+💡 <b>提示</b>: 命令名不需要包含 <code>/</code> 前缀
         """
 
         # 返回按钮
-        keyboard = [[InlineKeyboardButton("🔙 返回帮助", callback_data="back_to_help")]]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = _BACK_TO_HELP_KEYBOARD
 
-        await query.edit_message_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+        self._enqueue_edit(query, text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
     async def _handle_back_to_help_callback(self, query):
         """处理返回帮助回调"""
@@ -1629,19 +2085,19 @@ class TelegramBot(LoggerMixin):
                         category = categories[i + j]
                         row.append(InlineKeyboardButton(
                             category,
-                            callback_data=f"help_category_{category}"
+                            callback_data=_callback_data(CallbackCode.HELP_CATEGORY, category)
                         ))
                 keyboard.append(row)
 
             # 添加搜索按钮
-            keyboard.append([InlineKeyboardButton("🔍 搜索命令", callback_data="help_search")])
+            keyboard.append([InlineKeyboardButton("🔍 搜索命令", callback_data=_callback_data(CallbackCode.HELP_SEARCH))])
 
             reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(help_text, reply_markup=reply_markup, parse_mode='Markdown')
+            self._enqueue_edit(query, help_text, reply_markup=reply_markup, parse_mode=ParseMode.HTML)
 
         except Exception as e:
-            await query.edit_message_text(f"返回帮助页面失败: {e}")
+            self._enqueue_edit(query, f"返回帮助页面失败: {e}")
 
     async def queue_downloads_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/queue_downloads命令"""
@@ -1660,23 +2116,23 @@ class TelegramBot(LoggerMixin):
             queued_count = await self.download_manager.queue_pending_downloads(limit)
 
             text = f"""
-📥 **下载队列更新**
+📥 <b>下载队列更新</b>
 
 ✅ 已将 {queued_count} 个待下载文件加入队列
 
-🔄 **当前状态**:
+🔄 <b>当前状态</b>:
 • 队列大小: {self.download_manager.download_queue.qsize()}
 • 活跃下载: {len(self.download_manager.active_downloads)}
 • 下载器状态: {'🟢 运行中' if self.download_manager.is_downloading else '🔴 已停止'}
 
-💡 使用 `/downloads` 查看详细下载状态
+💡 使用 <code>/downloads</code> 查看详细下载状态
             """
 
-            await update.message.reply_text(text, parse_mode='Markdown')
+            await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"队列下载失败: {e}")
-            self.logger.error(f"处理queue_downloads命令失败: {e}")
+            self.logger.error("处理queue_downloads命令失败: {}", e)
 
     async def cleanup_temp_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/cleanup_temp命令"""
@@ -1698,10 +2154,13 @@ class TelegramBot(LoggerMixin):
                 await update.message.reply_text(f"❌ 清理失败: {result['error']}")
                 return
 
+            # 文件已变化，下次查看存储报告时重新统计
+            invalidate_async_ttl_cache(self.storage_monitor, "get_comprehensive_report")
+
             text = f"""
-🧹 **临时文件清理完成**
+🧹 <b>临时文件清理完成</b>
 
-📊 **清理结果**:
+📊 <b>清理结果</b>:
 • 删除文件数: {result['deleted_files']}
 • 释放空间: {result['freed_space_mb']:.1f} MB
 • 清理条件: 超过 {max_age_hours} 小时的文件
@@ -1709,62 +2168,87 @@ class TelegramBot(LoggerMixin):
 ✅ 临时文件清理成功完成
             """
 
-            await update.message.reply_text(text, parse_mode='Markdown')
+            await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"清理临时文件失败: {e}")
-            self.logger.error(f"处理cleanup_temp命令失败: {e}")
+            self.logger.error("处理cleanup_temp命令失败: {}", e)
 
+    async def _reply_if_stats_limited(self, update: Update, key: tuple) -> bool:
+        """
+        统计命令限流检查，超限时重发该聊天上次的同类回复（不访问数据库）
+        
+        Args:
+            update: 更新对象
+            key: 命令键（命令名和参数）
+        
+        Returns:
+            bool: 是否已被限流（已回复）
+        """
+        chat_id = update.effective_chat.id
+        bucket = self._stats_buckets.get(chat_id)
+        if bucket is None:
+            bucket = AsyncTokenBucket(rate=_STATS_RATE, capacity=_STATS_BURST)
+            self._stats_buckets.set(chat_id, bucket)
+        
+        if bucket.try_acquire():
+            return False
+        
+        last_reply = self._last_stats_replies.get((chat_id, key))
+        if last_reply is None:
+            await update.message.reply_text("⏳ 请求过于频繁，请稍后再试")
+        else:
+            text, kwargs = last_reply
+            await update.message.reply_text(text, **kwargs)
+        return True
+    
+    async def _send_stats_reply(self, update: Update, key: tuple, text: str, **kwargs):
+        """发送统计命令的回复并记录，供限流时重发"""
+        await update.message.reply_text(text, **kwargs)
+        self._last_stats_replies.set((update.effective_chat.id, key), (text, kwargs))
+    
     async def system_info_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/system_info命令"""
         try:
-            import platform
-            import sys
-            from datetime import datetime
-
-            # 获取系统信息
-            system_info = {
-                "platform": platform.platform(),
-                "python_version": sys.version.split()[0],
-                "architecture": platform.architecture()[0],
-                "processor": platform.processor() or "Unknown",
-                "hostname": platform.node()
-            }
-
-            # 获取运行时信息
-            uptime = datetime.utcnow() - (self.download_manager.download_stats.get("start_time") or datetime.utcnow())
-
-            text = f"""
-🖥️ **系统信息**
-
-💻 **运行环境**:
-• 操作系统: {system_info['platform']}
-• Python版本: {system_info['python_version']}
-• 架构: {system_info['architecture']}
-• 主机名: {system_info['hostname']}
+            if await self._reply_if_stats_limited(update, ("system_info",)):
+                return
 
-⏱️ **运行状态**:
-• 机器人状态: {'🟢 运行中' if self.is_running else '🔴 已停止'}
-• 运行时间: {str(uptime).split('.')[0]}
+            # 获取运行时间（自机器人启动起的单调时钟秒数）
+            if self._started_at is None:
+                uptime = "未知"
+            else:
+                hours, remainder = divmod(int(time.monotonic() - self._started_at), 3600)
+                minutes, seconds = divmod(remainder, 60)
+                uptime = f"{hours}:{minutes:02d}:{seconds:02d}"
 
-🔧 **服务状态**:
-• 数据库: {'🟢 正常' if await self.db_manager.health_check() else '🔴 异常'}
-• 下载器: {'🟢 运行中' if self.download_manager.is_downloading else '🔴 已停止'}
-• 存储监控: {'🟢 运行中' if self.storage_monitor.is_monitoring else '🔴 已停止'}
-• 自动分类: {'🟢 启用' if self.settings.auto_classification else '🔴 禁用'}
+            # 数据库健康检查（带短时缓存）与内存读取并行
+            db_healthy, memory_usage = await asyncio.gather(
+                self._get_db_health(), asyncio.to_thread(self._get_memory_usage)
+            )
 
-📊 **内存使用**: {self._get_memory_usage()}
-            """
+            text = _SYSTEM_INFO_TEMPLATE.format_map(ChainMap({
+                "bot_status": _RUN_EMOJI[self.is_running],
+                "uptime": uptime,
+                "db_status": '🟢 正常' if db_healthy else '🔴 异常',
+                "downloader_status": _RUN_EMOJI[bool(self.download_manager.is_downloading)],
+                "monitor_status": _RUN_EMOJI[bool(self.storage_monitor.is_monitoring)],
+                "classification_status": '🟢 启用' if self.settings.auto_classification else '🔴 禁用',
+                "memory_usage": memory_usage
+            }, vars(_SYSINFO)))
 
-            await update.message.reply_text(text, parse_mode='Markdown')
+            await self._send_stats_reply(update, ("system_info",), text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取系统信息失败: {e}")
-            self.logger.error(f"处理system_info命令失败: {e}")
+            self.logger.error("处理system_info命令失败: {}", e)
 
     async def tag_stats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/tag_stats命令"""
         try:
+            stats_key = ("tag_stats", " ".join(context.args or ()))
+            if await self._reply_if_stats_limited(update, stats_key):
+                return
+
             if context.args:
                 # 获取指定标签的详细统计
                 tag_name = " ".join(context.args)
@@ -1778,21 +2262,21 @@ class TelegramBot(LoggerMixin):
                 media_stats = stats["media_stats"]
 
                 text = f"""
-🏷️ **标签详细统计**: {tag_info['name']}
+🏷️ <b>标签详细统计</b>: {tag_info['name'].translate(HTML_ESCAPE)}
 
-📝 **标签信息**:
-• 描述: {tag_info['description'] or '无描述'}
-• 颜色: {tag_info['color'] or '默认'}
+📝 <b>标签信息</b>:
+• 描述: {(tag_info['description'] or '无描述').translate(HTML_ESCAPE)}
+• 颜色: {(tag_info['color'] or '默认').translate(HTML_ESCAPE)}
 • 总文件数: {stats['total_files']}
 • 总大小: {stats['total_size_gb']:.2f} GB
 
-📊 **媒体类型分布**:
+📊 <b>媒体类型分布</b>:
 🎬 视频: {media_stats['video']['count']} 个 ({media_stats['video']['size_mb']:.1f} MB)
 📸 图片: {media_stats['image']['count']} 个 ({media_stats['image']['size_mb']:.1f} MB)
 🎵 音频: {media_stats['audio']['count']} 个 ({media_stats['audio']['size_mb']:.1f} MB)
 📄 文档: {media_stats['document']['count']} 个 ({media_stats['document']['size_mb']:.1f} MB)
 
-📈 **平均文件大小**:
+📈 <b>平均文件大小</b>:
 • 视频: {media_stats['video']['avg_size_mb']:.1f} MB
 • 图片: {media_stats['image']['avg_size_mb']:.1f} MB
 • 音频: {media_stats['audio']['avg_size_mb']:.1f} MB
@@ -1801,13 +2285,15 @@ class TelegramBot(LoggerMixin):
 
                 # 创建操作按钮
                 keyboard = [
-                    [InlineKeyboardButton("📈 时间线统计", callback_data=f"tag_timeline_{tag_info['id']}")],
-                    [InlineKeyboardButton("📺 频道分布", callback_data=f"tag_channels_{tag_info['id']}")],
-                    [InlineKeyboardButton("🔍 查看文件", callback_data=f"tag_files_{tag_info['id']}")]
+                    [InlineKeyboardButton("📈 时间线统计", callback_data=_callback_data(CallbackCode.TAG_TIMELINE, tag_info['id']))],
+                    [InlineKeyboardButton("📺 频道分布", callback_data=_callback_data(CallbackCode.TAG_CHANNELS, tag_info['id']))],
+                    [InlineKeyboardButton("🔍 查看文件", callback_data=_callback_data(CallbackCode.TAG_FILES, tag_info['id']))]
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await update.message.reply_text(text, reply_markup=reply_markup, parse_mode='Markdown')
+                await self._send_stats_reply(
+                    update, stats_key, text, reply_markup=reply_markup, parse_mode=ParseMode.HTML
+                )
 
             else:
                 # 显示所有标签的摘要统计
@@ -1817,45 +2303,39 @@ class TelegramBot(LoggerMixin):
                     await update.message.reply_text(f"❌ {summary['error']}")
                     return
 
-                text = f"""
-🏷️ **标签媒体统计摘要**
-
-📊 **总体统计**:
-• 活跃标签数: {summary['total_tags']}
-• 总视频数: {summary['overall_stats']['total_videos']}
-• 总图片数: {summary['overall_stats']['total_images']}
-• 总音频数: {summary['overall_stats']['total_audio']}
-• 总文档数: {summary['overall_stats']['total_documents']}
-
-🔝 **热门标签** (前10个):
-"""
-
-                for i, tag_summary in enumerate(summary['tags_summary'][:10], 1):
-                    text += f"{i}. **{tag_summary['tag_name']}**\n"
-                    text += f"   🎬 {tag_summary['videos']} 📸 {tag_summary['images']} "
-                    text += f"🎵 {tag_summary['audio']} 📄 {tag_summary['documents']}\n"
-                    text += f"   💾 {tag_summary['total_size_mb']:.1f} MB\n\n"
-
-                text += "💡 使用 `/tag_stats <标签名>` 查看详细统计"
+                overall_stats = summary['overall_stats']
+                cache_key = ("tag_stats", 20, summary['total_tags'], frozenset(overall_stats.items()))
+                text = self._tag_text_cache.get(cache_key)
+                if text is None:
+                    parts = [_TAG_SUMMARY_TEMPLATE.format(total_tags=summary['total_tags'], **overall_stats)]
+                    parts.extend(
+                        _TAG_SUMMARY_ROW(ChainMap(
+                            {"index": i, "name": tag_summary['tag_name'].translate(HTML_ESCAPE)}, tag_summary
+                        ))
+                        for i, tag_summary in enumerate(summary['tags_summary'][:10], 1)
+                    )
+                    parts.append(_TAG_STATS_HINT)
+                    text = "".join(parts)
+                    self._tag_text_cache.set(cache_key, text)
 
-                await update.message.reply_text(text, parse_mode='Markdown')
+                await self._send_stats_reply(update, stats_key, text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取标签统计失败: {e}")
-            self.logger.error(f"处理tag_stats命令失败: {e}")
+            self.logger.error("处理tag_stats命令失败: {}", e)
 
     async def media_by_tag_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """处理/media_by_tag命令"""
         try:
             if not context.args:
                 await update.message.reply_text(
-                    "🎯 **按媒体类型查看标签分布**\n\n"
+                    "🎯 <b>按媒体类型查看标签分布</b>\n\n"
                     "请指定媒体类型:\n"
-                    "• `/media_by_tag video` - 查看视频标签分布\n"
-                    "• `/media_by_tag image` - 查看图片标签分布\n"
-                    "• `/media_by_tag audio` - 查看音频标签分布\n"
-                    "• `/media_by_tag document` - 查看文档标签分布",
-                    parse_mode='Markdown'
+                    "• <code>/media_by_tag video</code> - 查看视频标签分布\n"
+                    "• <code>/media_by_tag image</code> - 查看图片标签分布\n"
+                    "• <code>/media_by_tag audio</code> - 查看音频标签分布\n"
+                    "• <code>/media_by_tag document</code> - 查看文档标签分布",
+                    parse_mode=ParseMode.HTML
                 )
                 return
 
@@ -1893,21 +2373,27 @@ class TelegramBot(LoggerMixin):
 
             emoji = media_emoji.get(media_type_str, "📁")
 
-            text = f"""
-{emoji} **{media_type_str.title()} 标签分布统计**
-
-📊 **总计**: {distribution['total_count']} 个{media_type_str}
-
-🏷️ **标签分布** (前15个):
-"""
-
-            for i, tag_info in enumerate(distribution['tag_distribution'], 1):
-                text += f"{i}. **{tag_info['tag_name']}**: {tag_info['count']} 个 ({tag_info['percentage']:.1f}%)\n"
-
-            text += f"\n💡 使用 `/tag_stats <标签名>` 查看标签详细统计"
+            cache_key = ("media_by_tag", media_type_str, distribution['total_count'])
+            text = self._tag_text_cache.get(cache_key)
+            if text is None:
+                parts = [_MEDIA_BY_TAG_TEMPLATE.format(
+                    emoji=emoji,
+                    title=media_type_str.title(),
+                    total_count=distribution['total_count'],
+                    media_type=media_type_str
+                )]
+                parts.extend(
+                    _MEDIA_BY_TAG_ROW(ChainMap(
+                        {"index": i, "name": tag_info['tag_name'].translate(HTML_ESCAPE)}, tag_info
+                    ))
+                    for i, tag_info in enumerate(distribution['tag_distribution'], 1)
+                )
+                parts.append(_MEDIA_BY_TAG_HINT)
+                text = "".join(parts)
+                self._tag_text_cache.set(cache_key, text)
 
-            await update.message.reply_text(text, parse_mode='Markdown')
+            await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
         except Exception as e:
             await update.message.reply_text(f"获取媒体标签分布失败: {e}")
-            self.logger.error(f"处理media_by_tag命令失败: {e}")
+            self.logger.error("处理media_by_tag命令失败: {}", e)
@@ -4,16 +4,30 @@
 管理用户权限和访问控制
 """
 
-from typing import Dict, List, Set, Optional
+import asyncio
+import time
+from collections import Counter, deque
 from datetime import datetime
+from typing import Any, Dict, List, Set, Optional
 from enum import Enum
 
 from ..database.database_manager import DatabaseManager
+from ..database.models import User
 from ..config.settings import Settings
+from ..utils.cache import TTLCache
 from ..utils.logger import LoggerMixin
 from sqlalchemy import select, update
 
 
+# 用户角色缓存时间（秒）和容量上限
+_ROLE_CACHE_TTL = 300.0
+_ROLE_CACHE_MAXSIZE = 50_000
+
+# 用户操作记录缓冲区容量和写日志间隔（秒）
+_ACTION_BUFFER_SIZE = 10_000
+_ACTION_FLUSH_INTERVAL = 0.5
+
+
 class UserRole(str, Enum):
     """用户角色枚举"""
     ADMIN = "admin"         # 管理员 - 所有权限
@@ -22,6 +36,10 @@ class UserRole(str, Enum):
     BANNED = "banned"       # 被禁用户
 
 
+# 各角色计数为0的初始统计（get_user_stats 每次复制后填充）
+_ZERO_ROLE_COUNTS: Dict[str, int] = {role.value: 0 for role in UserRole}
+
+
 class UserManager(LoggerMixin):
     """用户权限管理器"""
     
@@ -36,44 +54,98 @@ class UserManager(LoggerMixin):
         self.db_manager = db_manager
         self.settings = settings
         
-        # 权限配置
+        # 权限配置（不可变集合，各实例共享同一份）
         self.role_permissions = {
-            UserRole.ADMIN: {
+            UserRole.ADMIN: frozenset({
                 "can_add_channel", "can_remove_channel", "can_manage_settings",
                 "can_manage_users", "can_view_stats", "can_search", "can_manage_storage",
                 "can_manage_downloads", "can_manage_dedup", "can_manage_tags"
-            },
-            UserRole.OPERATOR: {
+            }),
+            UserRole.OPERATOR: frozenset({
                 "can_add_channel", "can_view_stats", "can_search", 
                 "can_manage_downloads", "can_manage_tags"
-            },
-            UserRole.VIEWER: {
+            }),
+            UserRole.VIEWER: frozenset({
                 "can_view_stats", "can_search"
-            },
-            UserRole.BANNED: set()
+            }),
+            UserRole.BANNED: frozenset()
         }
         
-        # 管理员用户ID列表（从配置或环境变量读取）
-        self.admin_users = self._load_admin_users()
+        # 管理员用户ID列表（从配置或环境变量读取，数据库中的记录由 load_users() 合并）
+        try:
+            self.admin_users = self._load_admin_users()
+        except (TypeError, ValueError) as e:
+            self.logger.error(f"加载管理员用户列表失败: {e}")
+            self.admin_users = set()
+        
+        # 用户角色缓存：用户ID -> 角色（容量有限，大量陌生用户涌入时淘汰最久未用的条目）
+        self._role_cache = TTLCache(maxsize=_ROLE_CACHE_MAXSIZE, ttl=_ROLE_CACHE_TTL)
         
-        # 用户会话缓存
-        self.user_cache = {}
+        # 被禁用户单独保存，不受缓存淘汰和过期影响
+        self._banned_users: Set[int] = set()
+        
+        # 待写入日志的用户操作：(时间戳, 用户ID, 操作, 详情)，缓冲区满时丢弃最早的记录
+        self._action_buffer: deque = deque(maxlen=_ACTION_BUFFER_SIZE)
+        self._flush_task: Optional[asyncio.Task] = None
+        
+        # 进行中的角色查询：用户ID -> 任务，同一用户的并发查询共享一次数据库读取
+        self._role_tasks: Dict[int, asyncio.Task] = {}
         
         self.logger.info("用户权限管理器初始化完成")
     
     def _load_admin_users(self) -> Set[int]:
-        """加载管理员用户列表"""
+        """加载管理员用户列表（配置格式错误时抛出 ValueError）"""
+        # 从环境变量或配置文件读取管理员用户ID
+        admin_ids = getattr(self.settings, 'admin_user_ids', ())
+        if isinstance(admin_ids, str):
+            return set(map(int, filter(None, map(str.strip, admin_ids.split(',')))))
+        
+        return set(admin_ids)
+    
+    async def load_users(self):
+        """从数据库加载通过机器人修改过的管理员和禁用状态（数据库初始化后调用一次）"""
         try:
-            # 从环境变量或配置文件读取管理员用户ID
-            admin_ids = getattr(self.settings, 'admin_user_ids', [])
-            if isinstance(admin_ids, str):
-                admin_ids = [int(id.strip()) for id in admin_ids.split(',') if id.strip()]
+            async with self.db_manager.get_async_session() as session:
+                # 只取需要的列：会话退出时提交会使 ORM 对象过期，之后无法再读取属性
+                users = (await session.execute(
+                    select(User.id, User.role, User.banned_at)
+                )).all()
             
-            return set(admin_ids)
+            # 数据库记录覆盖配置：被移除的配置管理员在重启后仍保持移除
+            for user_id, role, banned_at in users:
+                if role == UserRole.ADMIN.value:
+                    self.admin_users.add(user_id)
+                else:
+                    self.admin_users.discard(user_id)
+                
+                if banned_at is not None:
+                    self._banned_users.add(user_id)
+            
+            self._role_cache.clear()
+            self.logger.info(f"加载用户权限记录: {len(users)} 条")
             
         except Exception as e:
-            self.logger.error(f"加载管理员用户列表失败: {e}")
-            return set()
+            self.logger.error(f"加载用户权限记录失败: {e}")
+    
+    async def _save_user(self, user_id: int, role: Optional[UserRole] = None, banned: bool = False):
+        """
+        保存用户权限记录
+        
+        Args:
+            user_id: 用户ID
+            role: 新角色（None 表示保持原角色）
+            banned: 是否标记为禁用
+        """
+        async with self.db_manager.get_async_session() as session:
+            user = await session.get(User, user_id)
+            if user is None:
+                user = User(id=user_id, role=UserRole.OPERATOR.value)
+                session.add(user)
+            
+            if role is not None:
+                user.role = role.value
+            if banned:
+                user.banned_at = datetime.utcnow()
     
     async def check_user_permission(self, user_id: int, permission: str) -> bool:
         """
@@ -86,17 +158,17 @@ class UserManager(LoggerMixin):
         Returns:
             bool: 是否有权限
         """
-        try:
-            # 获取用户角色
-            role = await self.get_user_role(user_id)
-            
-            # 检查权限
-            user_permissions = self.role_permissions.get(role, set())
-            return permission in user_permissions
-            
-        except Exception as e:
-            self.logger.error(f"检查用户权限失败: {e}")
-            return False
+        # 缓存命中时直接判断，不再等待 get_user_role
+        role = self._cached_role(user_id)
+        if role is None:
+            try:
+                role = await self.get_user_role(user_id)
+            except Exception as e:
+                self.logger.error(f"检查用户权限失败: {e}")
+                return False
+        
+        # 检查权限
+        return permission in self.role_permissions.get(role, frozenset())
     
     async def get_user_role(self, user_id: int) -> UserRole:
         """
@@ -108,34 +180,82 @@ class UserManager(LoggerMixin):
         Returns:
             UserRole: 用户角色
         """
+        # 检查缓存
+        role = self._cached_role(user_id)
+        if role is not None:
+            return role
+        
         try:
-            # 检查缓存
-            if user_id in self.user_cache:
-                cache_entry = self.user_cache[user_id]
-                # 缓存5分钟
-                if (datetime.utcnow() - cache_entry["timestamp"]).seconds < 300:
-                    return cache_entry["role"]
-            
-            # 检查是否为管理员
-            if user_id in self.admin_users:
-                role = UserRole.ADMIN
-            else:
-                # 从数据库获取用户角色（如果有用户表的话）
-                # 目前简化为默认操作员权限
-                role = UserRole.OPERATOR
+            task = self._role_tasks.get(user_id)
+            if task is None:
+                task = asyncio.ensure_future(self._load_role(user_id))
+                self._role_tasks[user_id] = task
+                task.add_done_callback(lambda _: self._role_tasks.pop(user_id, None))
             
-            # 更新缓存
-            self.user_cache[user_id] = {
-                "role": role,
-                "timestamp": datetime.utcnow()
-            }
-            
-            return role
+            return await asyncio.shield(task)
             
         except Exception as e:
             self.logger.error(f"获取用户角色失败: {e}")
             return UserRole.VIEWER  # 默认最低权限
     
+    async def _load_role(self, user_id: int) -> UserRole:
+        """查询用户角色并写入缓存（其他进程通过 users 表做的修改也能生效）"""
+        if user_id in self.admin_users:
+            role = UserRole.ADMIN
+        else:
+            async with self.db_manager.get_read_connection() as conn:
+                user = (await conn.execute(
+                    select(User.role, User.banned_at).where(User.id == user_id)
+                )).first()
+            
+            if user is None:
+                role = self._resolve_role(user_id)
+            elif user.banned_at is not None:
+                self._banned_users.add(user_id)
+                return UserRole.BANNED
+            else:
+                role = UserRole(user.role)
+        
+        # 更新缓存
+        self._cache_role(user_id, role)
+        
+        return role
+    
+    def _resolve_role(self, user_id: int) -> UserRole:
+        """不经缓存确定用户角色"""
+        # 检查是否为管理员
+        if user_id in self.admin_users:
+            return UserRole.ADMIN
+        
+        # 其他用户目前简化为默认操作员权限
+        return UserRole.OPERATOR
+    
+    def is_admin_sync(self, user_id: int) -> bool:
+        """
+        同步判断用户是否为管理员（不查询缓存和数据库）
+        
+        Args:
+            user_id: 用户ID
+        
+        Returns:
+            bool: 是否为管理员
+        """
+        return user_id in self.admin_users
+    
+    def _cached_role(self, user_id: int) -> Optional[UserRole]:
+        """获取被禁状态或未过期的缓存角色，未命中时返回 None"""
+        if user_id in self._banned_users:
+            return UserRole.BANNED
+        return self._role_cache.get(user_id)
+    
+    def _cache_role(self, user_id: int, role: UserRole):
+        """缓存用户角色"""
+        self._role_cache.set(user_id, role)
+    
+    def _forget_role(self, user_id: int):
+        """清除用户角色缓存"""
+        self._role_cache.pop(user_id)
+    
     async def is_user_authorized(self, user_id: int) -> bool:
         """
         检查用户是否被授权使用机器人
@@ -165,11 +285,11 @@ class UserManager(LoggerMixin):
             bool: 是否添加成功
         """
         try:
+            await self._save_user(user_id, role=UserRole.ADMIN)
             self.admin_users.add(user_id)
             
             # 清除缓存
-            if user_id in self.user_cache:
-                del self.user_cache[user_id]
+            self._forget_role(user_id)
             
             self.logger.info(f"添加管理员用户: {user_id}")
             return True
@@ -189,11 +309,11 @@ class UserManager(LoggerMixin):
             bool: 是否移除成功
         """
         try:
+            await self._save_user(user_id, role=UserRole.OPERATOR)
             self.admin_users.discard(user_id)
             
             # 清除缓存
-            if user_id in self.user_cache:
-                del self.user_cache[user_id]
+            self._forget_role(user_id)
             
             self.logger.info(f"移除管理员用户: {user_id}")
             return True
@@ -213,11 +333,10 @@ class UserManager(LoggerMixin):
             bool: 是否禁用成功
         """
         try:
-            # 更新缓存为禁用状态
-            self.user_cache[user_id] = {
-                "role": UserRole.BANNED,
-                "timestamp": datetime.utcnow()
-            }
+            # 记录为禁用状态
+            await self._save_user(user_id, banned=True)
+            self._banned_users.add(user_id)
+            self._forget_role(user_id)
             
             self.logger.info(f"禁用用户: {user_id}")
             return True
@@ -234,24 +353,23 @@ class UserManager(LoggerMixin):
             Dict: 用户统计
         """
         try:
-            # 统计各角色用户数量
-            role_counts = {}
-            for role in UserRole:
-                role_counts[role.value] = 0
-            
-            # 统计缓存中的用户
-            for user_info in self.user_cache.values():
-                role = user_info["role"]
-                role_counts[role.value] += 1
+            # 统计缓存中各角色的用户数量（没有用户的角色记为0）；
+            # 所有计数都取自同一次遍历，已过期的缓存条目不计入
+            cached_roles = Counter(role.value for role in self._role_cache.values())
+            cached_users = sum(cached_roles.values())
+            role_counts = _ZERO_ROLE_COUNTS.copy()
+            role_counts.update(cached_roles)
+            role_counts[UserRole.BANNED.value] = len(self._banned_users)
             
             # 管理员数量
             role_counts[UserRole.ADMIN.value] = len(self.admin_users)
             
             return {
-                "total_users": len(self.user_cache),
+                "total_users": cached_users + len(self._banned_users),
                 "admin_users": len(self.admin_users),
                 "role_distribution": role_counts,
-                "cache_size": len(self.user_cache)
+                "cache_size": cached_users,
+                "cache_evictions": self._role_cache.evictions
             }
             
         except Exception as e:
@@ -285,19 +403,55 @@ class UserManager(LoggerMixin):
     
     async def log_user_action(self, user_id: int, action: str, details: str = ""):
         """
-        记录用户操作日志
+        记录用户操作日志（放入缓冲区，由后台任务定期批量写入日志）
         
         Args:
             user_id: 用户ID
             action: 操作类型
             details: 操作详情
         """
+        self._action_buffer.append((time.time(), user_id, action, details))
+        
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_action_loop())
+    
+    async def _flush_action_loop(self):
+        """定期写入缓冲的用户操作，缓冲区清空后退出（有新操作时重新启动）"""
         try:
-            role = await self.get_user_role(user_id)
-            self.logger.info(
-                f"用户操作 - ID: {user_id}, 角色: {role.value}, "
-                f"操作: {action}, 详情: {details}"
-            )
+            while self._action_buffer:
+                await asyncio.sleep(_ACTION_FLUSH_INTERVAL)
+                self.flush_user_actions()
+        finally:
+            self._flush_task = None
+    
+    async def stop_action_logging(self):
+        """停止后台写入任务，并写入缓冲区中剩余的用户操作（关闭时调用）"""
+        task, self._flush_task = self._flush_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        
+        self.flush_user_actions()
+    
+    def flush_user_actions(self):
+        """将缓冲的用户操作合并为一条日志写入"""
+        if not self._action_buffer:
+            return
+        
+        try:
+            lines = []
+            while self._action_buffer:
+                timestamp, user_id, action, details = self._action_buffer.popleft()
+                role = self._cached_role(user_id) or self._resolve_role(user_id)
+                lines.append(
+                    f"{datetime.fromtimestamp(timestamp):%H:%M:%S} ID: {user_id}, 角色: {role.value}, "
+                    f"操作: {action}, 详情: {details}"
+                )
+            
+            self.logger.info(f"用户操作 ({len(lines)} 条):\n" + "\n".join(lines))
             
         except Exception as e:
             self.logger.error(f"记录用户操作失败: {e}")
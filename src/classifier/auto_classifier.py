@@ -15,6 +15,8 @@ from ..database.database_manager import DatabaseManager
 from ..database.models import Message, MessageTag, Tag, MessageStatus
 from ..config.settings import Settings
 from ..utils.logger import LoggerMixin
+from ..utils.cache import STATS_CACHE_TTL, async_ttl_cache
+from ..statistics.stats_bundle import StatsBundle
 from .rule_engine import RuleEngine
 
 
@@ -435,6 +437,7 @@ class AutoClassifier(LoggerMixin):
             self.logger.error(f"获取消息标签失败: {e}")
             return []
     
+    @async_ttl_cache(ttl=STATS_CACHE_TTL)
     async def get_classification_stats(self) -> Dict[str, Any]:
         """
         获取分类统计信息
@@ -443,39 +446,22 @@ class AutoClassifier(LoggerMixin):
             Dict: 统计信息
         """
         try:
-            async with self.db_manager.get_async_session() as session:
-                # 获取总消息数
-                total_messages = await session.execute(
-                    select(Message).where(Message.status == MessageStatus.COMPLETED)
-                )
-                total_count = len(total_messages.scalars().all())
-                
-                # 获取已分类消息数
-                classified_messages = await session.execute(
-                    select(Message)
-                    .where(
-                        Message.status == MessageStatus.COMPLETED,
-                        Message.tags.any()
-                    )
-                )
-                classified_count = len(classified_messages.scalars().all())
-                
-                # 获取自动分类数
-                auto_classified = await session.execute(
-                    select(MessageTag).where(MessageTag.is_auto_classified == True)
-                )
-                auto_count = len(auto_classified.scalars().all())
-                
-                return {
-                    "total_messages": total_count,
-                    "classified_messages": classified_count,
-                    "auto_classified": auto_count,
-                    "manual_classified": classified_count - auto_count,
-                    "classification_rate": classified_count / total_count if total_count > 0 else 0,
-                    "runtime_stats": self.classification_stats.copy(),
-                    "is_running": self.is_classifying
-                }
-                
+            counts = await StatsBundle.for_database(self.db_manager).snapshot()
+            
+            total_count = counts["completed_messages"]
+            classified_count = counts["classified_messages"]
+            auto_count = counts["auto_classified"]
+            
+            return {
+                "total_messages": total_count,
+                "classified_messages": classified_count,
+                "auto_classified": auto_count,
+                "manual_classified": classified_count - auto_count,
+                "classification_rate": classified_count / total_count if total_count > 0 else 0,
+                "runtime_stats": self.classification_stats.copy(),
+                "is_running": self.is_classifying
+            }
+            
         except Exception as e:
             self.logger.error(f"获取分类统计失败: {e}")
             return {
@@ -572,8 +572,7 @@ class MessageCollector(LoggerMixin):
                     update(Channel)
                     .where(Channel.channel_id == channel_id)
                     .values(
-                        total_messages=Channel.total_messages + message_count,
-                        updated_at=datetime.utcnow()
+                        total_messages=Channel.total_messages + message_count
                     )
                 )
                 await session.commit()
@@ -589,8 +588,7 @@ class MessageCollector(LoggerMixin):
                     .where(Channel.channel_id == channel_id)
                     .values(
                         last_message_id=last_message_id,
-                        last_check_time=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
+                        last_check_time=datetime.utcnow()
                     )
                 )
                 await session.commit()
@@ -604,7 +602,7 @@ class MessageCollector(LoggerMixin):
                 await session.execute(
                     update(Channel)
                     .where(Channel.channel_id == channel_id)
-                    .values(status=status, updated_at=datetime.utcnow())
+                    .values(status=status)
                 )
                 await session.commit()
         except Exception as e:
@@ -5,6 +5,7 @@
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Optional
 
@@ -26,6 +27,7 @@ class Settings(BaseSettings):
     
     # 数据库配置
     database_url: str = Field("sqlite:///./data/bot.db", env="DATABASE_URL", description="数据库连接URL")
+    db_pool_size: int = Field(5, env="DB_POOL_SIZE", description="数据库连接池大小")
     
     # 存储配置
     storage_path: Path = Field(Path("./downloads"), env="STORAGE_PATH", description="文件存储路径")
@@ -127,3 +129,14 @@ class Settings(BaseSettings):
     def max_log_size_bytes(self) -> int:
         """获取最大日志文件大小（字节）"""
         return int(self.max_log_size_mb * 1024 * 1024)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    获取全局配置实例（进程内只加载一次）
+    
+    Returns:
+        Settings: 配置实例
+    """
+    return Settings()
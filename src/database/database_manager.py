@@ -8,8 +8,8 @@ import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 
@@ -17,22 +17,63 @@ from .models import Base
 from ..utils.logger import LoggerMixin
 
 
+# 消息全文索引（SQLite FTS5，trigram 分词支持中文子串匹配），通过触发器与 messages 表保持同步
+MESSAGES_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+        file_name, message_text, content='messages', content_rowid='id', tokenize='trigram'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+        INSERT INTO messages_fts(rowid, file_name, message_text)
+        VALUES (new.id, new.file_name, new.message_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, file_name, message_text)
+        VALUES ('delete', old.id, old.file_name, old.message_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF file_name, message_text ON messages BEGIN
+        INSERT INTO messages_fts(messages_fts, rowid, file_name, message_text)
+        VALUES ('delete', old.id, old.file_name, old.message_text);
+        INSERT INTO messages_fts(rowid, file_name, message_text)
+        VALUES (new.id, new.file_name, new.message_text);
+    END
+    """,
+)
+
+
 class DatabaseManager(LoggerMixin):
     """数据库管理器"""
     
-    def __init__(self, database_url: str):
+    def __init__(self, database_url: str, pool_size: int = 5, max_overflow: int = 10,
+                 pool_recycle: int = 3600):
         """
         初始化数据库管理器
         
         Args:
             database_url: 数据库连接URL
+            pool_size: 连接池大小（非SQLite数据库）
+            max_overflow: 连接池允许的溢出连接数（非SQLite数据库）
+            pool_recycle: 连接回收时间（秒，非SQLite数据库）
         """
         self.database_url = database_url
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_recycle = pool_recycle
         self.engine = None
         self.async_engine = None
+        self.read_engine = None
         self.session_factory = None
         self.async_session_factory = None
         
+        # 是否已启用消息全文索引（仅SQLite且支持FTS5时）
+        self.fts_enabled = False
+        
         self.logger.info(f"初始化数据库管理器: {database_url}")
     
     async def initialize(self):
@@ -66,9 +107,22 @@ class DatabaseManager(LoggerMixin):
                     cursor.close()
                 
             else:
-                # 其他数据库配置
-                self.engine = create_engine(self.database_url, echo=False)
-                self.async_engine = create_async_engine(self.database_url, echo=False)
+                # 其他数据库配置：使用长连接池，取用前检测连接可用性
+                pool_options = {
+                    "pool_size": self.pool_size,
+                    "max_overflow": self.max_overflow,
+                    "pool_pre_ping": True,
+                    "pool_recycle": self.pool_recycle,
+                }
+                self.engine = create_engine(self.database_url, echo=False, **pool_options)
+                self.async_engine = create_async_engine(self.database_url, echo=False, **pool_options)
+            
+            # 只读查询使用的引擎：非SQLite数据库使用自动提交模式，省去事务开始/提交的往返；
+            # SQLite 所有会话共用一个连接，切换隔离级别会影响进行中的事务，因此直接复用异步引擎
+            if self.database_url.startswith("sqlite"):
+                self.read_engine = self.async_engine
+            else:
+                self.read_engine = self.async_engine.execution_options(isolation_level="AUTOCOMMIT")
             
             # 创建会话工厂
             self.session_factory = sessionmaker(
@@ -87,12 +141,46 @@ class DatabaseManager(LoggerMixin):
             # 创建所有表
             Base.metadata.create_all(bind=self.engine)
             
+            # create_all 跳过已存在的表及其索引，已有数据库需单独补建后来新增的索引
+            self._ensure_indexes()
+            
+            if self.database_url.startswith("sqlite"):
+                self._setup_fulltext_search()
+            
             self.logger.info("数据库初始化完成")
             
         except Exception as e:
             self.logger.error(f"数据库初始化失败: {e}")
             raise
     
+    def _ensure_indexes(self):
+        """补建模型中定义、但已有数据库中缺失的索引"""
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(bind=conn, checkfirst=True)
+    
+    def _setup_fulltext_search(self):
+        """创建消息全文索引表和同步触发器（SQLite FTS5）"""
+        try:
+            with self.engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'messages_fts'")
+                ).first() is not None
+                
+                for statement in MESSAGES_FTS_DDL:
+                    conn.execute(text(statement))
+                
+                # 首次创建时为已有消息建立索引
+                if not exists:
+                    conn.execute(text("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')"))
+            
+            self.fts_enabled = True
+            
+        except Exception as e:
+            self.fts_enabled = False
+            self.logger.warning(f"SQLite FTS5 不可用，搜索将使用 LIKE 匹配: {e}")
+    
     @asynccontextmanager
     async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
         """
@@ -115,6 +203,34 @@ class DatabaseManager(LoggerMixin):
             finally:
                 await session.close()
     
+    @asynccontextmanager
+    async def get_async_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """
+        获取异步数据库连接（Core层，无ORM会话开销，适用于只读查询）
+        
+        Yields:
+            AsyncConnection: 从连接池取出的异步连接
+        """
+        if not self.async_engine:
+            raise RuntimeError("数据库未初始化，请先调用 initialize() 方法")
+        
+        async with self.async_engine.connect() as conn:
+            yield conn
+    
+    @asynccontextmanager
+    async def get_read_connection(self) -> AsyncGenerator[AsyncConnection, None]:
+        """
+        获取只读查询连接（统计、报表等不写入数据的查询）
+        
+        Yields:
+            AsyncConnection: 只读引擎上的异步连接
+        """
+        if not self.read_engine:
+            raise RuntimeError("数据库未初始化，请先调用 initialize() 方法")
+        
+        async with self.read_engine.connect() as conn:
+            yield conn
+    
     def get_session(self) -> Session:
         """
         获取同步数据库会话
@@ -148,10 +264,13 @@ class DatabaseManager(LoggerMixin):
         Returns:
             bool: 数据库是否正常
         """
+        if not self.async_engine:
+            return False
+        
         try:
-            async with self.get_async_session() as session:
-                # 执行简单查询测试连接
-                result = await session.execute("SELECT 1")
+            # 直接从连接池取连接执行简单查询，无需创建会话
+            async with self.async_engine.connect() as conn:
+                result = await conn.execute(text("SELECT 1"))
                 return result.scalar() == 1
         except Exception as e:
             self.logger.error(f"数据库健康检查失败: {e}")
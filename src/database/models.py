@@ -9,7 +9,7 @@ from enum import Enum
 from typing import List, Optional
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, Float, ForeignKey, Integer, 
+    BigInteger, Boolean, Column, DateTime, Float, ForeignKey, Integer, 
     String, Text, UniqueConstraint, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
@@ -65,13 +65,19 @@ class Channel(Base):
     last_message_id = Column(Integer, nullable=True, comment="最后处理的消息ID")
     last_check_time = Column(DateTime, nullable=True, comment="最后检查时间")
     
-    # 时间戳
-    created_at = Column(DateTime, default=func.now(), comment="创建时间")
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
+    # 时间戳（插入时显式写入；server_default 只对新建的表生效，已有数据库的列没有默认值）
+    created_at = Column(DateTime, default=func.now(), server_default=func.now(), comment="创建时间")
+    updated_at = Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now(), comment="更新时间")
     
     # 关系
     messages = relationship("Message", back_populates="channel", cascade="all, delete-orphan")
     
+    # 索引
+    __table_args__ = (
+        Index('idx_channel_user_status_created', 'added_by_user_id', 'status', 'created_at'),
+        Index('idx_channel_status', 'status'),
+    )
+    
     def __repr__(self):
         return f"<Channel(id={self.id}, title='{self.channel_title}', status='{self.status}')>"
 
@@ -119,6 +125,8 @@ class Message(Base):
         Index('idx_message_status', 'status'),
         Index('idx_message_hash', 'file_hash'),
         Index('idx_message_date', 'message_date'),
+        # 按状态和媒体类型的统计（含文件大小，聚合时不必回表）
+        Index('idx_message_status_media', 'status', 'media_type', 'file_size'),
     )
     
     def __repr__(self):
@@ -172,6 +180,7 @@ class MessageTag(Base):
     # 索引
     __table_args__ = (
         UniqueConstraint('message_id', 'tag_id', name='uq_message_tag'),
+        Index('idx_message_tag_tag', 'tag_id', 'message_id'),
         Index('idx_message_tag_confidence', 'confidence'),
     )
     
@@ -292,6 +301,21 @@ class UserSettings(Base):
         return f"<UserSettings(user_id='{self.user_id}', username='{self.username}')>"
 
 
+class User(Base):
+    """用户权限表（只记录通过机器人修改过权限的用户）"""
+    __tablename__ = "users"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False, comment="Telegram用户ID（可超过32位整数范围）")
+    role = Column(String(20), nullable=False, comment="用户角色")
+    banned_at = Column(DateTime, nullable=True, comment="禁用时间")
+
+    # 时间戳
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), comment="更新时间")
+
+    def __repr__(self):
+        return f"<User(id={self.id}, role='{self.role}', banned={self.banned_at is not None})>"
+
+
 class SystemStats(Base):
     """系统统计表"""
     __tablename__ = "system_stats"
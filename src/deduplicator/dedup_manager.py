@@ -12,6 +12,7 @@ from ..database.database_manager import DatabaseManager
 from ..database.models import Message, MediaType, MessageStatus
 from ..config.settings import Settings
 from ..utils.logger import LoggerMixin
+from ..utils.cache import STATS_CACHE_TTL, async_ttl_cache
 from .hash_deduplicator import HashDeduplicator
 from .image_deduplicator import ImageDeduplicator
 from .video_deduplicator import VideoDeduplicator
@@ -347,6 +348,7 @@ class DeduplicationManager(LoggerMixin):
             self.logger.error(f"获取待去重消息失败: {e}")
             return []
     
+    @async_ttl_cache(ttl=STATS_CACHE_TTL)
     async def get_deduplication_stats(self) -> Dict[str, Any]:
         """
         获取去重统计信息
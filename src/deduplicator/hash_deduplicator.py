@@ -12,6 +12,7 @@ import aiofiles
 
 from ..database.database_manager import DatabaseManager
 from ..database.models import Message, DuplicateRecord, MessageStatus
+from ..statistics.stats_bundle import StatsBundle
 from ..utils.logger import LoggerMixin
 from sqlalchemy import select, update
 
@@ -414,37 +415,19 @@ class HashDeduplicator(LoggerMixin):
             Dict: 统计信息
         """
         try:
-            async with self.db_manager.get_async_session() as session:
-                # 总消息数
-                total_messages = await session.execute(
-                    select(Message).where(Message.status == MessageStatus.COMPLETED)
-                )
-                total_count = len(total_messages.scalars().all())
-                
-                # 重复消息数
-                duplicate_messages = await session.execute(
-                    select(Message).where(Message.is_duplicate == True)
-                )
-                duplicate_count = len(duplicate_messages.scalars().all())
-                
-                # 去重记录数
-                duplicate_records = await session.execute(select(DuplicateRecord))
-                records_count = len(duplicate_records.scalars().all())
-                
-                # 有哈希值的消息数
-                hashed_messages = await session.execute(
-                    select(Message).where(Message.file_hash.isnot(None))
-                )
-                hashed_count = len(hashed_messages.scalars().all())
-                
-                return {
-                    "total_messages": total_count,
-                    "duplicate_messages": duplicate_count,
-                    "unique_messages": total_count - duplicate_count,
-                    "duplicate_records": records_count,
-                    "hashed_messages": hashed_count,
-                    "deduplication_rate": duplicate_count / total_count if total_count > 0 else 0
-                }
+            counts = await StatsBundle.for_database(self.db_manager).snapshot()
+            
+            total_count = counts["completed_messages"]
+            duplicate_count = counts["duplicate_messages"]
+            
+            return {
+                "total_messages": total_count,
+                "duplicate_messages": duplicate_count,
+                "unique_messages": total_count - duplicate_count,
+                "duplicate_records": counts["duplicate_records"],
+                "hashed_messages": counts["hashed_messages"],
+                "deduplication_rate": duplicate_count / total_count if total_count > 0 else 0
+            }
                 
         except Exception as e:
             self.logger.error(f"获取去重统计失败: {e}")
@@ -5,7 +5,9 @@
 """
 
 from .tag_statistics import TagStatistics
+from .stats_bundle import StatsBundle
 
 __all__ = [
-    "TagStatistics"
+    "TagStatistics",
+    "StatsBundle"
 ]
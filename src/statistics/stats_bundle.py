@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+统计汇总
+一次查询得到分类、去重等面板共用的消息计数，供各组件按需取用
+"""
+
+import weakref
+from typing import Any, Dict
+
+from sqlalchemy import func, select
+
+from ..database.database_manager import DatabaseManager
+from ..database.models import DuplicateRecord, Message, MessageStatus, MessageTag
+from ..utils.cache import STATS_CACHE_TTL, async_ttl_cache, invalidate_async_ttl_cache
+from ..utils.logger import LoggerMixin
+
+
+# 消息计数汇总：对 messages 表只扫描一次，各项计数用 FILTER 条件聚合
+_MESSAGE_COUNTS_STMT = select(
+    func.count(Message.id)
+    .filter(Message.status == MessageStatus.COMPLETED)
+    .label("completed_messages"),
+    func.count(Message.id)
+    .filter(
+        Message.status == MessageStatus.COMPLETED,
+        select(MessageTag.id).where(MessageTag.message_id == Message.id).exists()
+    )
+    .label("classified_messages"),
+    func.count(Message.id)
+    .filter(Message.is_duplicate == True)
+    .label("duplicate_messages"),
+    func.count(Message.id)
+    .filter(Message.file_hash.isnot(None))
+    .label("hashed_messages"),
+    func.coalesce(func.sum(Message.file_size).filter(Message.status == MessageStatus.COMPLETED), 0)
+    .label("completed_size"),
+    select(func.count(MessageTag.id))
+    .where(MessageTag.is_auto_classified == True)
+    .scalar_subquery().label("auto_classified"),
+    select(func.count(DuplicateRecord.id))
+    .scalar_subquery().label("duplicate_records"),
+).select_from(Message)
+
+
+class StatsBundle(LoggerMixin):
+    """统计汇总（同一数据库的所有组件共享一个实例）"""
+
+    _instances: "weakref.WeakKeyDictionary[DatabaseManager, StatsBundle]" = weakref.WeakKeyDictionary()
+
+    def __init__(self, db_manager: DatabaseManager):
+        """
+        初始化统计汇总
+
+        Args:
+            db_manager: 数据库管理器
+        """
+        self.db_manager = db_manager
+
+    @classmethod
+    def for_database(cls, db_manager: DatabaseManager) -> "StatsBundle":
+        """
+        获取指定数据库共享的统计汇总实例
+
+        Args:
+            db_manager: 数据库管理器
+
+        Returns:
+            StatsBundle: 统计汇总实例
+        """
+        bundle = cls._instances.get(db_manager)
+        if bundle is None:
+            bundle = cls._instances[db_manager] = cls(db_manager)
+        return bundle
+
+    @async_ttl_cache(ttl=STATS_CACHE_TTL)
+    async def snapshot(self) -> Dict[str, Any]:
+        """
+        获取消息计数汇总（短时缓存，并发调用共享一次查询）
+
+        Returns:
+            Dict: 各项计数
+        """
+        async with self.db_manager.get_read_connection() as conn:
+            row = (await conn.execute(_MESSAGE_COUNTS_STMT)).mappings().one()
+        return dict(row)
+
+    def invalidate(self):
+        """丢弃缓存的计数（数据被删除或批量修改后调用）"""
+        invalidate_async_ttl_cache(self, "snapshot")
@@ -15,6 +15,47 @@ from ..database.models import Message, Tag, MessageTag, MediaType, MessageStatus
 from ..utils.logger import LoggerMixin
 
 
+_BYTES_PER_MB = 1024 * 1024
+
+# 单次统计查询允许的最大返回条数
+_MAX_LIMIT = 100
+
+# 按媒体类型的条件聚合列：每种类型一个计数列和一个大小列（{类型}_count / {类型}_size）
+_MEDIA_AGGREGATES = tuple(
+    column
+    for media_type in MediaType
+    for column in (
+        func.count(Message.id)
+        .filter(Message.media_type == media_type)
+        .label(f"{media_type.value}_count"),
+        func.coalesce(func.sum(Message.file_size).filter(Message.media_type == media_type), 0)
+        .label(f"{media_type.value}_size"),
+    )
+)
+
+
+def _tag_media_select(*columns):
+    """
+    按标签分组的媒体聚合查询（标签左连接已完成的消息，没有消息的标签各项为0）
+    
+    Args:
+        columns: 额外查询的标签列
+    """
+    return (
+        select(*columns, *_MEDIA_AGGREGATES)
+        .select_from(Tag)
+        .outerjoin(MessageTag, MessageTag.tag_id == Tag.id)
+        .outerjoin(
+            Message,
+            and_(
+                Message.id == MessageTag.message_id,
+                Message.status == MessageStatus.COMPLETED
+            )
+        )
+        .group_by(Tag.id)
+    )
+
+
 class TagStatistics(LoggerMixin):
     """标签统计管理器"""
     
@@ -39,50 +80,36 @@ class TagStatistics(LoggerMixin):
         Returns:
             Dict: 媒体统计信息
         """
+        if tag_id:
+            condition = Tag.id == tag_id
+        elif tag_name:
+            condition = Tag.name == tag_name
+        else:
+            return {"error": "必须提供标签名称或ID"}
+        
         try:
-            async with self.db_manager.get_async_session() as session:
-                # 查找标签
-                if tag_id:
-                    tag_result = await session.execute(
-                        select(Tag).where(Tag.id == tag_id)
-                    )
-                elif tag_name:
-                    tag_result = await session.execute(
-                        select(Tag).where(Tag.name == tag_name)
-                    )
-                else:
-                    return {"error": "必须提供标签名称或ID"}
+            async with self.db_manager.get_read_connection() as conn:
+                # 标签信息和按媒体类型的聚合一次查询取回（不加载消息行）
+                tag = (await conn.execute(
+                    _tag_media_select(Tag.id, Tag.name, Tag.description, Tag.color).where(condition)
+                )).mappings().first()
                 
-                tag = tag_result.scalar_one_or_none()
                 if not tag:
                     return {"error": f"未找到标签: {tag_name or tag_id}"}
                 
-                # 获取该标签下的所有消息
-                messages_result = await session.execute(
-                    select(Message)
-                    .join(MessageTag, Message.id == MessageTag.message_id)
-                    .where(
-                        MessageTag.tag_id == tag.id,
-                        Message.status == MessageStatus.COMPLETED
-                    )
-                )
-                messages = messages_result.scalars().all()
-                
-                # 按媒体类型统计
                 media_stats = {}
                 total_files = 0
                 total_size = 0
                 
                 for media_type in MediaType:
-                    type_messages = [msg for msg in messages if msg.media_type == media_type]
-                    type_count = len(type_messages)
-                    type_size = sum(msg.file_size or 0 for msg in type_messages)
+                    type_count = tag[f"{media_type.value}_count"]
+                    type_size = tag[f"{media_type.value}_size"]
                     
                     media_stats[media_type.value] = {
                         "count": type_count,
                         "size_bytes": type_size,
-                        "size_mb": type_size / (1024 * 1024),
-                        "avg_size_mb": (type_size / type_count / (1024 * 1024)) if type_count > 0 else 0
+                        "size_mb": type_size / _BYTES_PER_MB,
+                        "avg_size_mb": (type_size / type_count / _BYTES_PER_MB) if type_count > 0 else 0
                     }
                     
                     total_files += type_count
@@ -90,15 +117,15 @@ class TagStatistics(LoggerMixin):
                 
                 return {
                     "tag_info": {
-                        "id": tag.id,
-                        "name": tag.name,
-                        "description": tag.description,
-                        "color": tag.color
+                        "id": tag["id"],
+                        "name": tag["name"],
+                        "description": tag["description"],
+                        "color": tag["color"]
                     },
                     "total_files": total_files,
                     "total_size_bytes": total_size,
-                    "total_size_mb": total_size / (1024 * 1024),
-                    "total_size_gb": total_size / (1024 * 1024 * 1024),
+                    "total_size_mb": total_size / _BYTES_PER_MB,
+                    "total_size_gb": total_size / (_BYTES_PER_MB * 1024),
                     "media_stats": media_stats,
                     "generated_at": datetime.utcnow().isoformat()
                 }
@@ -117,19 +144,22 @@ class TagStatistics(LoggerMixin):
         Returns:
             Dict: 所有标签的媒体统计摘要
         """
+        if limit > _MAX_LIMIT:
+            return {"error": f"limit 不能超过 {_MAX_LIMIT}"}
+        
         try:
             async with self.db_manager.get_async_session() as session:
-                # 获取所有有内容的标签
-                tags_result = await session.execute(
-                    select(Tag)
+                # 有内容的标签及其按媒体类型的聚合（一次查询，按标签分组）
+                result = await session.execute(
+                    _tag_media_select(Tag.id, Tag.name)
                     .where(Tag.usage_count > 0)
                     .order_by(Tag.usage_count.desc())
                     .limit(limit)
                 )
-                tags = tags_result.scalars().all()
+                rows = result.mappings().all()
                 
                 summary = {
-                    "total_tags": len(tags),
+                    "total_tags": len(rows),
                     "tags_summary": [],
                     "overall_stats": {
                         "total_videos": 0,
@@ -139,31 +169,25 @@ class TagStatistics(LoggerMixin):
                     }
                 }
                 
-                for tag in tags:
-                    # 获取该标签的媒体统计
-                    tag_stats = await self.get_tag_media_stats(tag_id=tag.id)
+                for row in rows:
+                    tag_summary = {
+                        "tag_name": row["name"],
+                        "tag_id": row["id"],
+                        "videos": row["video_count"],
+                        "images": row["image_count"],
+                        "audio": row["audio_count"],
+                        "documents": row["document_count"],
+                        "total_files": sum(row[f"{media_type.value}_count"] for media_type in MediaType),
+                        "total_size_mb": sum(row[f"{media_type.value}_size"] for media_type in MediaType) / _BYTES_PER_MB
+                    }
                     
-                    if "error" not in tag_stats:
-                        media_stats = tag_stats["media_stats"]
-                        
-                        tag_summary = {
-                            "tag_name": tag.name,
-                            "tag_id": tag.id,
-                            "videos": media_stats.get("video", {}).get("count", 0),
-                            "images": media_stats.get("image", {}).get("count", 0),
-                            "audio": media_stats.get("audio", {}).get("count", 0),
-                            "documents": media_stats.get("document", {}).get("count", 0),
-                            "total_files": tag_stats["total_files"],
-                            "total_size_mb": tag_stats["total_size_mb"]
-                        }
-                        
-                        summary["tags_summary"].append(tag_summary)
-                        
-                        # 累计总体统计
-                        summary["overall_stats"]["total_videos"] += tag_summary["videos"]
-                        summary["overall_stats"]["total_images"] += tag_summary["images"]
-                        summary["overall_stats"]["total_audio"] += tag_summary["audio"]
-                        summary["overall_stats"]["total_documents"] += tag_summary["documents"]
+                    summary["tags_summary"].append(tag_summary)
+                    
+                    # 累计总体统计
+                    summary["overall_stats"]["total_videos"] += tag_summary["videos"]
+                    summary["overall_stats"]["total_images"] += tag_summary["images"]
+                    summary["overall_stats"]["total_audio"] += tag_summary["audio"]
+                    summary["overall_stats"]["total_documents"] += tag_summary["documents"]
                 
                 return summary
                 
@@ -182,6 +206,9 @@ class TagStatistics(LoggerMixin):
         Returns:
             Dict: 媒体类型在各标签下的分布
         """
+        if limit > _MAX_LIMIT:
+            return {"error": f"limit 不能超过 {_MAX_LIMIT}"}
+        
         try:
             async with self.db_manager.get_async_session() as session:
                 # 查询指定媒体类型的消息及其标签
@@ -315,6 +342,10 @@ class TagStatistics(LoggerMixin):
         Returns:
             List[Dict]: 标签列表
         """
+        if limit > _MAX_LIMIT:
+            self.logger.warning(f"按媒体数量搜索标签的 limit 不能超过 {_MAX_LIMIT}: {limit}")
+            return []
+        
         try:
             async with self.db_manager.get_async_session() as session:
                 # 查询包含指定媒体类型且数量大于最小值的标签
@@ -359,6 +390,9 @@ class TagStatistics(LoggerMixin):
         Returns:
             Dict: 各媒体类型的热门标签
         """
+        if limit > _MAX_LIMIT:
+            return {"error": f"limit 不能超过 {_MAX_LIMIT}"}
+        
         try:
             result = {}
             
@@ -68,6 +68,9 @@ class DownloadManager(LoggerMixin):
         self.max_concurrent_downloads = settings.max_concurrent_downloads
         self.download_semaphore = asyncio.Semaphore(self.max_concurrent_downloads)
         
+        # 正在执行的待下载消息入队任务（并发调用共享同一次执行）
+        self._queue_pending_task: Optional[asyncio.Task] = None
+        
         # 统计信息
         self.download_stats = {
             "total_queued": 0,
@@ -468,12 +471,29 @@ class DownloadManager(LoggerMixin):
         """
         将待下载的消息加入队列
         
+        已有入队操作在执行时，直接等待并返回该次操作的结果，避免重复扫描数据库。
+        
         Args:
             limit: 限制数量
         
         Returns:
             int: 加入队列的任务数量
         """
+        task = self._queue_pending_task
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._queue_pending_downloads(limit))
+            self._queue_pending_task = task
+            task.add_done_callback(self._clear_queue_pending_task)
+        
+        return await asyncio.shield(task)
+    
+    def _clear_queue_pending_task(self, task: asyncio.Task):
+        """入队操作完成后清除记录"""
+        if self._queue_pending_task is task:
+            self._queue_pending_task = None
+    
+    async def _queue_pending_downloads(self, limit: int) -> int:
+        """扫描待下载消息并加入队列"""
         try:
             # 获取待下载的消息
             async with self.db_manager.get_async_session() as session:
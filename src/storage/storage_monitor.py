@@ -14,9 +14,25 @@ from ..database.database_manager import DatabaseManager
 from ..database.models import Message, MediaType, MessageStatus
 from ..config.settings import Settings
 from ..utils.logger import LoggerMixin
+from ..utils.cache import async_ttl_cache, invalidate_async_ttl_cache
 from sqlalchemy import select, func
 
 
+# 综合报告需要遍历整个存储目录，缓存时间长于一般统计
+REPORT_CACHE_TTL = 10.0
+
+# 已完成消息按媒体类型分组的数量和大小，一次查询代替逐类型查询
+_MEDIA_TYPE_STATS_STMT = (
+    select(
+        Message.media_type,
+        func.count(Message.id),
+        func.coalesce(func.sum(Message.file_size), 0)
+    )
+    .where(Message.status == MessageStatus.COMPLETED)
+    .group_by(Message.media_type)
+)
+
+
 class StorageMonitor(LoggerMixin):
     """存储监控器"""
     
@@ -139,42 +155,47 @@ class StorageMonitor(LoggerMixin):
             Dict: 存储使用信息
         """
         try:
-            total_size = 0
-            total_files = 0
-            by_type = {}
-            
-            if self.storage_path.exists():
-                for item in self.storage_path.rglob("*"):
-                    if item.is_file():
-                        file_size = item.stat().st_size
-                        total_size += file_size
-                        total_files += 1
-                        
-                        # 按文件类型统计
-                        file_ext = item.suffix.lower()
-                        if file_ext not in by_type:
-                            by_type[file_ext] = {"count": 0, "size": 0}
-                        
-                        by_type[file_ext]["count"] += 1
-                        by_type[file_ext]["size"] += file_size
-            
-            # 转换单位
-            for ext_info in by_type.values():
-                ext_info["size_mb"] = ext_info["size"] / (1024 * 1024)
-            
-            return {
-                "total_files": total_files,
-                "total_size": total_size,
-                "total_size_mb": total_size / (1024 * 1024),
-                "total_size_gb": total_size / (1024 * 1024 * 1024),
-                "by_extension": by_type,
-                "storage_path": str(self.storage_path)
-            }
+            # 遍历目录是阻塞操作，放到线程中执行，不阻塞事件循环
+            return await asyncio.to_thread(self._scan_storage_usage)
             
         except Exception as e:
             self.logger.error(f"获取存储使用情况失败: {e}")
             return {"error": str(e)}
     
+    def _scan_storage_usage(self) -> Dict[str, Any]:
+        """遍历存储目录统计文件数量和大小（同步执行）"""
+        total_size = 0
+        total_files = 0
+        by_type = {}
+        
+        if self.storage_path.exists():
+            for item in self.storage_path.rglob("*"):
+                if item.is_file():
+                    file_size = item.stat().st_size
+                    total_size += file_size
+                    total_files += 1
+                    
+                    # 按文件类型统计
+                    file_ext = item.suffix.lower()
+                    if file_ext not in by_type:
+                        by_type[file_ext] = {"count": 0, "size": 0}
+                    
+                    by_type[file_ext]["count"] += 1
+                    by_type[file_ext]["size"] += file_size
+        
+        # 转换单位
+        for ext_info in by_type.values():
+            ext_info["size_mb"] = ext_info["size"] / (1024 * 1024)
+        
+        return {
+            "total_files": total_files,
+            "total_size": total_size,
+            "total_size_mb": total_size / (1024 * 1024),
+            "total_size_gb": total_size / (1024 * 1024 * 1024),
+            "by_extension": by_type,
+            "storage_path": str(self.storage_path)
+        }
+    
     async def get_database_storage_stats(self) -> Dict[str, Any]:
         """
         获取数据库中的存储统计
@@ -183,57 +204,32 @@ class StorageMonitor(LoggerMixin):
             Dict: 数据库存储统计
         """
         try:
-            async with self.db_manager.get_async_session() as session:
-                # 按媒体类型统计
-                type_stats = {}
-                for media_type in MediaType:
-                    # 文件数量
-                    count_result = await session.execute(
-                        select(func.count(Message.id)).where(
-                            Message.media_type == media_type,
-                            Message.status == MessageStatus.COMPLETED
-                        )
-                    )
-                    file_count = count_result.scalar()
-                    
-                    # 文件大小总计
-                    size_result = await session.execute(
-                        select(func.sum(Message.file_size)).where(
-                            Message.media_type == media_type,
-                            Message.status == MessageStatus.COMPLETED
-                        )
-                    )
-                    total_size = size_result.scalar() or 0
-                    
-                    type_stats[media_type.value] = {
-                        "file_count": file_count,
-                        "total_size": total_size,
-                        "total_size_mb": total_size / (1024 * 1024)
-                    }
-                
-                # 总体统计
-                total_files = await session.execute(
-                    select(func.count(Message.id)).where(
-                        Message.status == MessageStatus.COMPLETED
-                    )
-                )
-                total_files = total_files.scalar()
-                
-                total_size = await session.execute(
-                    select(func.sum(Message.file_size)).where(
-                        Message.status == MessageStatus.COMPLETED
-                    )
-                )
-                total_size = total_size.scalar() or 0
-                
-                return {
-                    "total_files": total_files,
-                    "total_size": total_size,
-                    "total_size_mb": total_size / (1024 * 1024),
-                    "total_size_gb": total_size / (1024 * 1024 * 1024),
-                    "by_media_type": type_stats
+            async with self.db_manager.get_read_connection() as conn:
+                result = await conn.execute(_MEDIA_TYPE_STATS_STMT)
+                grouped = {media_type: (count, size) for media_type, count, size in result.all()}
+            
+            # 按媒体类型统计（没有记录的类型计为0）
+            type_stats = {}
+            for media_type in MediaType:
+                file_count, type_size = grouped.get(media_type.value, (0, 0))
+                type_stats[media_type.value] = {
+                    "file_count": file_count,
+                    "total_size": type_size,
+                    "total_size_mb": type_size / (1024 * 1024)
                 }
-                
+            
+            # 总体统计（包含未设置媒体类型的记录）
+            total_files = sum(count for count, _ in grouped.values())
+            total_size = sum(size for _, size in grouped.values())
+            
+            return {
+                "total_files": total_files,
+                "total_size": total_size,
+                "total_size_mb": total_size / (1024 * 1024),
+                "total_size_gb": total_size / (1024 * 1024 * 1024),
+                "by_media_type": type_stats
+            }
+            
         except Exception as e:
             self.logger.error(f"获取数据库存储统计失败: {e}")
             return {"error": str(e)}
@@ -267,6 +263,9 @@ class StorageMonitor(LoggerMixin):
                             
                             self.logger.debug(f"删除旧文件: {file_path.name}")
             
+            # 文件已变化，丢弃缓存的综合报告
+            invalidate_async_ttl_cache(self, "get_comprehensive_report")
+            
             self.logger.info(
                 f"清理旧文件完成: 删除 {deleted_count} 个文件，"
                 f"释放 {freed_space / (1024*1024):.1f} MB"
@@ -283,6 +282,7 @@ class StorageMonitor(LoggerMixin):
             self.logger.error(f"清理旧文件失败: {e}")
             return {"error": str(e)}
     
+    @async_ttl_cache(ttl=REPORT_CACHE_TTL)
     async def get_comprehensive_report(self) -> Dict[str, Any]:
         """
         获取综合存储报告
@@ -291,10 +291,12 @@ class StorageMonitor(LoggerMixin):
             Dict: 综合报告
         """
         try:
-            # 获取各种统计信息
-            disk_usage = await self.get_disk_usage()
-            storage_usage = await self.get_storage_usage()
-            db_stats = await self.get_database_storage_stats()
+            # 并发获取各种统计信息（目录遍历在线程中执行，与数据库查询重叠）
+            disk_usage, storage_usage, db_stats = await asyncio.gather(
+                self.get_disk_usage(),
+                self.get_storage_usage(),
+                self.get_database_storage_stats()
+            )
             
             # 计算一致性检查
             db_total_size = db_stats.get("total_size", 0)
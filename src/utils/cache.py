@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+缓存工具
+提供带过期时间和容量上限的内存缓存，以及异步方法结果的短时缓存
+"""
+
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Iterator, Optional
+
+
+# 统计类查询结果的默认缓存时间（秒）
+STATS_CACHE_TTL = 3.0
+
+
+class TTLCache:
+    """带过期时间的LRU缓存"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0):
+        """
+        初始化缓存
+
+        Args:
+            maxsize: 最大缓存条目数，超出时淘汰最久未使用的条目
+            ttl: 条目有效期（秒）
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        
+        # 因容量不足被淘汰的条目数
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """
+        获取缓存值
+
+        Args:
+            key: 缓存键
+            default: 未命中或已过期时的返回值
+
+        Returns:
+            缓存值
+        """
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """
+        写入缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+        """
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """移除并返回缓存值"""
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def values(self) -> Iterator[Any]:
+        """遍历未过期的缓存值"""
+        now = time.monotonic()
+        return (value for expires_at, value in self._data.values() if expires_at > now)
+
+    def clear(self):
+        """清空缓存"""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def async_ttl_cache(ttl: float):
+    """
+    异步方法结果缓存装饰器
+
+    结果按实例和调用参数缓存 ttl 秒；缓存未命中时并发调用共享同一次执行，
+    避免突发的重复请求同时访问数据库或磁盘。执行抛出异常时不缓存。
+
+    Args:
+        ttl: 结果有效期（秒，自执行完成时起算）
+    """
+    def decorator(func):
+        cache_attr = f"_async_ttl_cache_{func.__name__}"
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            entries = self.__dict__.setdefault(cache_attr, {})
+            key = (args, tuple(sorted(kwargs.items())))
+
+            entry = entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return await asyncio.shield(entry[1])
+
+            # 执行期间有效期为无穷大，让并发调用者等待同一个任务；
+            # 任务结束时由回调设置有效期或移除失败结果，不依赖任何调用者等待到结束
+            task = asyncio.ensure_future(func(self, *args, **kwargs))
+            entry = [float("inf"), task]
+            entries[key] = entry
+
+            def settle(done):
+                if done.cancelled() or done.exception() is not None:
+                    if entries.get(key) is entry:
+                        del entries[key]
+                else:
+                    entry[0] = time.monotonic() + ttl
+
+            task.add_done_callback(settle)
+            return await asyncio.shield(task)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate_async_ttl_cache(instance: Any, *method_names: str):
+    """
+    清除实例上由 async_ttl_cache 缓存的方法结果
+
+    Args:
+        instance: 被缓存方法所属的实例
+        method_names: 方法名列表
+    """
+    for name in method_names:
+        instance.__dict__.pop(f"_async_ttl_cache_{name}", None)
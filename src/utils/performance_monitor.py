@@ -14,6 +14,10 @@ from functools import wraps
 from .logger import LoggerMixin
 
 
+# CPU使用率的最短采样窗口（秒）：距上次采样不足该时长时先补足等待，避免结果只反映几毫秒内的负载
+MIN_CPU_SAMPLE_WINDOW = 0.5
+
+
 class PerformanceMonitor(LoggerMixin):
     """性能监控器"""
     
@@ -31,6 +35,12 @@ class PerformanceMonitor(LoggerMixin):
             "response_time_warning": 2.0  # 响应时间警告阈值（秒）
         }
         
+        # 缓存进程句柄，并预热CPU采样基线，之后可使用非阻塞的 interval=None 采样
+        self._process = psutil.Process()
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        self._cpu_sampled_at = time.monotonic()
+        
         self.logger.info("性能监控器初始化完成")
     
     async def start_monitoring(self, interval_seconds: int = 60):
@@ -73,14 +83,28 @@ class PerformanceMonitor(LoggerMixin):
     
     async def collect_metrics(self) -> Dict[str, Any]:
         """
-        收集性能指标
+        收集性能指标（在线程池中执行，不阻塞事件循环）
+        
+        Returns:
+            Dict: 性能指标
+        """
+        return await asyncio.to_thread(self.collect_metrics_sync)
+    
+    def collect_metrics_sync(self) -> Dict[str, Any]:
+        """
+        同步收集性能指标
         
         Returns:
             Dict: 性能指标
         """
         try:
-            # CPU使用率
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU使用率（相对上次采样的增量；采样窗口过短时在当前线程中等待补足）
+            remaining = MIN_CPU_SAMPLE_WINDOW - (time.monotonic() - self._cpu_sampled_at)
+            if remaining > 0:
+                time.sleep(remaining)
+            cpu_percent = psutil.cpu_percent(interval=None)
+            process_cpu_percent = self._process.cpu_percent(interval=None)
+            self._cpu_sampled_at = time.monotonic()
             
             # 内存使用情况
             memory = psutil.virtual_memory()
@@ -92,7 +116,7 @@ class PerformanceMonitor(LoggerMixin):
             network = psutil.net_io_counters()
             
             # 进程信息
-            process = psutil.Process()
+            process = self._process
             process_memory = process.memory_info()
             
             metrics = {
@@ -123,7 +147,7 @@ class PerformanceMonitor(LoggerMixin):
                     "memory_rss": process_memory.rss,
                     "memory_vms": process_memory.vms,
                     "memory_percent": process.memory_percent(),
-                    "cpu_percent": process.cpu_percent(),
+                    "cpu_percent": process_cpu_percent,
                     "num_threads": process.num_threads()
                 }
             }
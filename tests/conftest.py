@@ -5,6 +5,7 @@ pytest配置文件
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
 import tempfile
 import shutil
@@ -28,7 +29,7 @@ def event_loop():
     loop.close()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def test_settings():
     """测试配置"""
     with tempfile.TemporaryDirectory() as temp_dir:
@@ -61,16 +62,16 @@ async def test_settings():
         yield settings
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def test_db_manager(test_settings):
     """测试数据库管理器"""
-    db_manager = DatabaseManager(test_settings)
+    db_manager = DatabaseManager(test_settings.database_url)
     await db_manager.initialize()
     yield db_manager
     await db_manager.close()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_channel(test_db_manager):
     """示例频道"""
     async with test_db_manager.get_async_session() as session:
@@ -86,7 +87,7 @@ async def sample_channel(test_db_manager):
         yield channel
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_messages(test_db_manager, sample_channel):
     """示例消息"""
     async with test_db_manager.get_async_session() as session:
@@ -132,7 +133,7 @@ async def sample_messages(test_db_manager, sample_channel):
         yield messages
 
 
-@pytest.fixture
+@pytest_asyncio.fixture
 async def sample_tags(test_db_manager):
     """示例标签"""
     async with test_db_manager.get_async_session() as session:
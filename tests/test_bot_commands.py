@@ -119,6 +119,59 @@ class TestUserManager:
         is_banned_authorized = await user_manager.is_user_authorized(333333333)
         assert is_banned_authorized is False
 
+    @pytest.mark.asyncio
+    async def test_user_changes_survive_restart(self, test_db_manager, test_settings):
+        """测试重启后通过机器人修改的权限仍然有效"""
+        test_settings.admin_user_ids = [444444444]
+        user_manager = UserManager(test_db_manager, test_settings)
+
+        await user_manager.add_admin_user(999999999)
+        await user_manager.add_admin_user(7000000000)
+        await user_manager.remove_admin_user(444444444)
+        await user_manager.ban_user(333333333)
+
+        # 模拟重启：新的管理器只读取配置，加载数据库记录后恢复修改
+        restarted = UserManager(test_db_manager, test_settings)
+        assert restarted.admin_users == {444444444}
+
+        await restarted.load_users()
+
+        assert restarted.admin_users == {999999999, 7000000000}
+        assert await restarted.get_user_role(999999999) == UserRole.ADMIN
+        assert await restarted.get_user_role(444444444) != UserRole.ADMIN
+        assert await restarted.is_user_authorized(333333333) is False
+
+    @pytest.mark.asyncio
+    async def test_user_stats_ignore_expired_cache_entries(self, test_db_manager, test_settings):
+        """测试用户统计中的各项计数一致（已过期的缓存条目不计入）"""
+        user_manager = UserManager(test_db_manager, test_settings)
+        role_cache = user_manager._role_cache
+
+        role_cache.set(1, UserRole.VIEWER)
+        ttl, role_cache.ttl = role_cache.ttl, -1
+        role_cache.set(2, UserRole.OPERATOR)
+        role_cache.ttl = ttl
+
+        stats = await user_manager.get_user_stats()
+
+        assert stats["cache_size"] == 1
+        assert stats["total_users"] == 1
+        assert stats["role_distribution"][UserRole.VIEWER.value] == 1
+        assert stats["role_distribution"][UserRole.OPERATOR.value] == 0
+
+    @pytest.mark.asyncio
+    async def test_buffered_actions_flushed_on_stop(self, test_db_manager, test_settings):
+        """测试关闭时写入缓冲区中剩余的用户操作"""
+        user_manager = UserManager(test_db_manager, test_settings)
+
+        await user_manager.log_user_action(123456789, "search", "关键词")
+        assert len(user_manager._action_buffer) == 1
+
+        await user_manager.stop_action_logging()
+
+        assert len(user_manager._action_buffer) == 0
+        assert user_manager._flush_task is None
+
 
 class TestTelegramBotCommands:
     """Telegram机器人命令测试"""
@@ -227,6 +280,97 @@ class TestTelegramBotCommands:
         context.args = [sample_tags[0].name]
         await bot.tag_stats_command(update, context)
         update.message.reply_text.assert_called()
+    
+    def test_module_imports(self):
+        """测试机器人模块可以导入（模块级常量引用的枚举成员都必须存在）"""
+        import importlib
+        
+        from src.database.models import ChannelStatus
+        
+        telegram_bot = importlib.import_module("src.bot.telegram_bot")
+        assert set(telegram_bot._CHANNEL_STATUS_EMOJI) <= set(ChannelStatus)
+    
+    def test_legacy_callback_data(self):
+        """测试升级前发出的字符串回调数据仍能解析"""
+        from src.bot.telegram_bot import CallbackCode, _callback_data, _parse_callback_data
+
+        assert _parse_callback_data(_callback_data(CallbackCode.STATS)) == (CallbackCode.STATS, "")
+        assert _parse_callback_data(
+            _callback_data(CallbackCode.CONFIRM_REMOVE_CHANNEL, 12)
+        ) == (CallbackCode.CONFIRM_REMOVE_CHANNEL, "12")
+
+        assert _parse_callback_data("manual_classify") == (CallbackCode.MANUAL_CLASSIFY, "")
+        assert _parse_callback_data("settings_storage") == (CallbackCode.SETTINGS_STORAGE, "")
+        assert _parse_callback_data("confirm_remove_channel_12") == (
+            CallbackCode.CONFIRM_REMOVE_CHANNEL, "12"
+        )
+        assert _parse_callback_data("set_download_mode_auto") == (
+            CallbackCode.SET_DOWNLOAD_MODE, "auto"
+        )
+        assert _parse_callback_data("unknown") is None
+
+    def test_handlers_defined_once(self):
+        """测试处理方法没有重复定义（重复定义会静默覆盖前一个）"""
+        import ast
+        import inspect
+        from collections import Counter
+        
+        from src.bot import telegram_bot
+        
+        tree = ast.parse(inspect.getsource(telegram_bot))
+        class_node = next(
+            node for node in tree.body
+            if isinstance(node, ast.ClassDef) and node.name == "TelegramBot"
+        )
+        names = Counter(
+            node.name for node in class_node.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        )
+        
+        duplicated = [name for name, count in names.items() if count > 1]
+        assert duplicated == []
+    
+    @pytest.mark.asyncio
+    async def test_enqueued_edits_keep_order(self, test_db_manager, test_settings, mock_update_context):
+        """测试同一聊天的消息编辑按入队顺序发送"""
+        bot = TelegramBot(test_settings, test_db_manager)
+        update, context = mock_update_context
+        query = update.callback_query
+        query.message.chat_id = 42
+        
+        bot._enqueue_edit(query, "第一条")
+        bot._enqueue_edit(query, "第二条", parse_mode='HTML')
+        await bot._drain_send_queues()
+        
+        sent = [call.args[0] for call in query.edit_message_text.call_args_list]
+        assert sent == ["第一条", "第二条"]
+        assert bot._send_workers == {}
+
+    @pytest.mark.asyncio
+    async def test_tag_stats_escapes_tag_names(self, test_db_manager, test_settings):
+        """测试标签名中的特殊字符在HTML回复中被转义"""
+        bot = TelegramBot(test_settings, test_db_manager)
+        bot.tag_statistics.get_all_tags_media_summary = AsyncMock(return_value={
+            "total_tags": 1,
+            "tags_summary": [{
+                "tag_name": "a_b*<c>&", "tag_id": 1, "videos": 1, "images": 0,
+                "audio": 0, "documents": 0, "total_files": 1, "total_size_mb": 1.0
+            }],
+            "overall_stats": {
+                "total_videos": 1, "total_images": 0, "total_audio": 0, "total_documents": 0
+            }
+        })
+
+        update = MagicMock()
+        context = MagicMock()
+        context.args = []
+        update.message.reply_text = AsyncMock()
+
+        await bot.tag_stats_command(update, context)
+
+        call = update.message.reply_text.call_args
+        assert "<b>a_b*&lt;c&gt;&amp;</b>" in call.args[0]
+        assert call.kwargs["parse_mode"] == "HTML"
 
 
 class TestBotErrorHandling:
@@ -36,6 +36,34 @@ class TestDatabaseManager:
             channels = result.scalars().all()
             assert isinstance(channels, list)
 
+    
+    @pytest.mark.asyncio
+    async def test_missing_indexes_created_on_existing_database(self, test_db_manager):
+        """测试已有数据库升级后补建缺失的索引"""
+        from sqlalchemy import text
+        
+        indexes = (
+            "idx_channel_user_status_created", "idx_channel_status",
+            "idx_message_status_media", "idx_message_tag_tag"
+        )
+        
+        # 模拟旧版本创建的数据库：表已存在但没有后来新增的索引
+        with test_db_manager.engine.begin() as conn:
+            for name in indexes:
+                conn.execute(text(f"DROP INDEX {name}"))
+        await test_db_manager.close()
+        
+        upgraded = DatabaseManager(test_db_manager.database_url)
+        await upgraded.initialize()
+        
+        with upgraded.engine.connect() as conn:
+            existing = set(conn.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            ).scalars())
+        await upgraded.close()
+        
+        assert set(indexes) <= existing
+
 
 class TestChannelModel:
     """频道模型测试"""
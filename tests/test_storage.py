@@ -231,6 +231,18 @@ class TestStorageMonitor:
         assert "database_stats" in report
         assert "consistency_check" in report
         assert "monitoring_status" in report
+    
+    @pytest.mark.asyncio
+    async def test_comprehensive_report_cached_until_cleanup(self, test_db_manager, test_settings):
+        """测试综合报告在有效期内复用，清理文件后重新生成"""
+        storage_monitor = StorageMonitor(test_db_manager, test_settings)
+        
+        first = await storage_monitor.get_comprehensive_report()
+        assert await storage_monitor.get_comprehensive_report() is first
+        
+        await storage_monitor.cleanup_old_files(days=30)
+        
+        assert await storage_monitor.get_comprehensive_report() is not first
 
 
 class TestStorageIntegration:
@@ -7,7 +7,10 @@ import pytest
 from datetime import datetime
 
 from src.statistics.tag_statistics import TagStatistics
-from src.database.models import Message, Tag, MessageTag, MediaType, MessageStatus
+from src.statistics.stats_bundle import StatsBundle
+from src.database.models import (
+    Channel, ChannelStatus, Message, Tag, MessageTag, MediaType, MessageStatus
+)
 
 
 class TestTagStatistics:
@@ -215,6 +218,83 @@ class TestTagStatistics:
             assert "channel_distribution" in report
             assert report["tag_name"] == tag.name
 
+    @pytest.mark.asyncio
+    async def test_limit_guardrail(self, test_db_manager):
+        """测试超出上限的 limit 被拒绝"""
+        tag_stats = TagStatistics(test_db_manager)
+
+        summary = await tag_stats.get_all_tags_media_summary(limit=1000)
+        assert "error" in summary
+
+        distribution = await tag_stats.get_media_type_by_tags(MediaType.VIDEO, limit=1000)
+        assert "error" in distribution
+
+        assert await tag_stats.search_tags_by_media_count(MediaType.VIDEO, limit=1000) == []
+
+    def test_tag_aggregation_uses_index(self, test_db_manager):
+        """测试按标签聚合的查询通过索引查找标签关联，而不是全表扫描"""
+        from sqlalchemy import text
+        from src.statistics.tag_statistics import _tag_media_select
+
+        stmt = _tag_media_select(Tag.id).where(Tag.name == "测试")
+        sql = str(stmt.compile(test_db_manager.engine, compile_kwargs={"literal_binds": True}))
+
+        with test_db_manager.engine.connect() as conn:
+            plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+        assert "idx_message_tag_tag" in plan
+        assert "SCAN message_tags" not in plan
+
+
+class TestStatsBundle:
+    """统计汇总测试"""
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_counts(self, test_db_manager):
+        """测试一次查询得到的消息计数"""
+        # 在测试内创建数据，所有非空列都显式赋值
+        async with test_db_manager.get_async_session() as session:
+            channel = Channel(
+                channel_id="-1009876543210",
+                channel_title="统计测试频道",
+                status=ChannelStatus.ACTIVE,
+                added_by_user_id="123456789"
+            )
+            session.add(channel)
+            await session.flush()
+            
+            session.add_all([
+                Message(
+                    message_id=message_id,
+                    channel_id=channel.id,
+                    message_date=datetime(2024, 1, 1),
+                    media_type=media_type,
+                    file_size=size_mb * 1024 * 1024,
+                    status=status
+                )
+                for message_id, media_type, size_mb, status in [
+                    (1001, MediaType.VIDEO, 10, MessageStatus.COMPLETED),
+                    (1002, MediaType.IMAGE, 2, MessageStatus.COMPLETED),
+                    (1003, MediaType.AUDIO, 5, MessageStatus.PENDING)
+                ]
+            ])
+            await session.commit()
+        
+        bundle = StatsBundle.for_database(test_db_manager)
+        assert StatsBundle.for_database(test_db_manager) is bundle
+        
+        counts = await bundle.snapshot()
+        
+        assert counts["completed_messages"] == 2
+        assert counts["classified_messages"] == 0
+        assert counts["duplicate_messages"] == 0
+        assert counts["completed_size"] == 12 * 1024 * 1024
+        
+        # 缓存有效期内复用同一结果，失效后重新查询
+        assert await bundle.snapshot() is counts
+        bundle.invalidate()
+        assert await bundle.snapshot() is not counts
+
 
 class TestTagStatisticsPerformance:
     """标签统计性能测试"""